@@ -15,11 +15,18 @@ target_metadata = Base.metadata
 def get_url():
     return settings.DATABASE_URL
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Structures de recherche plein texte gérées par app.services.search
+    if name and (name.startswith("todos_fts") or name in ("search_vector", "ix_todos_search_vector")):
+        return False
+    return True
+
 def run_migrations_offline():
     url = get_url()
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -38,7 +45,11 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite ne sait pas modifier les contraintes : tables recréées
+            render_as_batch=connection.dialect.name == "sqlite"
         )
 
         with context.begin_transaction():
@@ -0,0 +1,90 @@
+"""index composites et clés primaires des tables d'association
+
+Revision ID: 0002_query_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:10:00
+
+Index alignés sur les requêtes de app/services/service.py (voir
+``python -m app.db.explain``) :
+- todos (owner_id, created_at, id) : listes paginées par curseur
+- todos (owner_id, completed, due_date) et (owner_id, priority) : filtres
+- recurring_todos (owner_id, active, created_at, id) : liste des récurrentes
+- todo_tags / recurring_todo_tags : clé primaire composite + index tag_id
+  (Todo.tags.any(...), jointures sur les tags)
+Les doublons et lignes incomplètes des tables d'association sont supprimés
+avant la création des clés primaires.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_query_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ASSOCIATION_TABLES = {
+    'todo_tags': 'todo_id',
+    'recurring_todo_tags': 'recurring_todo_id',
+}
+
+
+def _delete_duplicates(table: str, owner_column: str) -> None:
+    bind = op.get_bind()
+    op.execute(f"DELETE FROM {table} WHERE {owner_column} IS NULL OR tag_id IS NULL")
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.ctid < b.ctid "
+            f"AND a.{owner_column} = b.{owner_column} AND a.tag_id = b.tag_id"
+        )
+    elif bind.dialect.name == 'sqlite':
+        op.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN ("
+            f"SELECT MIN(rowid) FROM {table} GROUP BY {owner_column}, tag_id)"
+        )
+    else:
+        raise NotImplementedError(f"Dédoublonnage non géré pour {bind.dialect.name}")
+
+
+def upgrade() -> None:
+    for table, owner_column in ASSOCIATION_TABLES.items():
+        _delete_duplicates(table, owner_column)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(owner_column, existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_primary_key(f'{table}_pkey', [owner_column, 'tag_id'])
+        op.create_index(f'ix_{table}_tag_id', table, ['tag_id'], if_not_exists=True)
+
+    op.create_index(
+        'ix_todos_owner_created_id', 'todos',
+        ['owner_id', 'created_at', 'id'], if_not_exists=True
+    )
+    op.create_index(
+        'ix_todos_owner_completed_due', 'todos',
+        ['owner_id', 'completed', 'due_date'], if_not_exists=True
+    )
+    op.create_index(
+        'ix_todos_owner_priority', 'todos',
+        ['owner_id', 'priority'], if_not_exists=True
+    )
+    op.create_index(
+        'ix_recurring_todos_owner_active_created_id', 'recurring_todos',
+        ['owner_id', 'active', 'created_at', 'id'], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recurring_todos_owner_active_created_id', table_name='recurring_todos')
+    op.drop_index('ix_todos_owner_priority', table_name='todos')
+    op.drop_index('ix_todos_owner_completed_due', table_name='todos')
+    op.drop_index('ix_todos_owner_created_id', table_name='todos')
+    for table, owner_column in ASSOCIATION_TABLES.items():
+        op.drop_index(f'ix_{table}_tag_id', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'{table}_pkey', type_='primary')
+            batch_op.alter_column(owner_column, existing_type=sa.Integer(), nullable=True)
+            batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=True)
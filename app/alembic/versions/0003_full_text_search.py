@@ -0,0 +1,27 @@
+"""recherche plein texte des tâches (tsvector + GIN / FTS5)
+
+Revision ID: 0003_full_text_search
+Revises: 0002_query_indexes
+Create Date: 2026-10-18 09:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.services.search import create_search_schema, drop_search_schema
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_full_text_search'
+down_revision: Union[str, None] = '0002_query_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_search_schema(op.get_bind())
+
+
+def downgrade() -> None:
+    drop_search_schema(op.get_bind())
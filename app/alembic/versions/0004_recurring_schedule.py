@@ -0,0 +1,51 @@
+"""planification de la génération des tâches récurrentes
+
+Revision ID: 0004_recurring_schedule
+Revises: 0003_full_text_search
+Create Date: 2026-10-18 09:30:00
+
+- recurring_todos.last_generated_at / next_due_at, index (active, next_due_at, id)
+  pour la sélection des récurrentes à générer
+- todos (recurring_todo_id, created_at) pour retrouver les instances créées
+Les récurrentes existantes reprennent à la migration (next_due_at = maintenant) :
+partir de created_at ferait rattraper au premier passage toutes les occurrences
+écoulées depuis leur création. Le planificateur recale next_due_at sur la
+première occurrence de la règle qui suit.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_recurring_schedule'
+down_revision: Union[str, None] = '0003_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('recurring_todos') as batch_op:
+        batch_op.add_column(sa.Column('last_generated_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('next_due_at', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE recurring_todos SET next_due_at = CURRENT_TIMESTAMP "
+        "WHERE next_due_at IS NULL"
+    )
+    op.create_index(
+        'ix_recurring_todos_active_next_due', 'recurring_todos',
+        ['active', 'next_due_at', 'id'], if_not_exists=True
+    )
+    op.create_index(
+        'ix_todos_recurring_created', 'todos',
+        ['recurring_todo_id', 'created_at'], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_recurring_created', table_name='todos')
+    op.drop_index('ix_recurring_todos_active_next_due', table_name='recurring_todos')
+    with op.batch_alter_table('recurring_todos') as batch_op:
+        batch_op.drop_column('next_due_at')
+        batch_op.drop_column('last_generated_at')
@@ -0,0 +1,43 @@
+"""règles de récurrence calendaires (intervalle, jours, bornes)
+
+Revision ID: 0005_recurrence_rules
+Revises: 0004_recurring_schedule
+Create Date: 2026-10-18 09:40:00
+
+- recurring_todos.interval / weekdays / starts_at / ends_at
+  (starts_at = created_at pour les séries existantes)
+- index (owner_id, active, next_due_at) pour GET /recurring/occurrences
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_recurrence_rules'
+down_revision: Union[str, None] = '0004_recurring_schedule'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('recurring_todos') as batch_op:
+        batch_op.add_column(sa.Column('interval', sa.Integer(), nullable=True, server_default='1'))
+        batch_op.add_column(sa.Column('weekdays', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('starts_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('ends_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE recurring_todos SET starts_at = created_at WHERE starts_at IS NULL")
+    op.create_index(
+        'ix_recurring_todos_owner_active_next_due', 'recurring_todos',
+        ['owner_id', 'active', 'next_due_at'], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recurring_todos_owner_active_next_due', table_name='recurring_todos')
+    with op.batch_alter_table('recurring_todos') as batch_op:
+        batch_op.drop_column('ends_at')
+        batch_op.drop_column('starts_at')
+        batch_op.drop_column('weekdays')
+        batch_op.drop_column('interval')
@@ -0,0 +1,34 @@
+"""versions des catalogues mis en cache (tags)
+
+Revision ID: 0006_catalog_versions
+Revises: 0005_recurrence_rules
+Create Date: 2026-10-18 09:50:00
+
+Une ligne par catalogue ; la version est incrémentée à chaque écriture
+sur les tags et relue par les workers avant de servir leur copie.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_catalog_versions'
+down_revision: Union[str, None] = '0005_recurrence_rules'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    catalog_versions = op.create_table(
+        'catalog_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(catalog_versions, [{'name': 'tags', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_versions')
@@ -0,0 +1,35 @@
+"""versions des collections par utilisateur (ETag des listes)
+
+Revision ID: 0007_collection_versions
+Revises: 0006_catalog_versions
+Create Date: 2026-10-18 10:00:00
+
+Une ligne par (utilisateur, collection), créée par upsert à la première
+écriture ; absente, la version vaut 0.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_collection_versions'
+down_revision: Union[str, None] = '0006_catalog_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'collection_versions',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('collection', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('owner_id', 'collection')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
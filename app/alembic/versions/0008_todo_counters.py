@@ -0,0 +1,57 @@
+"""compteurs des tâches par utilisateur (GET /todos/stats)
+
+Revision ID: 0008_todo_counters
+Revises: 0007_collection_versions
+Create Date: 2026-10-18 11:00:00
+
+Les compteurs sont initialisés depuis les tâches existantes, par les mêmes
+agrégats que la reconstruction (python -m app.services.stats).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_todo_counters'
+down_revision: Union[str, None] = '0007_collection_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'todo_counters',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('owner_id', 'name')
+    )
+
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, name, value) "
+        "SELECT owner_id, 'total', COUNT(*) FROM todos "
+        "WHERE owner_id IS NOT NULL GROUP BY owner_id"
+    )
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, name, value) "
+        "SELECT owner_id, 'completed', COUNT(*) FROM todos "
+        "WHERE owner_id IS NOT NULL AND completed = true GROUP BY owner_id"
+    )
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, name, value) "
+        "SELECT owner_id, 'priority:' || CAST(priority AS VARCHAR), COUNT(*) FROM todos "
+        "WHERE owner_id IS NOT NULL AND priority IS NOT NULL GROUP BY owner_id, priority"
+    )
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, name, value) "
+        "SELECT todos.owner_id, 'tag:' || CAST(todo_tags.tag_id AS VARCHAR), COUNT(*) "
+        "FROM todos JOIN todo_tags ON todo_tags.todo_id = todos.id "
+        "WHERE todos.owner_id IS NOT NULL GROUP BY todos.owner_id, todo_tags.tag_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('todo_counters')
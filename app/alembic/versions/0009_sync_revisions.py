@@ -0,0 +1,54 @@
+"""révisions de synchronisation et suppressions conservées (GET /sync/changes)
+
+Revision ID: 0009_sync_revisions
+Revises: 0008_todo_counters
+Create Date: 2026-10-18 12:00:00
+
+Les lignes existantes reçoivent la révision 0 : elles sont couvertes par le
+chargement complet qui précède le premier jeton de synchronisation.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_sync_revisions'
+down_revision: Union[str, None] = '0008_todo_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('todos', 'recurring_todos', 'tags'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_todos_owner_revision', 'todos', ['owner_id', 'revision'])
+    op.create_index('ix_recurring_todos_owner_revision', 'recurring_todos', ['owner_id', 'revision'])
+    op.create_index('ix_tags_revision', 'tags', ['revision'])
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('entity', 'entity_id')
+    )
+    op.create_index('ix_sync_tombstones_owner_revision', 'sync_tombstones', ['owner_id', 'revision'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_tombstones_owner_revision', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_index('ix_tags_revision', table_name='tags')
+    op.drop_index('ix_recurring_todos_owner_revision', table_name='recurring_todos')
+    op.drop_index('ix_todos_owner_revision', table_name='todos')
+    for table in ('tags', 'recurring_todos'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('revision')
+    # Sans copie de la table (SQLite >= 3.35) : les déclencheurs FTS de todos sont conservés
+    op.drop_column('todos', 'revision')
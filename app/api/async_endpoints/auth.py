@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_async_db, get_current_user_async
+from app.services.async_service import AsyncUserService
+from app.core.security import create_access_token
+from app.schemas import schemas
+from datetime import timedelta
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.post("/register", response_model=schemas.User)
+async def register(
+    user: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_user = await AsyncUserService.create_user(db, user)
+    return db_user
+
+@router.post("/login", response_model=schemas.Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await AsyncUserService.authenticate_user(db, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email ou mot de passe incorrect",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.email}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me", response_model=schemas.User)
+async def read_users_me(
+    current_user: schemas.User = Depends(get_current_user_async)
+):
+    return current_user
+
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_me(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_user_async)
+):
+    """Désactiver son compte : les tokens déjà émis sont refusés aussitôt"""
+    await AsyncUserService.set_active(db, current_user.id, False)
\ No newline at end of file
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_async_db, get_current_user_async
+from app.services.async_service import AsyncRecurringTodoService
+from app.schemas import schemas
+from app.core.pagination import set_next_cursor
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.fast_json import fast_json_response
+from app.core.config import settings
+from typing import List, Optional
+from datetime import datetime
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.RecurringTodo)
+async def create_recurring_todo(
+    todo: schemas.RecurringTodoCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Créer une nouvelle tâche récurrente"""
+    return await AsyncRecurringTodoService.create_recurring_todo(db, todo, current_user.id)
+
+@router.get("/", response_model=List[schemas.RecurringTodo])
+async def get_recurring_todos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Récupérer toutes les tâches récurrentes"""
+    etag = await AsyncRecurringTodoService.get_collection_etag(db, current_user.id, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    if settings.FAST_JSON_RESPONSES:
+        items = await AsyncRecurringTodoService.get_recurring_items(db, current_user.id, skip, limit, cursor)
+        set_next_cursor(response, items, limit)
+        return fast_json_response(items, response)
+    todos = await AsyncRecurringTodoService.get_recurring_todos(db, current_user.id, skip, limit, cursor)
+    set_next_cursor(response, todos, limit)
+    return todos
+
+@router.get("/occurrences", response_model=List[schemas.RecurringOccurrence])
+async def get_occurrences(
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    limit: int = Query(1000, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Occurrences à venir des tâches récurrentes dans une fenêtre de dates"""
+    return await AsyncRecurringTodoService.get_occurrences(db, current_user.id, start, end, limit)
+
+@router.put("/{recurring_id}", response_model=schemas.RecurringTodo)
+async def update_recurring_todo(
+    recurring_id: int,
+    todo: schemas.RecurringTodoUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Mettre à jour une tâche récurrente"""
+    return await AsyncRecurringTodoService.update_recurring_todo(db, recurring_id, todo, current_user.id)
+
+@router.delete("/{recurring_id}")
+async def delete_recurring_todo(
+    recurring_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Supprimer une tâche récurrente"""
+    await AsyncRecurringTodoService.delete_recurring_todo(db, recurring_id, current_user.id)
+    return {"status": "success"}
+
+@router.post("/{recurring_id}/generate", response_model=schemas.Todo)
+async def generate_todo_from_recurring(
+    recurring_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Générer une nouvelle tâche à partir d'une tâche récurrente"""
+    return await AsyncRecurringTodoService.generate_todo(db, recurring_id, current_user.id)
\ No newline at end of file
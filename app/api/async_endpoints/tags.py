@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_async_db, get_current_user_async
+from app.services.async_service import AsyncTagService
+from app.schemas import schemas
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from typing import List
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.Tag)
+async def create_tag(
+    tag: schemas.TagCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Créer un nouveau tag"""
+    return await AsyncTagService.create_tag(db, tag)
+
+@router.get("/", response_model=List[schemas.Tag])
+async def get_tags(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Récupérer tous les tags"""
+    catalog = await AsyncTagService.get_catalog(db)
+    if etag_matches(request, catalog.etag):
+        return not_modified(catalog.etag)
+    response.headers[ETAG_HEADER] = catalog.etag
+    return catalog.list()
+
+@router.put("/{tag_id}", response_model=schemas.Tag)
+async def update_tag(
+    tag_id: int,
+    tag: schemas.TagCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Mettre à jour un tag"""
+    return await AsyncTagService.update_tag(db, tag_id, tag)
+
+@router.delete("/{tag_id}")
+async def delete_tag(
+    tag_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Supprimer un tag"""
+    await AsyncTagService.delete_tag(db, tag_id)
+    return {"status": "success"}
\ No newline at end of file
@@ -0,0 +1,161 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+from app.api.dependencies import get_async_db, get_current_user_async
+from app.services.async_service import AsyncTodoService
+from app.schemas import schemas
+from app.services.export import ExportFormat, ExportWriter, export_query, export_response, stream_export_async
+from app.core.pagination import set_next_cursor
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.fast_json import fast_json_response
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.Todo])
+async def read_todos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Récupérer toutes les tâches"""
+    etag = await AsyncTodoService.get_collection_etag(db, current_user.id, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    if settings.FAST_JSON_RESPONSES:
+        items = await AsyncTodoService.get_todo_items(db, current_user.id, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, items, limit)
+        return fast_json_response(items, response)
+    todos = await AsyncTodoService.get_todos(db, current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, todos, limit)
+    return todos
+
+@router.get("/search", response_model=List[schemas.Todo])
+async def search_todos(
+    query: str = Query(..., description="Terme de recherche"),
+    completed: Optional[bool] = None,
+    tag_id: Optional[int] = None,
+    priority: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Rechercher des tâches avec filtres optionnels"""
+    return await AsyncTodoService.search_todos(
+        db=db,
+        user_id=current_user.id,
+        query=query,
+        completed=completed,
+        tag_id=tag_id,
+        priority=priority,
+        skip=skip,
+        limit=limit
+    )
+
+@router.get("/stats", response_model=schemas.TodoStats)
+async def get_todo_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Statistiques des tâches (totaux par état, priorité, tag, retard)"""
+    return await AsyncTodoService.get_stats(db, current_user.id)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_todos(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson ou csv"),
+    gzip: bool = Query(False, description="Compresser l'export (gzip)"),
+    search_term: Optional[str] = None,
+    completed: Optional[bool] = None,
+    tag_id: Optional[int] = None,
+    priority: Optional[schemas.TodoPriority] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Exporter les tâches en flux (NDJSON ou CSV)"""
+    engine = db.bind
+    query = export_query(
+        current_user.id,
+        engine.dialect.name,
+        search_term=search_term,
+        completed=completed,
+        tag_id=tag_id,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after
+    )
+    writer = ExportWriter(format, compress=gzip)
+    return export_response(stream_export_async(engine, query, writer), format, gzip)
+
+@router.get("/{todo_id}", response_model=schemas.Todo)
+async def read_todo(
+    todo_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Récupérer une tâche spécifique"""
+    todo = await AsyncTodoService.get_todo(db, todo_id, current_user.id)
+    if todo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo non trouvé"
+        )
+    return todo
+
+@router.post("/", response_model=schemas.Todo, status_code=status.HTTP_201_CREATED)
+async def create_todo(
+    todo: schemas.TodoCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Créer une nouvelle tâche"""
+    return await AsyncTodoService.create_todo(db, todo, current_user.id)
+
+@router.post("/bulk", response_model=schemas.TodoBulkResponse)
+async def bulk_todos(
+    bulk: schemas.TodoBulkRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Créer, modifier et supprimer des tâches en une seule transaction"""
+    return {"results": await AsyncTodoService.bulk_todos(db, bulk.operations, current_user.id)}
+
+@router.patch("/{todo_id}", response_model=schemas.Todo)
+@router.put("/{todo_id}", response_model=schemas.Todo)
+async def update_todo(
+    todo_id: int,
+    todo_update: schemas.TodoUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Mettre à jour une tâche (seuls les champs fournis sont modifiés)"""
+    todo = await AsyncTodoService.update_todo(db, todo_id, todo_update, current_user.id)
+    if todo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo non trouvé"
+        )
+    return todo
+
+@router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_todo(
+    todo_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    """Supprimer une tâche"""
+    if not await AsyncTodoService.delete_todo(db, todo_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo non trouvé"
+        )
+    return None
\ No newline at end of file
@@ -1,40 +1,163 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.cache import principal_cache
+from app.core.metrics import record_db_route
+from app.db.replicas import (
+    PIN_COOKIE, PIN_SUBJECT_KEY, REPLICA_KEY, SAFE_METHODS, ReplicaSet, is_pinned, is_read_route
+)
+from app.db.session import (
+    AsyncSessionLocal, SessionLocal, async_read_replicas, read_replicas
+)
 from app.models import models
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional, Tuple
 from app.core.security import verify_password
 from app.schemas import schemas
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
-def get_db() -> Generator:
-    from app.main import SessionLocal
-    db = SessionLocal()
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _token_subject(request: Request) -> Optional[str]:
+    """Sujet du token Bearer, sans accès à la base (invalide : None, refusé ensuite)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token)["sub"]
+    except HTTPException:
+        return None
+
+def _route(request: Request, replicas: ReplicaSet) -> Optional[Tuple[int, dict]]:
+    """(indice du réplica, options de la session) ou None (primaire)"""
+    if not replicas:
+        return None
+    if request.method not in SAFE_METHODS:
+        # Sujet à épingler par le cookie de la réponse (PrimaryPinMiddleware)
+        setattr(request.state, PIN_SUBJECT_KEY, _token_subject(request))
+        record_db_route("primary")
+        return None
+    if not is_read_route(request.scope, settings.API_V1_STR):
+        return None
+    pin = request.cookies.get(PIN_COOKIE)
+    if pin is not None:
+        subject = _token_subject(request)
+        if subject is not None and is_pinned(pin, subject):
+            # Écriture récente : lire ses propres écritures
+            return _primary_read(replicas)
+    chosen = replicas.choose()
+    if chosen is None:
+        # Aucun réplica disponible
+        return _primary_read(replicas)
+    index, engine = chosen
+    record_db_route(f"replica-{index}")
+    return index, {"bind": engine, "info": {REPLICA_KEY: index}}
+
+def _primary_read(replicas: ReplicaSet) -> None:
+    replicas.record_primary_read()
+    record_db_route("primary")
+    return None
+
+def _replica_failed(replicas: ReplicaSet, index: int) -> None:
+    # Connexion impossible : lecture sur le primaire, réplica écarté un temps
+    replicas.mark_failed(index)
+    _primary_read(replicas)
+
+def get_db(request: Request) -> Generator:
+    route = _route(request, read_replicas)
+    db = None
+    if route is not None:
+        db = SessionLocal(**route[1])
+        try:
+            db.connection()
+        except DBAPIError:
+            db.close()
+            db = None
+            _replica_failed(read_replicas, route[0])
+    if db is None:
+        db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def _open_async(request: Request) -> AsyncSession:
+    route = _route(request, async_read_replicas)
+    if route is not None:
+        db = AsyncSessionLocal(**route[1])
+        try:
+            await db.connection()
+            return db
+        except DBAPIError:
+            await db.close()
+            _replica_failed(async_read_replicas, route[0])
+    return AsyncSessionLocal()
+
+async def get_async_db(request: Request) -> AsyncGenerator:
+    async with await _open_async(request) as db:
+        yield db
+
+def decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        email: str = payload.get("sub")
-        if email is None:
+        if payload.get("sub") is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == email).first()
+    return payload
+
+def cache_principal(token: str, payload: dict, user: models.User) -> schemas.User:
+    # Ne jamais garder une entrée au-delà de l'expiration du token
+    principal = schemas.User.model_validate(user)
+    ttl = payload["exp"] - time.time() if "exp" in payload else None
+    principal_cache.set(token, (payload, principal), ttl=ttl)
+    return principal
+
+def _load_user(email: str) -> Optional[models.User]:
+    # Toujours sur le primaire : un compte récent ou désactivé y est à jour
+    with SessionLocal() as db:
+        return db.query(models.User).filter(models.User.email == email).first()
+
+def _check_user(user: Optional[models.User]) -> models.User:
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Utilisateur inactif"
+        )
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> schemas.User:
+    # Chemin rapide : token déjà validé et utilisateur en cache, sans session
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
+    payload = decode_token(token)
+    # Lecture synchrone hors de la boucle d'événements
+    user = _check_user(await run_in_threadpool(_load_user, payload["sub"]))
+    return cache_principal(token, payload, user)
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme)) -> schemas.User:
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
+    payload = decode_token(token)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(models.User).where(models.User.email == payload["sub"])
+        )
+        user = _check_user(result.scalars().first())
+    return cache_principal(token, payload, user)
\ No newline at end of file
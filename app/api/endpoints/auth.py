@@ -15,7 +15,7 @@ async def register(
     user: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
-    db_user = UserService.create_user(db, user)
+    db_user = await UserService.create_user(db, user)
     return db_user
 
 @router.post("/login", response_model=schemas.Token)
@@ -23,7 +23,7 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = UserService.authenticate_user(db, form_data.username, form_data.password)
+    user = await UserService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,4 +40,12 @@ async def login_for_access_token(
 async def read_users_me(
     current_user: schemas.User = Depends(get_current_user)
 ):
-    return current_user 
\ No newline at end of file
+    return current_user
+
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+def deactivate_me(
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_user)
+):
+    """Désactiver son compte : les tokens déjà émis sont refusés aussitôt"""
+    UserService.set_active(db, current_user.id, False)
\ No newline at end of file
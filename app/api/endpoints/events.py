@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.api.dependencies import get_current_user
+from app.core.events import SSE_HEADERS, event_broker, event_stream
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.get("/", response_class=StreamingResponse)
+async def stream_events(current_user = Depends(get_current_user)):
+    """Flux SSE des écritures de l'utilisateur et des tags (relire ensuite /sync/changes)"""
+    if event_broker.full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Trop de flux ouverts, réessayez plus tard",
+            headers={"Retry-After": str(settings.EVENTS_RETRY_MS // 1000 or 1)}
+        )
+    if event_broker.user_full(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Trop de flux ouverts pour cet utilisateur",
+            headers={"Retry-After": str(settings.EVENTS_RETRY_MS // 1000 or 1)}
+        )
+    return StreamingResponse(
+        event_stream(event_broker, current_user.id, settings.EVENTS_COALESCE_SECONDS, settings.EVENTS_RETRY_MS),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
\ No newline at end of file
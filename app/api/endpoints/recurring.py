@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db, get_current_user
 from app.services.service import RecurringTodoService
 from app.schemas import schemas
-from typing import List
+from app.core.pagination import set_next_cursor
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.fast_json import fast_json_response
+from app.core.config import settings
+from typing import List, Optional
+from datetime import datetime
 
 router = APIRouter()
 
@@ -18,13 +23,37 @@ def create_recurring_todo(
 
 @router.get("/", response_model=List[schemas.RecurringTodo])
 def get_recurring_todos(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Récupérer toutes les tâches récurrentes"""
-    return RecurringTodoService.get_recurring_todos(db, current_user.id, skip, limit)
+    etag = RecurringTodoService.get_collection_etag(db, current_user.id, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    if settings.FAST_JSON_RESPONSES:
+        items = RecurringTodoService.get_recurring_items(db, current_user.id, skip, limit, cursor)
+        set_next_cursor(response, items, limit)
+        return fast_json_response(items, response)
+    todos = RecurringTodoService.get_recurring_todos(db, current_user.id, skip, limit, cursor)
+    set_next_cursor(response, todos, limit)
+    return todos
+
+@router.get("/occurrences", response_model=List[schemas.RecurringOccurrence])
+def get_occurrences(
+    start: datetime = Query(..., alias="from"),
+    end: datetime = Query(..., alias="to"),
+    limit: int = Query(1000, le=10000),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Occurrences à venir des tâches récurrentes dans une fenêtre de dates"""
+    return RecurringTodoService.get_occurrences(db, current_user.id, start, end, limit)
 
 @router.put("/{recurring_id}", response_model=schemas.RecurringTodo)
 def update_recurring_todo(
@@ -46,7 +75,7 @@ def delete_recurring_todo(
     RecurringTodoService.delete_recurring_todo(db, recurring_id, current_user.id)
     return {"status": "success"}
 
-@router.post("/{recurring_id}/generate")
+@router.post("/{recurring_id}/generate", response_model=schemas.Todo)
 def generate_todo_from_recurring(
     recurring_id: int,
     db: Session = Depends(get_db),
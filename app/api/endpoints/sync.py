@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.api.dependencies import get_db, get_current_user
+from app.services.service import SyncService
+from app.schemas import schemas
+from app.core.fast_json import fast_json_response
+from app.core.config import settings
+
+router = APIRouter()
+
+@router.get("/changes", response_model=schemas.SyncChanges)
+def get_changes(
+    response: Response,
+    since: Optional[str] = Query(None, description="Jeton renvoyé par l'appel précédent (absent : jeton courant seul)"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Tâches, tâches récurrentes et tags modifiés ou supprimés depuis le jeton"""
+    changes = SyncService.get_changes(db, current_user.id, since)
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(changes, response)
+    return changes
\ No newline at end of file
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db, get_current_user
 from app.services.service import TagService
 from app.schemas import schemas
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
 from typing import List
 
 router = APIRouter()
@@ -18,11 +19,17 @@ def create_tag(
 
 @router.get("/", response_model=List[schemas.Tag])
 def get_tags(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Récupérer tous les tags"""
-    return TagService.get_tags(db)
+    catalog = TagService.get_catalog(db)
+    if etag_matches(request, catalog.etag):
+        return not_modified(catalog.etag)
+    response.headers[ETAG_HEADER] = catalog.etag
+    return catalog.list()
 
 @router.put("/{tag_id}", response_model=schemas.Tag)
 def update_tag(
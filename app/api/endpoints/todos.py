@@ -1,21 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
+from datetime import datetime
 from app.api.dependencies import get_db, get_current_user
 from app.services.service import TodoService
 from app.schemas import schemas
+from app.services.export import ExportFormat, ExportWriter, export_query, export_response, stream_export
+from app.core.pagination import set_next_cursor
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.fast_json import fast_json_response
+from app.core.config import settings
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Todo])
 def read_todos(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Récupérer toutes les tâches"""
-    return TodoService.get_todos(db, current_user.id, skip=skip, limit=limit)
+    etag = TodoService.get_collection_etag(db, current_user.id, request.url.query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    if settings.FAST_JSON_RESPONSES:
+        items = TodoService.get_todo_items(db, current_user.id, skip=skip, limit=limit, cursor=cursor)
+        set_next_cursor(response, items, limit)
+        return fast_json_response(items, response)
+    todos = TodoService.get_todos(db, current_user.id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, todos, limit)
+    return todos
 
 @router.get("/search", response_model=List[schemas.Todo])
 def search_todos(
@@ -23,6 +43,8 @@ def search_todos(
     completed: Optional[bool] = None,
     tag_id: Optional[int] = None,
     priority: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=500),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -33,8 +55,46 @@ def search_todos(
         query=query,
         completed=completed,
         tag_id=tag_id,
-        priority=priority
+        priority=priority,
+        skip=skip,
+        limit=limit
+    )
+
+@router.get("/stats", response_model=schemas.TodoStats)
+def get_todo_stats(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Statistiques des tâches (totaux par état, priorité, tag, retard)"""
+    return TodoService.get_stats(db, current_user.id)
+
+@router.get("/export", response_class=StreamingResponse)
+def export_todos(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson ou csv"),
+    gzip: bool = Query(False, description="Compresser l'export (gzip)"),
+    search_term: Optional[str] = None,
+    completed: Optional[bool] = None,
+    tag_id: Optional[int] = None,
+    priority: Optional[schemas.TodoPriority] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Exporter les tâches en flux (NDJSON ou CSV)"""
+    engine = db.get_bind()
+    query = export_query(
+        current_user.id,
+        engine.dialect.name,
+        search_term=search_term,
+        completed=completed,
+        tag_id=tag_id,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after
     )
+    writer = ExportWriter(format, compress=gzip)
+    return export_response(stream_export(engine, query, writer), format, gzip)
 
 @router.get("/{todo_id}", response_model=schemas.Todo)
 def read_todo(
@@ -60,6 +120,16 @@ def create_todo(
     """Créer une nouvelle tâche"""
     return TodoService.create_todo(db, todo, current_user.id)
 
+@router.post("/bulk", response_model=schemas.TodoBulkResponse)
+def bulk_todos(
+    bulk: schemas.TodoBulkRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Créer, modifier et supprimer des tâches en une seule transaction"""
+    return {"results": TodoService.bulk_todos(db, bulk.operations, current_user.id)}
+
+@router.patch("/{todo_id}", response_model=schemas.Todo)
 @router.put("/{todo_id}", response_model=schemas.Todo)
 def update_todo(
     todo_id: int,
@@ -67,7 +137,7 @@ def update_todo(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Mettre à jour une tâche"""
+    """Mettre à jour une tâche (seuls les champs fournis sont modifiés)"""
     todo = TodoService.update_todo(db, todo_id, todo_update, current_user.id)
     if todo is None:
         raise HTTPException(
@@ -0,0 +1,365 @@
+"""Banc de mesure des endpoints (latences p50/p95/p99 et débit par route).
+
+L'application (app.main:app) est servie en processus via httpx.ASGITransport,
+sans serveur : SQLite dans un fichier temporaire par défaut, ou la base
+indiquée par --database-url (PostgreSQL : base dédiée, vidée par --reset).
+Un jeu de données est généré à partir d'une graine fixe, puis chaque
+scénario (auth, todos, tags, recurring) est exécuté seul, à la concurrence
+demandée. Le nombre de requêtes SQL par appel est relevé dans l'en-tête
+Server-Timing.
+
+    python -m app.benchmarks.endpoints run --users 20 --todos-per-user 500 \\
+        --concurrency 8 --requests 200 --output bench.json
+    python -m app.benchmarks.endpoints compare base.json bench.json --threshold 0.15
+
+compare signale les régressions (p95 ou débit au-delà du seuil, erreurs ou
+requêtes SQL supplémentaires) et sort en erreur s'il y en a.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+SERVER_TIMING_STATEMENTS = re.compile(r'db;[^,]*desc="(\d+) statements"')
+
+WORDS = [
+    "réunion", "rapport", "budget", "client", "projet", "courses", "sport", "facture",
+    "rendez-vous", "lecture", "appel", "revue", "livraison", "planning", "bilan", "voyage",
+]
+
+# Jeu de données
+
+def seed_dataset(engine, users: int, todos_per_user: int, tags: int, recurring_per_user: int, seed: int) -> dict:
+    """Jeu déterministe pour une graine donnée (app.db.seed.seed_bulk) ; renvoie les identifiants utiles"""
+    from app.db.seed import seed_bulk
+
+    summary = seed_bulk(
+        engine, users, todos_per_user, tags, recurring_per_user, seed=seed, progress=lambda *args: None
+    )
+    first_user = summary["users"][0]
+    first_tag = summary["tags"][0]
+    first_todo = summary["todos"][0]
+    first_recurring = summary["recurring_todos"][0]
+    # Identifiants attribués par le générateur : contigus, par utilisateur
+    user_ids = range(first_user, first_user + users)
+    return {
+        "users": [{"id": user_id, "email": f"user{user_id}@example.com"} for user_id in user_ids],
+        "tag_ids": list(range(first_tag, first_tag + tags)),
+        "todo_ids": {
+            user_id: list(range(first_todo + index * todos_per_user, first_todo + (index + 1) * todos_per_user))
+            for index, user_id in enumerate(user_ids)
+        },
+        "recurring_ids": {
+            user_id: list(range(
+                first_recurring + index * recurring_per_user, first_recurring + (index + 1) * recurring_per_user
+            ))
+            for index, user_id in enumerate(user_ids)
+        },
+    }
+
+# Scénarios : (groupe, nom, fabrique de requête)
+
+class Context:
+    """Utilisateurs, jetons et identifiants partagés par les scénarios"""
+
+    def __init__(self, dataset: dict, seed: int):
+        from app.core.security import create_access_token
+
+        self.rng = random.Random(seed)
+        self.users = dataset["users"]
+        self.tag_ids = dataset["tag_ids"]
+        self.todo_ids = dataset["todo_ids"]
+        self.recurring_ids = dataset["recurring_ids"]
+        self.headers = {
+            user["id"]: {"Authorization": "Bearer " + create_access_token(
+                {"sub": user["email"]}, expires_delta=timedelta(hours=2)
+            )}
+            for user in self.users
+        }
+        # Tâches créées pendant le banc, supprimées par le scénario DELETE
+        self.created: Dict[int, List[int]] = {user["id"]: [] for user in self.users}
+
+    def user(self) -> dict:
+        return self.rng.choice(self.users)
+
+    def todo_id(self, user_id: int) -> int:
+        return self.rng.choice(self.todo_ids[user_id])
+
+    def tag_subset(self) -> List[int]:
+        return self.rng.sample(self.tag_ids, min(len(self.tag_ids), 2))
+
+def _authed(build: Callable[[Context, dict], tuple]):
+    def request(ctx: Context):
+        user = ctx.user()
+        method, url, kwargs = build(ctx, user)
+        return method, url, {**kwargs, "headers": ctx.headers[user["id"]]}, user["id"]
+    return request
+
+def _login(ctx: Context):
+    from app.db.seed import SEED_PASSWORD
+
+    return "POST", "/api/v1/login", {"data": {"username": ctx.user()["email"], "password": SEED_PASSWORD}}, None
+
+def _delete_created(ctx: Context, user: dict):
+    created = ctx.created[user["id"]]
+    todo_id = created.pop() if created else ctx.todo_ids[user["id"]].pop()
+    return "DELETE", f"/api/v1/todos/{todo_id}", {}
+
+def scenarios(api: str = "/api/v1") -> List[tuple]:
+    todos, tags, recurring = f"{api}/todos", f"{api}/tags", f"{api}/recurring"
+    return [
+        ("auth", "POST /login", _login),
+        ("auth", "GET /me", _authed(lambda ctx, user: ("GET", f"{api}/me", {}))),
+        ("todos", "GET /todos", _authed(lambda ctx, user: ("GET", f"{todos}/", {"params": {"limit": 100}}))),
+        ("todos", "GET /todos/search", _authed(lambda ctx, user: (
+            "GET", f"{todos}/search", {"params": {"query": ctx.rng.choice(WORDS)[:4], "limit": 50}}))),
+        ("todos", "GET /todos/stats", _authed(lambda ctx, user: ("GET", f"{todos}/stats", {}))),
+        ("todos", "GET /todos/{id}", _authed(lambda ctx, user: ("GET", f"{todos}/{ctx.todo_id(user['id'])}", {}))),
+        ("todos", "GET /todos/export", _authed(lambda ctx, user: ("GET", f"{todos}/export", {}))),
+        ("todos", "POST /todos", _authed(lambda ctx, user: ("POST", f"{todos}/", {"json": {
+            "title": "Banc", "priority": 2, "tag_ids": ctx.tag_subset()}}))),
+        ("todos", "PUT /todos/{id}", _authed(lambda ctx, user: ("PUT", f"{todos}/{ctx.todo_id(user['id'])}", {
+            "json": {"completed": ctx.rng.random() < 0.5}}))),
+        ("todos", "PATCH /todos/{id}", _authed(lambda ctx, user: ("PATCH", f"{todos}/{ctx.todo_id(user['id'])}", {
+            "json": {"completed": ctx.rng.random() < 0.5, "tag_ids": ctx.tag_subset()}}))),
+        ("todos", "POST /todos/bulk", _authed(lambda ctx, user: ("POST", f"{todos}/bulk", {"json": {"operations": [
+            {"op": "update", "id": ctx.todo_id(user["id"]), "changes": {"priority": ctx.rng.randint(1, 3)}}
+            for _ in range(10)
+        ]}}))),
+        ("todos", "DELETE /todos/{id}", _authed(_delete_created)),
+        ("tags", "GET /tags", _authed(lambda ctx, user: ("GET", f"{tags}/", {}))),
+        ("recurring", "GET /recurring", _authed(lambda ctx, user: ("GET", f"{recurring}/", {}))),
+        ("recurring", "GET /recurring/occurrences", _authed(lambda ctx, user: (
+            "GET", f"{recurring}/occurrences",
+            {"params": {"from": "2026-01-01T00:00:00", "to": "2026-03-01T00:00:00"}}))),
+        ("recurring", "POST /recurring/{id}/generate", _authed(lambda ctx, user: (
+            "POST", f"{recurring}/{ctx.rng.choice(ctx.recurring_ids[user['id']])}/generate", {}))),
+    ]
+
+# Exécution
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentile par interpolation linéaire entre rangs"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+async def run_scenario(client, ctx: Context, build, requests: int, concurrency: int, warmup: int) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    statements: List[int] = []
+    remaining = warmup + requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            measured = remaining < requests
+            method, url, kwargs, user_id = build(ctx)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            await response.aread()
+            elapsed = time.perf_counter() - start
+            if response.status_code == 201 and method == "POST" and url.endswith("/todos/"):
+                ctx.created[user_id].append(response.json()["id"])
+            if not measured:
+                continue
+            latencies.append(elapsed)
+            statuses[response.status_code] += 1
+            match = SERVER_TIMING_STATEMENTS.search(response.headers.get("server-timing", ""))
+            if match:
+                statements.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+        "sql_statements_mean": round(sum(statements) / len(statements), 2) if statements else None,
+    }
+
+def _prepare_schema(engine, reset: bool) -> None:
+    from app.db.base_class import Base
+    from app.services.search import ensure_search_schema
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ensure_search_schema(engine)
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app
+    from app.db import session
+    from app.db.session import engine
+    from app.services.tag_catalog import tag_catalog
+
+    _prepare_schema(engine, reset=True)
+    dataset = seed_dataset(
+        engine, args.users, args.todos_per_user, args.tags, args.recurring_per_user, args.seed
+    )
+    tag_catalog.invalidate()
+    ctx = Context(dataset, args.seed)
+    selected = [
+        (group, name, build) for group, name, build in scenarios()
+        if (not args.groups or group in args.groups) and (not args.only or name in args.only)
+    ]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for group, name, build in selected:
+                    print(f"{name} ...", file=sys.stderr, end=" ", flush=True)
+                    results[name] = {"group": group, **await run_scenario(
+                        client, ctx, build, args.requests, args.concurrency, args.warmup
+                    )}
+                    print(f"p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    finally:
+        # Les connexions aiosqlite tiennent chacune un thread : fermées avant la sortie
+        if session.async_engine is not None:
+            await session.async_engine.dispose()
+        engine.dispose()
+
+    return {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(),
+            "database": engine.dialect.name,
+            "async_db": os.environ.get("ASYNC_DB", "false").lower() == "true",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "todos_per_user": args.todos_per_user,
+            "tags": args.tags,
+            "recurring_per_user": args.recurring_per_user,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "endpoints": results,
+    }
+
+# Comparaison
+
+def compare(base: dict, current: dict, threshold: float = 0.10, min_delta_ms: float = 1.0) -> List[dict]:
+    """Écarts par endpoint ; regression = p95 ou débit dégradé au-delà du seuil, ou requêtes SQL en plus"""
+    rows = []
+    for name, new in current["endpoints"].items():
+        old = base["endpoints"].get(name)
+        if old is None:
+            continue
+        p95_ratio = (new["p95_ms"] / old["p95_ms"] - 1) if old["p95_ms"] else 0.0
+        rps_ratio = (new["throughput_rps"] / old["throughput_rps"] - 1) if old["throughput_rps"] else 0.0
+        sql_old, sql_new = old.get("sql_statements_mean"), new.get("sql_statements_mean")
+        regression = (
+            (p95_ratio > threshold and new["p95_ms"] - old["p95_ms"] > min_delta_ms)
+            or rps_ratio < -threshold
+            or new["errors"] > old["errors"]
+            # N+1 : une requête SQL de plus par appel, en moyenne
+            or (sql_old is not None and sql_new is not None and sql_new >= sql_old + 1)
+        )
+        rows.append({
+            "endpoint": name,
+            "p95_ms": (old["p95_ms"], new["p95_ms"]),
+            "p95_change": round(p95_ratio, 4),
+            "throughput_change": round(rps_ratio, 4),
+            "sql_statements": (sql_old, sql_new),
+            "errors": (old["errors"], new["errors"]),
+            "regression": regression,
+        })
+    return rows
+
+def print_comparison(rows: List[dict]) -> None:
+    print(f"{'endpoint':<32} {'p95 avant':>10} {'p95 après':>10} {'écart':>8} {'débit':>8} {'SQL':>11}")
+    for row in rows:
+        old, new = row["p95_ms"]
+        sql_old, sql_new = row["sql_statements"]
+        flag = "  RÉGRESSION" if row["regression"] else ""
+        print(
+            f"{row['endpoint']:<32} {old:>10.2f} {new:>10.2f} {row['p95_change']:>+8.1%} "
+            f"{row['throughput_change']:>+8.1%} {str(sql_old):>5}→{str(sql_new):<5}{flag}"
+        )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banc de mesure des endpoints")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="exécuter le banc")
+    run_parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                            help="base dédiée (SQLite temporaire par défaut)")
+    run_parser.add_argument("--reset", action="store_true",
+                            help="autoriser la suppression des tables d'une base non SQLite")
+    run_parser.add_argument("--async-db", action="store_true", help="chemin AsyncSession (ASYNC_DB)")
+    run_parser.add_argument("--users", type=int, default=10)
+    run_parser.add_argument("--todos-per-user", type=int, default=200)
+    run_parser.add_argument("--tags", type=int, default=20)
+    run_parser.add_argument("--recurring-per-user", type=int, default=10)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--concurrency", type=int, default=4)
+    run_parser.add_argument("--requests", type=int, default=100, help="requêtes mesurées par endpoint")
+    run_parser.add_argument("--warmup", type=int, default=10)
+    run_parser.add_argument("--groups", nargs="*", choices=["auth", "todos", "tags", "recurring"])
+    run_parser.add_argument("--only", nargs="*", help="noms d'endpoints, ex. 'GET /todos'")
+    run_parser.add_argument("--output", default="bench-results.json")
+
+    compare_parser = commands.add_parser("compare", help="comparer deux résultats")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="dégradation tolérée (0.10 = 10 %%)")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0, help="écart de p95 ignoré en dessous")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as base_file, open(args.current) as current_file:
+            rows = compare(json.load(base_file), json.load(current_file), args.threshold, args.min_delta_ms)
+        print_comparison(rows)
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    # Configuration lue à l'import de l'application : à fixer avant
+    database_url = args.database_url
+    if database_url is None:
+        database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+    elif not database_url.startswith("sqlite") and not args.reset:
+        parser.error("--reset requis : les tables de la base indiquée sont supprimées puis recréées")
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["ASYNC_DB"] = "true" if args.async_db else "false"
+    os.environ.setdefault("RECURRING_SCHEDULER_ENABLED", "false")
+    # Schéma créé par _prepare_schema
+    os.environ["DB_SCHEMA_SETUP"] = "none"
+    # Sous charge, le journal des requêtes lentes noierait la progression
+    os.environ.setdefault("SLOW_REQUEST_THRESHOLD_MS", "60000")
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, ensure_ascii=False)
+    print(f"Résultats enregistrés dans {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
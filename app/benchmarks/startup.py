@@ -0,0 +1,175 @@
+"""Banc de mesure du démarrage : import de app.main et délai avant la première réponse.
+
+Chaque mesure est faite dans un processus neuf (modules non chargés) :
+- import : durée de ``import app.main`` (aucun accès à la base attendu),
+- ready : import + lifespan (vérification du schéma) + première réponse de /health,
+- process : du lancement de l'interpréteur à sa sortie.
+Avec --server, un uvicorn réel est lancé et /health interrogé jusqu'à la
+première réponse (démarrage à froid d'un worker).
+
+La base (SQLite temporaire par défaut) est migrée une fois avant les mesures
+(python -m app.db.migrate), comme en production.
+
+    python -m app.benchmarks.startup --runs 5
+    python -m app.benchmarks.startup --async-db --server --top 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Exécuté dans le processus mesuré (httpx chargé avant la mesure)
+PROBE = """
+import asyncio, json, time
+import httpx
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def ready():
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/health")
+        response.raise_for_status()
+        return started, time.perf_counter()
+
+started, answered = asyncio.run(ready())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "ready_ms": (answered - start) * 1000,
+}))
+"""
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def _environment(args) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url
+    env.pop("ASYNC_DATABASE_URL", None)
+    env["ASYNC_DB"] = "true" if args.async_db else "false"
+    env["RECURRING_SCHEDULER_ENABLED"] = "false"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+def measure_probe(env: Dict[str, str]) -> dict:
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_server(env: Dict[str, str], timeout: float = 60) -> dict:
+    """Lancer uvicorn et attendre la première réponse de /health"""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn arrêté : {process.stderr.read().decode()[-2000:]}")
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"/health sans réponse après {timeout} s")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return {"server_ready_ms": (time.perf_counter() - start) * 1000}
+            except OSError:
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def import_profile(env: Dict[str, str], top: int) -> List[dict]:
+    """Modules les plus coûteux à l'import (python -X importtime), temps propre"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, cwd=ROOT, check=True, capture_output=True, text=True
+    ).stderr
+    modules = []
+    for match in IMPORT_TIME.finditer(stderr):
+        self_us, cumulative_us, _, name = match.groups()
+        modules.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return sorted(modules, key=lambda module: module["self_ms"], reverse=True)[:top]
+
+def summarize(samples: List[dict]) -> Dict[str, dict]:
+    keys = sorted({key for sample in samples for key in sample})
+    return {
+        key: {
+            "median": round(statistics.median(values), 3),
+            "min": round(min(values), 3),
+            "max": round(max(values), 3),
+        }
+        for key in keys
+        for values in [[sample[key] for sample in samples if key in sample]]
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mesurer le démarrage de l'application")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="base déjà migrée ou à migrer (défaut : SQLite temporaire)")
+    parser.add_argument("--async-db", action="store_true")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--server", action="store_true", help="mesurer aussi un uvicorn réel")
+    parser.add_argument("--top", type=int, default=0, help="afficher les N imports les plus lents")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.database_url:
+            args.database_url = f"sqlite:///{Path(directory) / 'startup.db'}"
+        env = _environment(args)
+        subprocess.run([sys.executable, "-m", "app.db.migrate"], env=env, cwd=ROOT, check=True,
+                       capture_output=True)
+
+        # Premier lancement écarté : compilation des .pyc
+        measure_probe(env)
+        samples = []
+        for _ in range(args.runs):
+            sample = measure_probe(env)
+            if args.server:
+                sample.update(measure_server(env))
+            samples.append(sample)
+        profile = import_profile(env, args.top) if args.top else []
+
+    report = {
+        "meta": {"python": sys.version.split()[0], "async_db": args.async_db, "runs": args.runs},
+        "startup_ms": summarize(samples),
+        "samples": samples,
+        "import_profile": profile,
+    }
+    for key, values in report["startup_ms"].items():
+        print(f"{key:16} médiane {values['median']:9.1f} ms  (min {values['min']:.1f}, max {values['max']:.1f})")
+    for module in profile:
+        print(f"  {module['self_ms']:8.1f} ms  {module['module']} (cumulé {module['cumulative_ms']:.1f} ms)")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
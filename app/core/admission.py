@@ -0,0 +1,195 @@
+"""Contrôle d'admission : limite de concurrence par groupe de routes.
+
+Chaque groupe (auth, todos, tags, recurring) admet au plus N requêtes
+simultanées par worker ; au-delà, les requêtes attendent dans une file
+bornée, au plus ADMISSION_QUEUE_TIMEOUT_SECONDS. File pleine ou délai
+dépassé : réponse 503 immédiate avec Retry-After, au lieu d'attendre
+indéfiniment une connexion du pool ou un thread.
+
+Le délestage suit l'utilisation du pool de connexions (empruntées / capacité) :
+- au-delà de ADMISSION_SHED_EXPENSIVE_AT, les routes coûteuses (recherche,
+  export, traitement groupé) sont refusées d'emblée,
+- au-delà de ADMISSION_SHED_QUEUE_AT, plus aucune requête n'est mise en file :
+  seules les places libres du groupe sont attribuées.
+Les routes hors groupe (/health, /metrics, documentation) ne sont jamais limitées.
+
+La limite est par processus : le nombre de places de tous les groupes doit
+rester sous la taille du threadpool (40 par défaut) pour que la file
+d'attente soit celle-ci, et non celle des threads.
+"""
+import asyncio
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from starlette.responses import JSONResponse
+
+# Préfixes (sous API_V1_STR) -> groupe
+ROUTE_GROUPS: Tuple[Tuple[str, str], ...] = (
+    ("/todos", "todos"),
+    ("/tags", "tags"),
+    ("/recurring", "recurring"),
+    ("/sync", "todos"),
+    ("/login", "auth"),
+    ("/register", "auth"),
+    ("/me", "auth"),
+)
+
+# Routes coûteuses, délestées en premier
+EXPENSIVE_ROUTES = frozenset({
+    ("GET", "/todos/search"),
+    ("GET", "/todos/export"),
+    ("POST", "/todos/bulk"),
+})
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+class ConcurrencyLimit:
+    """Places d'un groupe et file d'attente bornée
+
+    Utilisée uniquement depuis la boucle d'événements du worker : pas de verrou.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "deadline": 0, "shed": 0, "saturated": 0}
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(reason)
+
+    async def acquire(self, queue: bool = True) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if not queue:
+            raise self._reject("saturated")
+        if len(self._waiters) >= self.queue_size:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Place transmise au moment de l'abandon : la rendre
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("deadline") from None
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        # La place passe directement au premier en attente (ordre d'arrivée)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+        }
+
+class AdmissionController:
+    """Classement des requêtes et décision d'admission"""
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        queue_size: int,
+        timeout: float,
+        prefix: str = "",
+        utilization: Callable[[], float] = lambda: 0.0,
+        shed_expensive_at: float = 0.75,
+        shed_queue_at: float = 1.0,
+        expensive_routes: Iterable[Tuple[str, str]] = EXPENSIVE_ROUTES
+    ):
+        self.limits = {
+            name: ConcurrencyLimit(name, limit, queue_size, timeout) for name, limit in limits.items()
+        }
+        self.prefix = prefix
+        self.utilization = utilization
+        self.shed_expensive_at = shed_expensive_at
+        self.shed_queue_at = shed_queue_at
+        self.expensive_routes = frozenset((method, prefix + path) for method, path in expensive_routes)
+
+    def classify(self, path: str) -> Optional[ConcurrencyLimit]:
+        if not path.startswith(self.prefix):
+            return None
+        relative = path[len(self.prefix):]
+        for route_prefix, group in ROUTE_GROUPS:
+            if relative == route_prefix or relative.startswith(route_prefix + "/"):
+                return self.limits.get(group)
+        return None
+
+    async def admit(self, method: str, path: str) -> Optional[ConcurrencyLimit]:
+        """Place obtenue (à rendre par release) ou AdmissionRejected ; None : route non limitée"""
+        limit = self.classify(path)
+        if limit is None:
+            return None
+        utilization = self.utilization()
+        if utilization >= self.shed_expensive_at and (method, path.rstrip("/")) in self.expensive_routes:
+            raise limit._reject("shed")
+        await limit.acquire(queue=utilization < self.shed_queue_at)
+        return limit
+
+    def stats(self) -> dict:
+        return {
+            "pool_utilization": round(self.utilization(), 3),
+            "shed_expensive_at": self.shed_expensive_at,
+            "shed_queue_at": self.shed_queue_at,
+            "groups": {name: limit.stats() for name, limit in self.limits.items()},
+        }
+
+class AdmissionMiddleware:
+    """Middleware ASGI : 503 + Retry-After pour les requêtes non admises"""
+
+    def __init__(self, app, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            limit = await self.controller.admit(scope["method"], scope["path"])
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": "Service saturé, réessayez plus tard", "reason": e.reason},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if limit is not None:
+                limit.release()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import settings
+
+class TTLCache:
+    """Cache LRU borné avec expiration par entrée, sûr entre threads"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._on_set(key, value)
+            while len(self._data) > self.max_size:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._on_clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    # Appelés sous verrou : permettent aux sous-classes de maintenir des index
+    def _remove(self, key: Any) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._on_remove(key, entry[1])
+
+    def _on_set(self, key: Any, value: Any) -> None:
+        pass
+
+    def _on_remove(self, key: Any, value: Any) -> None:
+        pass
+
+    def _on_clear(self) -> None:
+        pass
+
+class PrincipalCache(TTLCache):
+    """Cache token -> (claims, utilisateur) avec invalidation par sujet (email)"""
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size, ttl)
+        self._by_subject: Dict[str, Set[str]] = {}
+
+    def invalidate_subject(self, subject: str) -> None:
+        with self._lock:
+            for token in list(self._by_subject.get(subject, ())):
+                self._remove(token)
+
+    def _on_set(self, key: str, value: Any) -> None:
+        claims, _ = value
+        self._by_subject.setdefault(claims["sub"], set()).add(key)
+
+    def _on_remove(self, key: str, value: Any) -> None:
+        claims, _ = value
+        tokens = self._by_subject.get(claims["sub"])
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._by_subject[claims["sub"]]
+
+    def _on_clear(self) -> None:
+        self._by_subject.clear()
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
@@ -1,11 +1,92 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "Todo API"
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str
+    # Chemin de données asynchrone (AsyncSession) ; l'URL est dérivée de DATABASE_URL si absente
+    ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Pool de connexions (par moteur et par worker) :
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) doit rester sous max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    # Schéma au démarrage (lifespan) : 'check' (révision Alembic à jour, sinon échec),
+    # 'create' (create_all, développement) ou 'none' ; migrations : python -m app.db.migrate
+    DB_SCHEMA_SETUP: str = "check"
+    # Réplicas en lecture (URLs synchrones, même schéma) : routes de lecture de
+    # app.db.replicas.READ_ROUTES ; après une écriture, un cookie signé garde les
+    # lectures de l'utilisateur sur le primaire READ_REPLICA_STICKY_SECONDS (retard
+    # de réplication) ; un réplica injoignable est écarté READ_REPLICA_RETRY_SECONDS
+    READ_REPLICA_URLS: List[str] = []
+    READ_REPLICA_STRATEGY: str = "round_robin"  # 'round_robin' ou 'least_connections'
+    READ_REPLICA_STICKY_SECONDS: float = 5
+    READ_REPLICA_RETRY_SECONDS: float = 30
     SECRET_KEY: str = "your-secret-key-here"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Cache des utilisateurs authentifiés (get_current_user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Catalogue des tags : délai sans relecture de la version (0 = relue à chaque usage)
+    TAG_CATALOG_CHECK_INTERVAL_SECONDS: float = 0
+
+    # Instrumentation des requêtes (Server-Timing, /metrics, journal des requêtes lentes)
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_THRESHOLD_MS: float = 500
+    SLOW_REQUEST_MAX_STATEMENTS: int = 50
+
+    # Contrôle d'admission par groupe de routes (par worker) : places, file d'attente
+    # bornée et délai maximal d'attente, puis 503 + Retry-After. Délestage selon
+    # l'utilisation du pool (routes coûteuses d'abord, puis plus de file d'attente)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_LIMITS: Dict[str, int] = {"auth": 8, "todos": 16, "tags": 6, "recurring": 6}
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_SHED_EXPENSIVE_AT: float = 0.75
+    ADMISSION_SHED_QUEUE_AT: float = 1.0
+
+    # Flux de synchronisation : suppressions conservées (au-delà, un jeton plus ancien reçoit 410)
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Flux d'événements SSE (GET /events, par worker) : courtier, éléments en attente
+    # par abonné (au-delà : événement resync), fusion des rafales, battement de cœur
+    EVENTS_BACKEND: str = "memory"
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_COALESCE_SECONDS: float = 0.05
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+    EVENTS_RETRY_MS: int = 3000
+    EVENTS_MAX_SUBSCRIBERS: int = 20000
+    # Flux ouverts par utilisateur (onglets, appareils) ; au-delà : 429
+    EVENTS_MAX_SUBSCRIBERS_PER_USER: int = 10
+
+    # Hachage des mots de passe hors de la boucle d'événements
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # 'thread' ou 'process'
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    # Listes GET /todos et /recurring sérialisées depuis les lignes (orjson si installé)
+    FAST_JSON_RESPONSES: bool = False
+
+    # Export en flux : lignes lues par lots depuis un curseur côté serveur
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Génération planifiée des tâches récurrentes (python -m app.services.scheduler)
+    RECURRING_SCHEDULER_ENABLED: bool = False
+    RECURRING_SCHEDULER_INTERVAL_SECONDS: float = 300
+    RECURRING_BATCH_SIZE: int = 1000
+    # Les instances sont créées jusqu'à ce délai avant leur échéance
+    RECURRING_LEAD_TIME_HOURS: int = 24
+    # Occurrences manquées rattrapées au plus par série et par passage (les plus récentes)
+    RECURRING_MAX_CATCH_UP: int = 10
     
     class Config:
         env_file = ".env"
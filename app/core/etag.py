@@ -0,0 +1,21 @@
+from typing import Optional
+from fastapi import Request, Response, status
+
+# Requêtes conditionnelles : If-None-Match / 304 Not Modified
+
+ETAG_HEADER = "ETag"
+
+def make_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    # Comparaison faible : W/"x" et "x" désignent la même représentation
+    weak = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or etag in candidates or weak in candidates
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
\ No newline at end of file
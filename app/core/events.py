@@ -0,0 +1,251 @@
+"""Événements temps réel : diffusion des écritures aux flux SSE (GET /events).
+
+Les services publient après commit un événement par élément écrit
+({"entity", "op", "id", "revision"}) ; les tags, partagés, sont diffusés à
+tous les abonnés. Le contenu n'est pas transmis : le client relit les
+changements par le flux de synchronisation (GET /sync/changes).
+
+Chaque abonné garde ses événements en attente dans un dict borné, indexé par
+(entité, id) : une rafale d'écritures sur un même élément est fusionnée en un
+seul événement (created puis updated : created ; created puis deleted :
+rien). Au-delà de EVENTS_QUEUE_SIZE éléments distincts (client lent, rafale),
+l'attente est vidée et un seul événement "resync" est envoyé. La mémoire par
+abonné reste donc bornée, sans file ni tâche dédiée : un abonné inactif ne
+coûte qu'un dict vide, un asyncio.Event et sa connexion. Une seule tâche
+réveille tous les abonnés pour le battement de cœur (commentaire SSE).
+
+Le courtier est choisi par EVENTS_BACKEND ; le courtier en mémoire ne
+diffuse qu'aux abonnés du worker courant. Les publications depuis les
+threads (routes synchrones) passent par call_soon_threadsafe.
+"""
+import asyncio
+import json
+from typing import Dict, Iterable, Optional, Set
+from app.core.config import settings
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+RESYNC = "resync"
+
+HEARTBEAT = b": ping\n\n"
+
+# Sans mise en tampon par les proxys (nginx) ni par les caches
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+class TooManySubscribers(Exception):
+    pass
+
+class Subscriber:
+    """Événements en attente d'un flux, fusionnés par élément"""
+
+    __slots__ = ("user_id", "max_pending", "pending", "overflowed", "heartbeat", "wakeup")
+
+    def __init__(self, user_id: int, max_pending: int):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self.pending: Dict[tuple, dict] = {}
+        self.overflowed = False
+        self.heartbeat = False
+        self.wakeup = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        key = (event["entity"], event["id"])
+        previous = self.pending.get(key)
+        if previous is not None:
+            if previous["op"] == CREATED:
+                if event["op"] == DELETED:
+                    # Jamais vu par le client : rien à envoyer
+                    del self.pending[key]
+                    return
+                event = dict(event, op=CREATED)
+        elif len(self.pending) >= self.max_pending:
+            # Client en retard : resynchronisation plutôt qu'une file sans fin
+            self.pending.clear()
+            self.overflowed = True
+        if not self.overflowed:
+            self.pending[key] = event
+        self.wakeup.set()
+
+    def drain(self) -> bytes:
+        """Événements SSE en attente (battement de cœur seul si aucun)"""
+        self.wakeup.clear()
+        if self.overflowed:
+            self.overflowed = False
+            chunks = [_format(RESYNC, {})]
+        else:
+            chunks = [_format(f"{event['entity']}.{event['op']}", event) for event in self.pending.values()]
+            self.pending.clear()
+        if not chunks and self.heartbeat:
+            chunks = [HEARTBEAT]
+        self.heartbeat = False
+        return b"".join(chunks)
+
+def _format(name: str, data: dict) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+class EventBroker:
+    """Interface des courtiers : publication (tout thread), abonnements (boucle du worker)"""
+
+    def publish(self, user_id: Optional[int], entity: str, op: str, ids: Iterable[int],
+                revision: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        raise NotImplementedError
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        raise NotImplementedError
+
+    def full(self) -> bool:
+        return False
+
+    def user_full(self, user_id: int) -> bool:
+        return False
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+class InMemoryEventBroker(EventBroker):
+    """Diffusion aux abonnés du processus courant"""
+
+    def __init__(self, queue_size: int, heartbeat: float, max_subscribers: int, max_per_user: int):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        self.max_per_user = max_per_user
+        self.published = 0
+        self.rejected = 0
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.heartbeat > 0:
+            self._heartbeat_task = asyncio.create_task(self._beat())
+
+    async def stop(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        self._loop = None
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for subscribers in self._subscribers.values():
+                for subscriber in subscribers:
+                    subscriber.heartbeat = True
+                    subscriber.wakeup.set()
+
+    def publish(self, user_id, entity, op, ids, revision=None) -> None:
+        loop = self._loop
+        # Courtier non démarré (scripts, planificateur hors API) : aucun abonné
+        if loop is None or not self._count:
+            return
+        events = [{"entity": entity, "op": op, "id": item_id, "revision": revision} for item_id in ids]
+        if not events:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(user_id, events)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, user_id, events)
+
+    def _dispatch(self, user_id: Optional[int], events: list) -> None:
+        if user_id is None:
+            targets = [subscriber for subscribers in self._subscribers.values() for subscriber in subscribers]
+        else:
+            targets = self._subscribers.get(user_id, ())
+        for subscriber in targets:
+            for event in events:
+                subscriber.push(event)
+        self.published += len(events)
+
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def user_full(self, user_id: int) -> bool:
+        return len(self._subscribers.get(user_id, ())) >= self.max_per_user
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        if self.full() or self.user_full(user_id):
+            self.rejected += 1
+            raise TooManySubscribers()
+        subscriber = Subscriber(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        self._count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.user_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.user_id]
+        self._count -= 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "subscribers": self._count,
+            "users": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "max_subscribers_per_user": self.max_per_user,
+            "published": self.published,
+            "rejected": self.rejected,
+        }
+
+BROKERS = {
+    "memory": InMemoryEventBroker,
+}
+
+def create_broker(backend: str, **options) -> EventBroker:
+    if backend not in BROKERS:
+        raise ValueError(f"Courtier d'événements inconnu : {backend}")
+    return BROKERS[backend](**options)
+
+async def event_stream(broker: EventBroker, user_id: int, coalesce: float, retry_ms: int):
+    """Corps SSE : abonnement, fusion des rafales, désabonnement à la déconnexion
+
+    L'abonnement est pris au premier envoi, pour être libéré par le même
+    finally quelle que soit la fin du flux.
+    """
+    try:
+        subscriber = broker.subscribe(user_id)
+    except TooManySubscribers:
+        return
+    try:
+        yield f"retry: {retry_ms}\n\n".encode()
+        while True:
+            await subscriber.wakeup.wait()
+            if coalesce > 0 and subscriber.pending:
+                # Rafale : laisser arriver les écritures suivantes avant l'envoi
+                await asyncio.sleep(coalesce)
+            chunk = subscriber.drain()
+            if chunk:
+                yield chunk
+    finally:
+        broker.unsubscribe(subscriber)
+
+event_broker = create_broker(
+    settings.EVENTS_BACKEND,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    heartbeat=settings.EVENTS_HEARTBEAT_SECONDS,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+    max_per_user=settings.EVENTS_MAX_SUBSCRIBERS_PER_USER
+)
\ No newline at end of file
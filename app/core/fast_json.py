@@ -0,0 +1,36 @@
+import json
+from datetime import date, datetime
+from typing import Any
+from fastapi import Response
+
+# Réponses JSON rapides (FAST_JSON_RESPONSES) : le contenu est déjà fait de
+# dicts conformes au response_model de la route, il est encodé directement
+# sans nouvelle validation Pydantic. orjson est utilisé s'il est installé,
+# sinon le module json (même rendu que JSONResponse).
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    """Réponse directe reprenant les en-têtes posés sur le paramètre response de la route"""
+    return FastJSONResponse(content, headers=dict(response.headers))
\ No newline at end of file
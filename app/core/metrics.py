@@ -0,0 +1,232 @@
+"""Instrumentation des requêtes : latence, SQL et attente du pool.
+
+Le middleware ouvre un RequestStats par requête (ContextVar, propagée aux
+endpoints synchrones exécutés dans le threadpool) ; les événements du moteur
+SQLAlchemy et le pool instrumenté y ajoutent le nombre et la durée des
+requêtes SQL et le temps d'attente d'une connexion. À la fin de la requête :
+- en-tête Server-Timing (mesures arrêtées à l'envoi des en-têtes),
+- histogrammes par (méthode, route) exposés au format Prometheus (/metrics),
+- journal des requêtes lentes avec les requêtes SQL exécutées.
+
+Les métriques sont propres au processus : chaque worker expose les siennes.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+
+logger = logging.getLogger("api.slow_requests")
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+class RequestStats:
+    """Mesures d'une requête HTTP"""
+
+    def __init__(self, max_statements: int = 50):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.pool_wait = 0.0
+        # Base de la session de la requête ('primary', 'replica-0'...), si routée
+        self.db_route: Optional[str] = None
+        self.statements: List[Tuple[str, float]] = []
+        self.max_statements = max_statements
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        self.sql_count += 1
+        self.sql_time += seconds
+        if len(self.statements) < self.max_statements:
+            self.statements.append((statement, seconds))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f"app;dur={self.elapsed() * 1000:.3f}",
+            f'db;dur={self.sql_time * 1000:.3f};desc="{self.sql_count} statements"',
+            f"pool;dur={self.pool_wait * 1000:.3f}",
+            *([f'dbroute;desc="{self.db_route}"'] if self.db_route else []),
+        ])
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+def record_pool_wait(seconds: float) -> None:
+    """Appelé par le pool instrumenté (app.db.pool) à chaque checkout"""
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+def record_db_route(name: str) -> None:
+    """Appelé par get_db quand des réplicas sont configurés"""
+    stats = _current.get()
+    if stats is not None:
+        stats.db_route = name
+
+def instrument_engine(engine) -> None:
+    """Compter et chronométrer les requêtes SQL d'un moteur synchrone (ou sync_engine)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        starts = conn.info.get("query_start")
+        if stats is not None and starts:
+            stats.record_statement(statement, time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Requête en échec : pas d'after_cursor_execute, on retire son départ
+        conn = exception_context.connection
+        starts = conn.info.get("query_start") if conn is not None else None
+        if starts:
+            starts.pop()
+
+class Histogram:
+    """Histogramme Prometheus (cumulatif) par jeu de labels"""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labels: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [compte par bucket (+Inf en dernier), somme]
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for label_values, counts, total in sorted(series):
+            labels = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class RequestMetrics:
+    """Agrégats des requêtes HTTP du processus"""
+
+    def __init__(self):
+        labels = ("method", "route", "status")
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Durée totale des requêtes HTTP", LATENCY_BUCKETS, labels
+        )
+        self.sql_statements = Histogram(
+            "http_request_sql_statements", "Requêtes SQL exécutées par requête HTTP", STATEMENT_BUCKETS, labels
+        )
+        self.sql_time = Histogram(
+            "http_request_sql_duration_seconds", "Temps SQL cumulé par requête HTTP", LATENCY_BUCKETS, labels
+        )
+        self.pool_wait = Histogram(
+            "http_request_pool_wait_seconds", "Attente d'une connexion du pool par requête HTTP",
+            POOL_WAIT_BUCKETS, labels
+        )
+
+    def observe(self, method: str, route: str, status: int, stats: RequestStats, seconds: float) -> None:
+        labels = (method, route, str(status))
+        self.latency.observe(seconds, *labels)
+        self.sql_statements.observe(stats.sql_count, *labels)
+        self.sql_time.observe(stats.sql_time, *labels)
+        self.pool_wait.observe(stats.pool_wait, *labels)
+
+    def render(self) -> str:
+        lines = []
+        for histogram in (self.latency, self.sql_statements, self.sql_time, self.pool_wait):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+request_metrics = RequestMetrics()
+
+def _route_template(scope) -> str:
+    # Gabarit de la route (/api/v1/todos/{todo_id}) : cardinalité bornée
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """Middleware ASGI : mesures par requête, Server-Timing, agrégats et journal des lentes"""
+
+    def __init__(self, app, slow_threshold_ms: float = 500, max_statements: int = 50,
+                 metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.max_statements = max_statements
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(self.max_statements)
+        token = _current.set(stats)
+        status_code = 500
+        event_stream = False
+
+        async def send_with_timing(message):
+            nonlocal status_code, event_stream
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                event_stream = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                )
+                headers.append((SERVER_TIMING_HEADER.lower().encode(), stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # Flux SSE : durée de connexion, ni latence ni requête lente
+            if not event_stream:
+                seconds = stats.elapsed()
+                route = _route_template(scope)
+                self.metrics.observe(scope["method"], route, status_code, stats, seconds)
+                if seconds >= self.slow_threshold:
+                    self._log_slow(scope["method"], route, status_code, stats, seconds)
+
+    def _log_slow(self, method: str, route: str, status_code: int, stats: RequestStats, seconds: float) -> None:
+        lines = [
+            f"Requête lente {method} {route} -> {status_code} : {seconds * 1000:.1f} ms, "
+            f"{stats.sql_count} requêtes SQL ({stats.sql_time * 1000:.1f} ms), "
+            f"attente du pool {stats.pool_wait * 1000:.1f} ms"
+        ]
+        lines.extend(f"  {duration * 1000:8.1f} ms  {' '.join(statement.split())}"
+                     for statement, duration in stats.statements)
+        if stats.sql_count > len(stats.statements):
+            lines.append(f"  ... {stats.sql_count - len(stats.statements)} autres requêtes")
+        logger.warning("\n".join(lines))
\ No newline at end of file
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+# Pagination par curseur (keyset) sur (created_at, id) : chaque page reprend
+# après la dernière ligne vue au lieu de parcourir un OFFSET.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+# Identifiants acceptés dans un curseur (entier SQL sur 64 bits)
+MAX_CURSOR_ID = 2 ** 63 - 1
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at, item_id = datetime.fromisoformat(created_at), int(item_id)
+        # Curseur forgé hors des bornes de la colonne : l'erreur viendrait de la base
+        if not 0 <= item_id <= MAX_CURSOR_ID:
+            raise ValueError(item_id)
+        return created_at, item_id
+    except (ValueError, TypeError, OverflowError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Curseur de pagination invalide"
+        )
+
+def apply_keyset(query, model, cursor: Optional[str] = None):
+    """Trie par (created_at, id) et reprend après le curseur s'il est fourni"""
+    query = query.order_by(model.created_at, model.id)
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) > decode_cursor(cursor))
+    return query
+
+def next_cursor(items: List, limit: int) -> Optional[str]:
+    """Curseur de la page suivante, None si la page est la dernière"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
+def set_next_cursor(response: Response, items: List, limit: int) -> None:
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,93 @@
+"""Vérification des plans d'exécution des requêtes des services.
+
+Exécute les méthodes de lecture de app/services/service.py, capture le SQL
+réellement émis (y compris les requêtes selectinload des tags) et affiche
+le plan de chaque requête. Les parcours séquentiels des tables filtrées
+sont signalés.
+
+    python -m app.db.explain
+
+Sur une base presque vide, PostgreSQL préfère souvent un Seq Scan même si
+l'index existe : lancer la vérification sur des données représentatives
+(seed) après ANALYZE.
+"""
+import re
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.core.pagination import encode_cursor
+from app.db.session import engine
+from app.services.service import RecurringTodoService, TodoService
+
+FILTERED_TABLES = ("todos", "recurring_todos", "todo_tags", "recurring_todo_tags")
+
+SEQUENTIAL_SCAN = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # « SCAN t » sans index ; « SCAN t USING INDEX » est un parcours d'index
+    "sqlite": re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?! VIRTUAL TABLE)"),
+}
+
+def service_queries(user_id: int = 1):
+    """Appels de service dont on vérifie les plans"""
+    now = datetime.utcnow()
+    return [
+        ("TodoService.get_todos", lambda db: TodoService.get_todos(db, user_id)),
+        ("TodoService.get_todos (curseur)", lambda db: TodoService.get_todos(
+            db, user_id, cursor=encode_cursor(now, 0))),
+        ("TodoService.get_todo", lambda db: TodoService.get_todo(db, 1, user_id)),
+        ("TodoService.search_todos", lambda db: TodoService.search_todos(
+            db, user_id, "reunion", completed=False, tag_id=1, priority=2)),
+        ("TodoService.filter_todos (completed, due_before)", lambda db: TodoService.filter_todos(
+            db, user_id, completed=False, due_before=now)),
+        ("TodoService.filter_todos (priority)", lambda db: TodoService.filter_todos(
+            db, user_id, priority=3)),
+        ("TodoService.filter_todos (tag_id)", lambda db: TodoService.filter_todos(
+            db, user_id, tag_id=1)),
+        ("TodoService.get_stats", lambda db: TodoService.get_stats(db, user_id)),
+        ("RecurringTodoService.get_recurring_todos", lambda db: RecurringTodoService.get_recurring_todos(
+            db, user_id)),
+        ("RecurringTodoService.get_occurrences", lambda db: RecurringTodoService.get_occurrences(
+            db, user_id, now, now + timedelta(days=30))),
+    ]
+
+def explain(db_engine=engine) -> int:
+    dialect = db_engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    scan_pattern = SEQUENTIAL_SCAN.get(dialect)
+    Session = sessionmaker(bind=db_engine)
+    warnings = 0
+
+    for name, call in service_queries():
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(db_engine, "before_cursor_execute", capture)
+        db = Session()
+        try:
+            call(db)
+        finally:
+            db.close()
+            event.remove(db_engine, "before_cursor_execute", capture)
+
+        print(f"=== {name}")
+        with db_engine.connect() as conn:
+            for statement, parameters in captured:
+                print(statement.strip())
+                plan = "\n".join(
+                    " | ".join(str(value) for value in row)
+                    for row in conn.exec_driver_sql(prefix + statement, parameters)
+                )
+                print(plan)
+                scanned = set(scan_pattern.findall(plan)) if scan_pattern else set()
+                for table in sorted(scanned.intersection(FILTERED_TABLES)):
+                    warnings += 1
+                    print(f"!!! parcours séquentiel de {table}")
+                print()
+    return warnings
+
+if __name__ == "__main__":
+    sys.exit(1 if explain() else 0)
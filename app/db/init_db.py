@@ -1,18 +1,45 @@
-from sqlalchemy import create_engine
-from app.core.config import settings
+import argparse
+from typing import Optional
+from sqlalchemy import func, select, text
+from app.models import models
 from app.models.models import Base
-from app.db.seed import seed_database
-from app.db.session import SessionLocal
+from app.db.migrate import upgrade
+from app.db.seed import SEED_SIZES, seed_bulk, seed_database
+from app.db.session import engine, SessionLocal
+from app.services.search import drop_search_schema
 
-def init_db():
-    engine = create_engine(settings.DATABASE_URL)
+def reset_db():
+    # Tout supprimer, y compris la révision Alembic : migrations rejouées depuis le début
+    with engine.begin() as conn:
+        drop_search_schema(conn)
     Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+def init_db(size: Optional[str] = None, seed: int = 42, reset: bool = False):
+    """Migrer le schéma puis remplir une base vide (les données existantes sont conservées)"""
+    if reset:
+        reset_db()
+    upgrade()
+
+    with engine.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(models.User)):
+            return
     
+    # Jeu volumineux (preset de SEED_SIZES) ou données de démonstration
+    if size:
+        seed_bulk(engine, seed=seed, **SEED_SIZES[size])
+        return
+
     # Remplir la base de données avec des données de test
     db = SessionLocal()
     seed_database(db)
     db.close()
 
 if __name__ == "__main__":
-    init_db()
+    parser = argparse.ArgumentParser(description="Migrer et remplir la base de données")
+    parser.add_argument("--size", choices=sorted(SEED_SIZES), help="jeu de données volumineux")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="supprimer toutes les tables avant")
+    args = parser.parse_args()
+    init_db(args.size, args.seed, args.reset)
\ No newline at end of file
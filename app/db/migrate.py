@@ -0,0 +1,85 @@
+"""Schéma de la base : migrations Alembic et vérification au démarrage.
+
+Les migrations sont appliquées une fois, par une commande dédiée, avant le
+lancement des workers :
+
+    python -m app.db.migrate
+
+Au démarrage (lifespan de app.main), chaque worker se contente de vérifier
+que la base est à la dernière révision (DB_SCHEMA_SETUP=check) : une
+lecture de alembic_version, sans DDL concurrent entre workers.
+"""
+import re
+from pathlib import Path
+from typing import Optional
+from sqlalchemy import inspect, text
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+VERSIONS_DIR = ALEMBIC_INI.parent / "app" / "alembic" / "versions"
+REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=]*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+
+SCHEMA_SETUP_MODES = ("check", "create", "none")
+
+def alembic_config():
+    # Import différé : Alembic n'est chargé que par les commandes et la vérification
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "app" / "alembic"))
+    return config
+
+def head_revision() -> Optional[str]:
+    """Dernière révision, lue dans les fichiers de migration
+
+    Sans alembic.script (~100 ms d'import au démarrage de chaque worker) :
+    la chaîne des révisions est linéaire, la tête est la seule révision
+    qu'aucune autre ne remplace.
+    """
+    revisions, replaced = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        for name, value in REVISION_LINE.findall(path.read_text(encoding="utf-8")):
+            (revisions if name == "revision" else replaced).add(value)
+    heads = revisions - replaced
+    if len(heads) > 1:
+        raise RuntimeError(f"Plusieurs têtes de migration : {sorted(heads)}")
+    return heads.pop() if heads else None
+
+def current_revision(conn) -> Optional[str]:
+    # Table absente : base jamais migrée
+    if not inspect(conn).has_table("alembic_version"):
+        return None
+    return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+def upgrade(revision: str = "head") -> None:
+    """Appliquer les migrations (URL : settings.DATABASE_URL, cf. app/alembic/env.py)"""
+    from alembic import command
+
+    command.upgrade(alembic_config(), revision)
+
+def check_schema(engine) -> str:
+    """Vérifier que la base est à la dernière révision ; renvoie la révision"""
+    with engine.connect() as conn:
+        current = current_revision(conn)
+    head = head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Schéma de la base en révision {current}, attendue {head} : "
+            "lancer python -m app.db.migrate"
+        )
+    return current
+
+def setup_schema(engine, mode: str) -> None:
+    """Préparation du schéma au démarrage, selon DB_SCHEMA_SETUP"""
+    if mode not in SCHEMA_SETUP_MODES:
+        raise ValueError(f"DB_SCHEMA_SETUP inconnu : {mode}")
+    if mode == "check":
+        check_schema(engine)
+    elif mode == "create":
+        from app.models.models import Base
+        from app.services.search import ensure_search_schema
+
+        Base.metadata.create_all(bind=engine)
+        ensure_search_schema(engine)
+
+if __name__ == "__main__":
+    upgrade()
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""Lectures sur réplicas (READ_REPLICA_URLS).
+
+get_db / get_async_db ouvrent la session sur un réplica pour les routes de
+READ_ROUTES (lectures sans écriture ni jeton à comparer), sur le primaire
+sinon. Le réplica est choisi à tour de rôle ('round_robin') ou selon le
+moins de connexions empruntées ('least_connections'). Un réplica injoignable
+est écarté READ_REPLICA_RETRY_SECONDS ; sans réplica disponible, la lecture
+passe par le primaire.
+
+Lecture de ses propres écritures : la réponse d'une écriture réussie pose un
+cookie signé (PrimaryPinMiddleware), lié au sujet du token et valable
+READ_REPLICA_STICKY_SECONDS à compter de la fin de l'écriture ; tant qu'il
+est présent, les lectures de l'utilisateur restent sur le primaire, quel que
+soit le worker qui les traite (aucun état côté serveur). Un client qui ne
+renvoie pas les cookies lit sur les réplicas.
+
+Non routées : GET /sync/changes (un jeton lu sur le primaire serait en avance
+sur un réplica : 410) et /me.
+"""
+import hashlib
+import hmac
+import itertools
+import math
+import threading
+import time
+from typing import Optional, Tuple
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+# (méthode, route sous API_V1_STR sans / final) servies par un réplica
+READ_ROUTES = frozenset({
+    ("GET", "/todos"),
+    ("GET", "/todos/search"),
+    ("GET", "/todos/stats"),
+    ("GET", "/todos/export"),
+    ("GET", "/todos/{todo_id}"),
+    ("GET", "/tags"),
+    ("GET", "/recurring"),
+    ("GET", "/recurring/occurrences"),
+})
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Clé de Session.info : indice du réplica de la session
+REPLICA_KEY = "replica"
+
+# Cookie d'épinglage au primaire, et clé de l'état de la requête portant le sujet à épingler
+PIN_COOKIE = "primary_pin"
+PIN_SUBJECT_KEY = "primary_pin_subject"
+
+def _pool(engine):
+    # Moteur asynchrone : le pool est porté par le moteur synchrone sous-jacent
+    return getattr(engine, "sync_engine", engine).pool
+
+def _checked_out(engine) -> int:
+    pool = _pool(engine)
+    return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+class ReplicaSet:
+    """Moteurs des réplicas et choix du réplica d'une lecture"""
+
+    def __init__(self, engines: list, strategy: str = ROUND_ROBIN, retry_after: float = 30):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie de réplicas inconnue : {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self.reads = [0] * len(engines)
+        self.primary_reads = 0
+        self.failures = [0] * len(engines)
+        # Réplica écarté jusqu'à (time.monotonic) après un échec de connexion
+        self._down_until = [0.0] * len(engines)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Tuple[int, object]]:
+        """(indice, moteur) du réplica de la prochaine lecture, None si aucun n'est disponible"""
+        now = time.monotonic()
+        available = [index for index in range(len(self.engines)) if self._down_until[index] <= now]
+        if not available:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            # À égalité (pools au repos), le moins sollicité jusqu'ici
+            index = min(available, key=lambda i: (_checked_out(self.engines[i]), self.reads[i]))
+        else:
+            turn = next(self._turn)
+            index = min(available, key=lambda i: (i - turn) % len(self.engines))
+        with self._lock:
+            self.reads[index] += 1
+        return index, self.engines[index]
+
+    def mark_failed(self, index: int) -> None:
+        """Connexion impossible : réplica écarté retry_after secondes"""
+        with self._lock:
+            self.failures[index] += 1
+            self._down_until[index] = time.monotonic() + self.retry_after
+
+    def record_primary_read(self) -> None:
+        with self._lock:
+            self.primary_reads += 1
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "replica_reads": list(self.reads),
+            "replica_failures": list(self.failures),
+            "unavailable_replicas": [index for index, until in enumerate(self._down_until) if until > now],
+            "primary_reads": self.primary_reads,
+        }
+
+def route_key(scope: dict, prefix: str) -> Optional[Tuple[str, str]]:
+    """(méthode, gabarit de route) de la requête, une fois la route résolue"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None or not path.startswith(prefix):
+        return None
+    return scope["method"], path[len(prefix):].rstrip("/")
+
+def is_read_route(scope: dict, prefix: str) -> bool:
+    return route_key(scope, prefix) in READ_ROUTES
+
+def _pin_signature(subject: str, expires: int) -> str:
+    message = f"{subject}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+def pin_cookie_value(subject: str, expires: int) -> str:
+    return f"{expires}.{_pin_signature(subject, expires)}"
+
+def is_pinned(value: Optional[str], subject: str, now: Optional[float] = None) -> bool:
+    """Cookie d'épinglage valide (signé pour ce sujet) et non expiré"""
+    try:
+        expires_text, signature = value.split(".")
+        expires = int(expires_text)
+    except (AttributeError, ValueError):
+        return False
+    if expires <= (now if now is not None else time.time()):
+        return False
+    return hmac.compare_digest(signature, _pin_signature(subject, expires))
+
+class PrimaryPinMiddleware:
+    """Pose le cookie d'épinglage sur la réponse des écritures réussies
+
+    Le sujet est déposé dans l'état de la requête par get_db / get_async_db
+    (PIN_SUBJECT_KEY) ; le délai est compté à l'envoi de la réponse, après
+    la validation de l'écriture.
+    """
+
+    def __init__(self, app, sticky_seconds: float, path: str = "/"):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                subject = scope.get("state", {}).get(PIN_SUBJECT_KEY)
+                if subject is not None:
+                    expires = math.ceil(time.time() + self.sticky_seconds)
+                    MutableHeaders(scope=message).append(
+                        "set-cookie",
+                        f"{PIN_COOKIE}={pin_cookie_value(subject, expires)}; "
+                        f"Max-Age={math.ceil(self.sticky_seconds)}; Path={self.path}; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
\ No newline at end of file
@@ -1,8 +1,16 @@
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 from app.models import models
 from app.core.security import get_password_hash
+from app.services.stats import rebuild_counters
+from app.services.tag_catalog import bump_version
 from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List
+import argparse
+import csv
+import io
 import random
+import time
 
 def seed_database(db: Session):
     # Création d'utilisateurs
@@ -119,10 +127,237 @@ def seed_database(db: Session):
             todo.tags.extend(selected_tags)
             db.add(todo)
     
+    # Tâches insérées sans passer par les services : compteurs recalculés
+    db.flush()
+    for user in db_users:
+        rebuild_counters(db, user.id)
     db.commit()
 
+# Génération en volume (tests de charge) : lignes produites par lots à partir
+# d'une graine fixe, identifiants attribués par le générateur (aucune relecture),
+# insertions Core executemany ou COPY sous PostgreSQL (psycopg2), un seul hash
+# de mot de passe pour tous les utilisateurs.
+
+SEED_SIZES = {
+    "small": {"users": 10, "todos_per_user": 100, "tags": 20, "recurring_per_user": 5},
+    "medium": {"users": 100, "todos_per_user": 1000, "tags": 50, "recurring_per_user": 10},
+    "large": {"users": 1000, "todos_per_user": 1000, "tags": 100, "recurring_per_user": 20},
+    "xlarge": {"users": 5000, "todos_per_user": 1000, "tags": 200, "recurring_per_user": 20},
+}
+
+SEED_PASSWORD = "password"
+# Dates fixes : deux générations de même graine sont identiques
+SEED_BASE_TIME = datetime(2026, 1, 1)
+
+SEED_WORDS = [
+    "réunion", "rapport", "budget", "client", "projet", "courses", "sport", "facture",
+    "rendez-vous", "lecture", "appel", "revue", "livraison", "planning", "bilan", "voyage",
+    "médecin", "jardin", "présentation", "sauvegarde", "vacances", "cadeau", "vélo", "garage",
+]
+
+TODO_COLUMNS = ["id", "title", "description", "completed", "priority", "due_date", "created_at", "owner_id"]
+RECURRING_COLUMNS = [
+    "id", "title", "description", "frequency", "interval", "starts_at", "next_due_at",
+    "active", "created_at", "owner_id",
+]
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _copy_value(value):
+    return "\\N" if value is None else value
+
+class BulkWriter:
+    """Écriture par lots : COPY (PostgreSQL / psycopg2) ou INSERT executemany"""
+
+    def __init__(self, conn, chunk_size: int, progress: Callable[[str, int, int, float], None]):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+    def write(self, table, columns: List[str], rows: Iterable[tuple], total: int) -> int:
+        written = 0
+        start = time.perf_counter()
+        for chunk in _chunks(rows, self.chunk_size):
+            self.insert(table, columns, chunk)
+            written += len(chunk)
+            self.progress(table.name, written, total, time.perf_counter() - start)
+        return written
+
+    def insert(self, table, columns: List[str], chunk: List[tuple]) -> None:
+        if not chunk:
+            return
+        if self.use_copy:
+            self._copy(table.name, columns, chunk)
+        else:
+            self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+
+    def _copy(self, table_name: str, columns: List[str], chunk: List[tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow([_copy_value(value) for value in row])
+        buffer.seek(0)
+        cursor = self.conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+def print_progress(table: str, written: int, total: int, seconds: float) -> None:
+    rate = written / seconds if seconds else 0
+    print(f"\r{table}: {written}/{total} ({written * 100 // max(total, 1)} %), {rate:,.0f} lignes/s",
+          end="\n" if written >= total else "", flush=True)
+
+def _next_id(conn, model) -> int:
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+def seed_bulk(
+    engine,
+    users: int,
+    todos_per_user: int,
+    tags: int = 50,
+    recurring_per_user: int = 10,
+    seed: int = 42,
+    chunk_size: int = 10000,
+    progress: Callable[[str, int, int, float], None] = print_progress
+) -> dict:
+    """Générer un jeu de données volumineux et déterministe (ajouté aux données existantes)"""
+    rng = random.Random(seed)
+    password_hash = get_password_hash(SEED_PASSWORD)
+
+    with engine.begin() as conn:
+        writer = BulkWriter(conn, chunk_size, progress)
+        first_user = _next_id(conn, models.User)
+        first_tag = _next_id(conn, models.Tag)
+        first_todo = _next_id(conn, models.Todo)
+        first_recurring = _next_id(conn, models.RecurringTodo)
+        user_ids = range(first_user, first_user + users)
+        tag_ids = list(range(first_tag, first_tag + tags))
+
+        # Nouvelle version du catalogue, dans la transaction : révision des tags créés
+        # (flux de synchronisation), relue par les catalogues en mémoire
+        with Session(bind=conn) as db:
+            tags_revision = bump_version(db)
+        writer.write(models.Tag.__table__, ["id", "name", "color", "revision"], (
+            (tag_id, f"tag-{tag_id}", f"#{rng.randrange(0x1000000):06x}", tags_revision) for tag_id in tag_ids
+        ), tags)
+        writer.write(models.User.__table__, ["id", "email", "hashed_password", "is_active", "created_at"], (
+            (user_id, f"user{user_id}@example.com", password_hash, True, SEED_BASE_TIME)
+            for user_id in user_ids
+        ), users)
+
+        # Associations produites avec leurs lignes
+        todo_links: List[tuple] = []
+        recurring_links: List[tuple] = []
+
+        def todo_rows():
+            todo_id = first_todo
+            for user_id in user_ids:
+                for index in range(todos_per_user):
+                    title = " ".join(rng.sample(SEED_WORDS, 3))
+                    yield (
+                        todo_id,
+                        title.capitalize(),
+                        f"{title} ({index})",
+                        rng.random() < 0.4,
+                        rng.randint(1, 3),
+                        SEED_BASE_TIME + timedelta(days=rng.randint(-30, 90)),
+                        SEED_BASE_TIME + timedelta(seconds=index),
+                        user_id,
+                    )
+                    if tag_ids:
+                        todo_links.extend(
+                            (todo_id, tag_id) for tag_id in rng.sample(tag_ids, rng.randint(0, min(3, tags)))
+                        )
+                    todo_id += 1
+
+        def recurring_rows():
+            recurring_id = first_recurring
+            for user_id in user_ids:
+                for index in range(recurring_per_user):
+                    starts_at = SEED_BASE_TIME + timedelta(days=rng.randint(0, 30))
+                    yield (
+                        recurring_id,
+                        f"Série {index}",
+                        None,
+                        rng.choice(["daily", "weekly", "monthly"]),
+                        rng.randint(1, 3),
+                        starts_at,
+                        starts_at,
+                        True,
+                        SEED_BASE_TIME,
+                        user_id,
+                    )
+                    if tag_ids:
+                        recurring_links.extend(
+                            (recurring_id, tag_id) for tag_id in rng.sample(tag_ids, rng.randint(0, min(2, tags)))
+                        )
+                    recurring_id += 1
+
+        total_todos = users * todos_per_user
+        # Associations d'un lot écrites juste après lui : mémoire bornée par le lot
+        written = 0
+        start = time.perf_counter()
+        for chunk in _chunks(todo_rows(), chunk_size):
+            writer.insert(models.Todo.__table__, TODO_COLUMNS, chunk)
+            writer.insert(models.todo_tags, ["todo_id", "tag_id"], todo_links)
+            todo_links.clear()
+            written += len(chunk)
+            progress("todos", written, total_todos, time.perf_counter() - start)
+
+        writer.write(models.RecurringTodo.__table__, RECURRING_COLUMNS, recurring_rows(), users * recurring_per_user)
+        writer.write(models.recurring_todo_tags, ["recurring_todo_id", "tag_id"], recurring_links, len(recurring_links))
+
+        if conn.dialect.name == "postgresql":
+            # Identifiants fournis explicitement : séquences recalées
+            for table in ("users", "tags", "todos", "recurring_todos"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
+        rebuild_counters(conn)
+
+    return {
+        "users": (first_user, users),
+        "tags": (first_tag, tags),
+        "todos": (first_todo, total_todos),
+        "recurring_todos": (first_recurring, users * recurring_per_user),
+        "password": SEED_PASSWORD,
+    }
+
 if __name__ == "__main__":
-    from app.db.session import SessionLocal
-    db = SessionLocal()
-    seed_database(db)
-    db.close() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Remplir la base de données")
+    parser.add_argument("--size", choices=sorted(SEED_SIZES), help="jeu volumineux (sinon : jeu de démonstration)")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--todos-per-user", type=int)
+    parser.add_argument("--tags", type=int)
+    parser.add_argument("--recurring-per-user", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal, engine
+
+    if args.size or args.users:
+        sizes = dict(SEED_SIZES.get(args.size, SEED_SIZES["small"]))
+        for key in sizes:
+            if getattr(args, key) is not None:
+                sizes[key] = getattr(args, key)
+        start = time.perf_counter()
+        summary = seed_bulk(engine, seed=args.seed, chunk_size=args.chunk_size, **sizes)
+        print(f"Terminé en {time.perf_counter() - start:.1f} s :", summary)
+    else:
+        db = SessionLocal()
+        seed_database(db)
+        db.close() 
\ No newline at end of file
@@ -1,9 +1,137 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from typing import Optional
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.db.replicas import ReplicaSet
 
-# Création du moteur SQLAlchemy
-engine = create_engine(settings.DATABASE_URL)
+# Pilotes asynchrones correspondant aux URLs synchrones
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(database_url: Optional[str] = None) -> str:
+    if database_url is None:
+        if settings.ASYNC_DATABASE_URL:
+            return settings.ASYNC_DATABASE_URL
+        database_url = settings.DATABASE_URL
+    scheme, _, rest = database_url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Pas de pilote asynchrone connu pour {scheme}")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+def get_engine_options(database_url: str, asynchronous: bool = False) -> dict:
+    """Options de création du moteur, pilotées par Settings"""
+    url = make_url(database_url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        if not asynchronous:
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # Base en mémoire : pool propre à SQLite, pas de dimensionnement
+            return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+def create_db_engine(database_url: Optional[str] = None):
+    """Unique point de création des moteurs synchrones"""
+    database_url = database_url or settings.DATABASE_URL
+    return create_engine(database_url, **get_engine_options(database_url))
+
+def create_async_db_engine(database_url: Optional[str] = None):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    database_url = database_url or get_async_database_url()
+    return create_async_engine(database_url, **get_engine_options(database_url, asynchronous=True))
+
+# Création du moteur SQLAlchemy (un seul pool par processus)
+engine = create_db_engine()
+instrument_engine(engine)
 
 # Création de la classe SessionLocal
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+# Pas d'expiration au commit : les services renvoient les objets (et leurs tags
+# déjà chargés) sans refresh ni rechargement paresseux à la sérialisation
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Moteur asynchrone, créé uniquement si le chemin async est activé
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_async_db_engine()
+    instrument_engine(async_engine.sync_engine)
+    # Pas d'expiration au commit : aucun chargement paresseux possible hors greenlet
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+# Réplicas en lecture, pour le chemin actif seulement (moteurs créés sans connexion)
+read_replicas = ReplicaSet([], settings.READ_REPLICA_STRATEGY)
+async_read_replicas = ReplicaSet([], settings.READ_REPLICA_STRATEGY)
+if not settings.ASYNC_DB:
+    read_replicas = ReplicaSet(
+        [create_db_engine(url) for url in settings.READ_REPLICA_URLS],
+        settings.READ_REPLICA_STRATEGY,
+        settings.READ_REPLICA_RETRY_SECONDS
+    )
+    for replica_engine in read_replicas.engines:
+        instrument_engine(replica_engine)
+else:
+    async_read_replicas = ReplicaSet(
+        [create_async_db_engine(get_async_database_url(url)) for url in settings.READ_REPLICA_URLS],
+        settings.READ_REPLICA_STRATEGY,
+        settings.READ_REPLICA_RETRY_SECONDS
+    )
+    for replica_engine in async_read_replicas.engines:
+        instrument_engine(replica_engine.sync_engine)
+
+def _all_engines() -> dict:
+    engines = {"primary": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    for index, replica_engine in enumerate(read_replicas.engines):
+        engines[f"replica-{index}"] = replica_engine
+    for index, replica_engine in enumerate(async_read_replicas.engines):
+        engines[f"async-replica-{index}"] = replica_engine.sync_engine
+    return engines
+
+async def dispose_engines() -> None:
+    """Fermeture des pools (fin du lifespan)"""
+    for replica_engine in async_read_replicas.engines:
+        await replica_engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica_engine in read_replicas.engines:
+        replica_engine.dispose()
+    engine.dispose()
+
+def get_pool_status() -> dict:
+    """État des pools de connexions du processus (/health/db)"""
+    engines = _all_engines()
+    status = {}
+    for name, db_engine in engines.items():
+        pool = db_engine.pool
+        if hasattr(pool, "status_dict"):
+            status[name] = pool.status_dict()
+        else:
+            status[name] = {"pool": type(pool).__name__, "status": pool.status()}
+    return status
+
+def get_pool_utilization() -> float:
+    """Utilisation du pool le plus chargé du processus (contrôle d'admission)"""
+    pools = [db_engine.pool for db_engine in _all_engines().values()]
+    return max((pool.utilization() for pool in pools if hasattr(pool, "utilization")), default=0.0)
\ No newline at end of file
@@ -1,24 +1,71 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.admission import AdmissionController, AdmissionMiddleware
 from app.core.config import settings
-from app.api.endpoints import auth, todos, tags, recurring
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models.models import Base
+from app.core.cache import principal_cache
+from app.core.hashing import password_hasher
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.etag import ETAG_HEADER
+from app.core.events import event_broker
+from app.core.metrics import SERVER_TIMING_HEADER, MetricsMiddleware, request_metrics
+from app.db import session
+from app.db.migrate import setup_schema
+from app.db.replicas import PrimaryPinMiddleware
+from app.services.scheduler import RecurringScheduler, scheduler_metrics
+from app.services.tag_catalog import tag_catalog
 
-# Configuration de la base de données
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Aucun accès à la base à l'import : create_engine n'ouvre pas de connexion,
+# le schéma est vérifié au démarrage (migrations : python -m app.db.migrate)
+recurring_scheduler = RecurringScheduler(session.engine, settings.RECURRING_SCHEDULER_INTERVAL_SECONDS)
 
-# Créer les tables au démarrage
-def init_db():
-    Base.metadata.create_all(bind=engine)
-
-init_db()  # Initialiser la base de données
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Vérification du schéma (première connexion du pool) avant d'accepter des requêtes
+    setup_schema(session.engine, settings.DB_SCHEMA_SETUP)
+    # Désactivé par défaut : avec plusieurs workers, préférer un seul
+    # processus dédié (python -m app.services.scheduler --loop)
+    if settings.RECURRING_SCHEDULER_ENABLED:
+        recurring_scheduler.start()
+    await event_broker.start()
+    try:
+        yield
+    finally:
+        await event_broker.stop()
+        recurring_scheduler.stop(timeout=settings.RECURRING_SCHEDULER_INTERVAL_SECONDS)
+        password_hasher.shutdown()
+        await session.dispose_engines()
 
 app = FastAPI(
     title=settings.APP_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
+)
+
+# Contrôle d'admission : à l'intérieur de CORS, les 503 portent les en-têtes CORS
+admission_controller = AdmissionController(
+    limits=settings.ADMISSION_LIMITS,
+    queue_size=settings.ADMISSION_QUEUE_SIZE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    prefix=settings.API_V1_STR,
+    utilization=session.get_pool_utilization,
+    shed_expensive_at=settings.ADMISSION_SHED_EXPENSIVE_AT,
+    shed_queue_at=settings.ADMISSION_SHED_QUEUE_AT,
+)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
+# Lecture de ses propres écritures sur réplicas : cookie d'épinglage après une
+# écriture (sans réplica, get_db ne désigne aucun sujet et rien n'est posé)
+app.add_middleware(
+    PrimaryPinMiddleware,
+    sticky_seconds=settings.READ_REPLICA_STICKY_SECONDS,
+    path=settings.API_V1_STR,
 )
 
 # Configuration CORS
@@ -28,30 +75,93 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, SERVER_TIMING_HEADER],
 )
 
+# Mesures par requête : ajouté en dernier, il englobe les autres middlewares
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        slow_threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+        max_statements=settings.SLOW_REQUEST_MAX_STATEMENTS,
+    )
+
+def include_routers(app: FastAPI) -> None:
+    # Import différé : seuls les routers du chemin de données actif sont chargés
+    if settings.ASYNC_DB:
+        # Chemin de données asynchrone (AsyncSession)
+        from app.api.async_endpoints import auth, todos, tags, recurring, sync, events
+    else:
+        from app.api.endpoints import auth, todos, tags, recurring, sync, events
+
+    app.include_router(
+        auth.router,
+        prefix=settings.API_V1_STR,
+        tags=["auth"]
+    )
+    app.include_router(
+        todos.router,
+        prefix=f"{settings.API_V1_STR}/todos",
+        tags=["todos"]
+    )
+    app.include_router(
+        tags.router,
+        prefix=f"{settings.API_V1_STR}/tags",
+        tags=["tags"]
+    )
+    app.include_router(
+        recurring.router,
+        prefix=f"{settings.API_V1_STR}/recurring",
+        tags=["recurring"]
+    )
+    app.include_router(
+        sync.router,
+        prefix=f"{settings.API_V1_STR}/sync",
+        tags=["sync"]
+    )
+    app.include_router(
+        events.router,
+        prefix=f"{settings.API_V1_STR}/events",
+        tags=["events"]
+    )
+
 # Inclure les routers
-app.include_router(
-    auth.router,
-    prefix=settings.API_V1_STR,
-    tags=["auth"]
-)
-app.include_router(
-    todos.router,
-    prefix=f"{settings.API_V1_STR}/todos",
-    tags=["todos"]
-)
-app.include_router(
-    tags.router,
-    prefix=f"{settings.API_V1_STR}/tags",
-    tags=["tags"]
-)
-app.include_router(
-    recurring.router,
-    prefix=f"{settings.API_V1_STR}/recurring",
-    tags=["recurring"]
-)
+include_routers(app)
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/db")
+def db_pool_status():
+    pools = session.get_pool_status()
+    # À multiplier par le nombre de workers pour dimensionner max_connections
+    return {
+        "pools": pools,
+        "max_connections_per_worker": sum(
+            pool["pool_size"] + pool["max_overflow"]
+            for pool in pools.values() if "pool_size" in pool
+        ),
+        "read_replicas": (session.async_read_replicas if settings.ASYNC_DB else session.read_replicas).stats(),
+    }
+
+@app.get("/health/cache")
+def cache_stats():
+    return {"principal_cache": principal_cache.stats(), "tag_catalog": tag_catalog.stats()}
+
+@app.get("/health/admission")
+def admission_status():
+    return {"enabled": settings.ADMISSION_CONTROL_ENABLED, **admission_controller.stats()}
+
+@app.get("/health/events")
+def events_status():
+    return event_broker.stats()
+
+@app.get("/health/scheduler")
+def scheduler_status():
+    return {"recurring_scheduler": scheduler_metrics.as_dict()}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Histogrammes des requêtes du processus, au format texte Prometheus"""
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
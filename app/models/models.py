@@ -1,21 +1,25 @@
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, DateTime, Table
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, DateTime, Table, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
 
 # Tables d'association
+# Clé primaire composite (pas de doublons, recherche par tâche) et index sur
+# tag_id pour les filtres Todo.tags.any(Tag.id == ...)
 todo_tags = Table(
     'todo_tags',
     Base.metadata,
-    Column('todo_id', Integer, ForeignKey('todos.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('todo_id', Integer, ForeignKey('todos.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    Index('ix_todo_tags_tag_id', 'tag_id')
 )
 
 recurring_todo_tags = Table(
     'recurring_todo_tags',
     Base.metadata,
-    Column('recurring_todo_id', Integer, ForeignKey('recurring_todos.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('recurring_todo_id', Integer, ForeignKey('recurring_todos.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    Index('ix_recurring_todo_tags_tag_id', 'tag_id')
 )
 
 class User(Base):
@@ -40,30 +44,95 @@ class Todo(Base):
     priority = Column(Integer, default=1)
     owner_id = Column(Integer, ForeignKey("users.id"))
     recurring_todo_id = Column(Integer, ForeignKey("recurring_todos.id"), nullable=True)
+    # Révision de synchronisation du propriétaire à la dernière écriture
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
     
     owner = relationship("User", back_populates="todos")
     recurring_parent = relationship("RecurringTodo", back_populates="todo_instances")
     tags = relationship("Tag", secondary=todo_tags, back_populates="todos")
 
+    __table_args__ = (
+        # Pagination par curseur : WHERE owner_id = ? ORDER BY created_at, id
+        Index("ix_todos_owner_created_id", "owner_id", "created_at", "id"),
+        # Filtres completed / échéance et priorité de search_todos et filter_todos
+        Index("ix_todos_owner_completed_due", "owner_id", "completed", "due_date"),
+        Index("ix_todos_owner_priority", "owner_id", "priority"),
+        # Instances d'une tâche récurrente
+        Index("ix_todos_recurring_created", "recurring_todo_id", "created_at"),
+        # Flux de synchronisation : WHERE owner_id = ? AND revision > ?
+        Index("ix_todos_owner_revision", "owner_id", "revision"),
+    )
+
 class RecurringTodo(Base):
     __tablename__ = "recurring_todos"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(String, nullable=True)
     frequency = Column(String)  # 'daily', 'weekly', 'monthly'
+    interval = Column(Integer, default=1)  # toutes les N périodes
+    weekdays = Column(JSON, nullable=True)  # [0 = lundi, ...] pour 'weekly'
+    starts_at = Column(DateTime, default=datetime.utcnow)  # ancre des occurrences
+    ends_at = Column(DateTime, nullable=True)
     active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     owner_id = Column(Integer, ForeignKey("users.id"))
+    # Prochaine occurrence non encore générée (NULL une fois la série terminée)
+    last_generated_at = Column(DateTime, nullable=True)
+    next_due_at = Column(DateTime, default=datetime.utcnow)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
     
     owner = relationship("User", back_populates="recurring_todos")
     todo_instances = relationship("Todo", back_populates="recurring_parent")
     tags = relationship("Tag", secondary=recurring_todo_tags, back_populates="recurring_todos")
 
+    __table_args__ = (
+        Index("ix_recurring_todos_owner_active_created_id", "owner_id", "active", "created_at", "id"),
+        Index("ix_recurring_todos_active_next_due", "active", "next_due_at", "id"),
+        # Occurrences d'une fenêtre : WHERE owner_id = ? AND active AND next_due_at <= ?
+        Index("ix_recurring_todos_owner_active_next_due", "owner_id", "active", "next_due_at"),
+        Index("ix_recurring_todos_owner_revision", "owner_id", "revision"),
+    )
+
 class Tag(Base):
     __tablename__ = "tags"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     color = Column(String)
+    # Version du catalogue des tags à la dernière écriture (tags partagés)
+    revision = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     
     todos = relationship("Todo", secondary=todo_tags, back_populates="tags")
-    recurring_todos = relationship("RecurringTodo", secondary=recurring_todo_tags, back_populates="tags")
\ No newline at end of file
+    recurring_todos = relationship("RecurringTodo", secondary=recurring_todo_tags, back_populates="tags")
+
+class CatalogVersion(Base):
+    """Version d'un catalogue mis en cache (incrémentée à chaque écriture)"""
+    __tablename__ = "catalog_versions"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class CollectionVersion(Base):
+    """Version des listes d'un utilisateur (incrémentée à chaque écriture, ETag)"""
+    __tablename__ = "collection_versions"
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    collection = Column(String, primary_key=True)  # 'todos', 'recurring'
+    version = Column(Integer, nullable=False, default=0)
+
+class TodoCounter(Base):
+    """Compteur de tâches d'un utilisateur, tenu à jour par les écritures (statistiques)"""
+    __tablename__ = "todo_counters"
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    name = Column(String, primary_key=True)  # 'total', 'completed', 'priority:<n>', 'tag:<id>'
+    value = Column(Integer, nullable=False, default=0)
+
+class SyncTombstone(Base):
+    """Suppression définitive, conservée pour le flux de synchronisation"""
+    __tablename__ = "sync_tombstones"
+    entity = Column(String, primary_key=True)  # 'todos', 'tags'
+    entity_id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # NULL : tag
+    revision = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_owner_revision", "owner_id", "revision"),
+    )
\ No newline at end of file
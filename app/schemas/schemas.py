@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, conint, field_validator
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -45,6 +45,15 @@ class TodoUpdate(BaseModel):
     priority: Optional[TodoPriority] = None
     tag_ids: Optional[List[int]] = None
 
+    # Champ absent : inchangé ; null : effacé (description, due_date), refusé
+    # pour les champs obligatoires ; tag_ids null : tags inchangés
+    @field_validator("title", "completed", "priority")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("ce champ ne peut pas être null")
+        return value
+
 class Todo(TodoBase):
     id: int
     created_at: datetime
@@ -55,10 +64,48 @@ class Todo(TodoBase):
     class Config:
         from_attributes = True
 
+class TodoStats(BaseModel):
+    total: int
+    completed: int
+    pending: int
+    overdue: int  # non terminées, échéance dépassée
+    by_priority: Dict[int, int]
+    by_tag: Dict[int, int]  # tag_id -> nombre de tâches
+
+class BulkOperationType(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+class TodoBulkOperation(BaseModel):
+    op: BulkOperationType
+    id: Optional[int] = None  # update / delete
+    todo: Optional[TodoCreate] = None  # create
+    changes: Optional[TodoUpdate] = None  # update
+
+class TodoBulkRequest(BaseModel):
+    operations: List[TodoBulkOperation] = Field(..., max_length=1000)
+
+class TodoBulkResult(BaseModel):
+    index: int
+    op: BulkOperationType
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class TodoBulkResponse(BaseModel):
+    results: List[TodoBulkResult]
+
+Weekday = conint(ge=0, le=6)  # 0 = lundi
+
 class RecurringTodoBase(BaseModel):
     title: str
     description: Optional[str] = None
-    frequency: str
+    frequency: RecurringFrequency
+    interval: int = Field(1, ge=1)
+    weekdays: Optional[List[Weekday]] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
     active: bool = True
     tag_ids: Optional[List[int]] = None
 
@@ -69,6 +116,10 @@ class RecurringTodoUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     frequency: Optional[RecurringFrequency] = None
+    interval: Optional[int] = Field(None, ge=1)
+    weekdays: Optional[List[Weekday]] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
     active: Optional[bool] = None
     tag_ids: Optional[List[int]] = None
 
@@ -76,11 +127,30 @@ class RecurringTodo(RecurringTodoBase):
     id: int
     created_at: datetime
     owner_id: int
+    next_due_at: Optional[datetime] = None
     tags: List[Tag]
 
     class Config:
         from_attributes = True
 
+class RecurringOccurrence(BaseModel):
+    recurring_todo_id: int
+    title: str
+    due_date: datetime
+
+class SyncDeleted(BaseModel):
+    todos: List[int] = []
+    recurring: List[int] = []
+    tags: List[int] = []
+
+class SyncChanges(BaseModel):
+    """Changements depuis un jeton (suppressions à appliquer avant les écritures)"""
+    token: str
+    todos: List[Todo] = []
+    recurring: List[RecurringTodo] = []
+    tags: List[Tag] = []
+    deleted: SyncDeleted = SyncDeleted()
+
 class TodoFilter(BaseModel):
     completed: Optional[bool] = None
     tag_id: Optional[int] = None
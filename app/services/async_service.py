@@ -0,0 +1,81 @@
+from functools import wraps
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import schemas
+from app.core.hashing import password_hasher
+from app.services.service import (
+    RecurringTodoService, SyncService, TagService, TodoService, UserService
+)
+from fastapi import HTTPException, status
+
+# Services de app.services.service sur une AsyncSession (ASYNC_DB=true).
+# Une seule implémentation : chaque méthode est exécutée par run_sync sur la
+# Session synchrone de l'AsyncSession, dans un greenlet de la boucle
+# d'événements (pas de thread) ; chaque requête SQL rend la main à la boucle
+# pendant son attente. Les relations renvoyées sont déjà chargées par les
+# services (selectinload) : aucun chargement paresseux hors greenlet.
+
+def _run_sync(method):
+    """Méthode de service synchrone exécutée sur une AsyncSession"""
+    @wraps(method)
+    async def run(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(method, *args, **kwargs)
+    return staticmethod(run)
+
+class AsyncUserService:
+    get_user_by_email = _run_sync(UserService.get_user_by_email)
+    get_user = _run_sync(UserService.get_user)
+    set_active = _run_sync(UserService.set_active)
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: schemas.UserCreate):
+        if await AsyncUserService.get_user_by_email(db, user.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email déjà enregistré"
+            )
+        hashed_password = await password_hasher.hash(user.password)
+        return await db.run_sync(UserService.add_user, user.email, hashed_password)
+
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, email: str, password: str):
+        user = await AsyncUserService.get_user_by_email(db, email)
+        if not user:
+            return False
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return False
+        return await db.run_sync(UserService.accept_login, user, new_hash)
+
+class AsyncTagService:
+    create_tag = _run_sync(TagService.create_tag)
+    get_catalog = _run_sync(TagService.get_catalog)
+    get_tags = _run_sync(TagService.get_tags)
+    get_tag = _run_sync(TagService.get_tag)
+    update_tag = _run_sync(TagService.update_tag)
+    delete_tag = _run_sync(TagService.delete_tag)
+
+class AsyncTodoService:
+    get_todos = _run_sync(TodoService.get_todos)
+    get_todo_items = _run_sync(TodoService.get_todo_items)
+    get_stats = _run_sync(TodoService.get_stats)
+    get_collection_etag = _run_sync(TodoService.get_collection_etag)
+    get_todo = _run_sync(TodoService.get_todo)
+    create_todo = _run_sync(TodoService.create_todo)
+    update_todo = _run_sync(TodoService.update_todo)
+    delete_todo = _run_sync(TodoService.delete_todo)
+    bulk_todos = _run_sync(TodoService.bulk_todos)
+    search_todos = _run_sync(TodoService.search_todos)
+    filter_todos = _run_sync(TodoService.filter_todos)
+
+class AsyncRecurringTodoService:
+    create_recurring_todo = _run_sync(RecurringTodoService.create_recurring_todo)
+    get_recurring_items = _run_sync(RecurringTodoService.get_recurring_items)
+    get_collection_etag = _run_sync(RecurringTodoService.get_collection_etag)
+    get_recurring_todos = _run_sync(RecurringTodoService.get_recurring_todos)
+    get_occurrences = _run_sync(RecurringTodoService.get_occurrences)
+    update_recurring_todo = _run_sync(RecurringTodoService.update_recurring_todo)
+    generate_todo = _run_sync(RecurringTodoService.generate_todo)
+    delete_recurring_todo = _run_sync(RecurringTodoService.delete_recurring_todo)
+
+class AsyncSyncService:
+    get_changes = _run_sync(SyncService.get_changes)
\ No newline at end of file
@@ -0,0 +1,8 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+# INSERT propres aux dialectes gérés (ON CONFLICT ... RETURNING) : versions,
+# catalogue des tags, compteurs, suppressions, associations
+INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
\ No newline at end of file
@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+import zlib
+from enum import Enum
+from typing import AsyncIterator, Iterator
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from app.core.config import settings
+from app.models import models
+from app.services.service import TodoService
+
+# Export des tâches d'un utilisateur en flux : les lignes sont lues par lots
+# via un curseur côté serveur (stream_results/yield_per) et écrites au fil de
+# l'eau, sans construire d'objets ORM ni de modèles Pydantic. La mémoire
+# utilisée ne dépend pas du nombre de tâches exportées.
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+COLUMNS = [
+    "id", "title", "description", "completed", "priority",
+    "due_date", "created_at", "recurring_todo_id", "tags",
+]
+
+# Séparateur des noms de tags dans la colonne CSV
+CSV_TAG_SEPARATOR = ";"
+
+def export_query(user_id: int, dialect: str, **filters):
+    """Une ligne par couple (tâche, tag), triée par tâche ; None si aucun résultat possible"""
+    query = select(
+        models.Todo.id,
+        models.Todo.title,
+        models.Todo.description,
+        models.Todo.completed,
+        models.Todo.priority,
+        models.Todo.due_date,
+        models.Todo.created_at,
+        models.Todo.recurring_todo_id,
+        models.Tag.name.label("tag"),
+    )\
+        .outerjoin(models.todo_tags, models.todo_tags.c.todo_id == models.Todo.id)\
+        .outerjoin(models.Tag, models.Tag.id == models.todo_tags.c.tag_id)\
+        .where(models.Todo.owner_id == user_id)
+
+    query = TodoService.apply_filters(query, dialect, **filters)
+    if query is None:
+        return None
+    # Les lignes d'une même tâche restent contiguës (la recherche trie déjà par pertinence puis id)
+    return query.order_by(models.Todo.id, models.Tag.name)
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+class ExportWriter:
+    """Regroupe les tags par tâche et sérialise les lignes, compressées ou non"""
+
+    def __init__(self, export_format: ExportFormat, compress: bool = False):
+        self.format = export_format
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        self._current = None
+        self._tags = []
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> bytes:
+        if self.format == ExportFormat.CSV:
+            self._csv.writerow(COLUMNS)
+        return self._drain()
+
+    def write(self, rows) -> bytes:
+        for row in rows:
+            if self._current is not None and row.id != self._current.id:
+                self._write_todo()
+            if self._current is None:
+                self._current = row
+            if row.tag is not None:
+                self._tags.append(row.tag)
+        return self._drain()
+
+    def close(self) -> bytes:
+        if self._current is not None:
+            self._write_todo()
+        data = self._drain()
+        if self._compressor is not None:
+            data += self._compressor.flush()
+        return data
+
+    def _write_todo(self) -> None:
+        todo, tags = self._current, self._tags
+        if self.format == ExportFormat.CSV:
+            self._csv.writerow([
+                todo.id, todo.title, todo.description, todo.completed, todo.priority,
+                _isoformat(todo.due_date), _isoformat(todo.created_at),
+                todo.recurring_todo_id, CSV_TAG_SEPARATOR.join(tags),
+            ])
+        else:
+            self._buffer.write(json.dumps({
+                "id": todo.id,
+                "title": todo.title,
+                "description": todo.description,
+                "completed": todo.completed,
+                "priority": todo.priority,
+                "due_date": _isoformat(todo.due_date),
+                "created_at": _isoformat(todo.created_at),
+                "recurring_todo_id": todo.recurring_todo_id,
+                "tags": tags,
+            }, ensure_ascii=False))
+            self._buffer.write("\n")
+        self._current, self._tags = None, []
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if self._compressor is not None and data:
+            data = self._compressor.compress(data)
+        return data
+
+def stream_export(engine, query, writer: ExportWriter) -> Iterator[bytes]:
+    """Générateur synchrone : connexion dédiée, indépendante de la session de la requête"""
+    yield writer.header()
+    if query is not None:
+        with engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE
+            ).execute(query)
+            for rows in result.partitions():
+                chunk = writer.write(rows)
+                if chunk:
+                    yield chunk
+    yield writer.close()
+
+async def stream_export_async(engine, query, writer: ExportWriter) -> AsyncIterator[bytes]:
+    yield writer.header()
+    if query is not None:
+        async with engine.connect() as conn:
+            result = await conn.stream(
+                query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.partitions():
+                chunk = writer.write(rows)
+                if chunk:
+                    yield chunk
+    yield writer.close()
+
+def export_response(content, export_format: ExportFormat, compress: bool) -> StreamingResponse:
+    filename = f"todos.{export_format.value}"
+    media_type = MEDIA_TYPES[export_format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
\ No newline at end of file
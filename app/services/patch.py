@@ -0,0 +1,142 @@
+"""Mises à jour partielles des tâches (PATCH / PUT /todos/{id}).
+
+Les champs simples sont modifiés par un seul UPDATE limité au propriétaire
+(id et owner_id), dont le RETURNING renvoie la ligne à jour et ses tags
+(sous-requête corrélée sur todo_tags) : la réponse est construite depuis
+cette ligne, sans SELECT préalable ni rechargement. Aucune ligne renvoyée :
+tâche absente ou d'un autre utilisateur.
+
+Les compteurs de statistiques ont besoin des valeurs précédentes de
+completed et priority, quand elles changent :
+- PostgreSQL : lues dans le même UPDATE (FROM sur la ligne verrouillée),
+- SQLite : le RETURNING ne renvoie que les nouvelles valeurs ; les écarts de
+  ces compteurs sont appliqués juste avant l'UPDATE par un upsert
+  INSERT ... SELECT depuis la ligne, les nouvelles valeurs étant connues par
+  la requête. Pas de SELECT préalable ; la ligne ne peut pas changer entre
+  les deux (SQLite : un seul écrivain, verrou pris par bump_collections).
+Les tags sont modifiés par différence : DELETE des tags retirés et INSERT
+... ON CONFLICT DO NOTHING des tags ajoutés, dont les RETURNING donnent les
+écarts des compteurs de tags.
+"""
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import String, cast, delete, func, literal, select, union_all, update
+from app.models import models
+from app.services.rows import TODO_COLUMNS
+from app.services.stats import COMPLETED, PRIORITY_PREFIX, counter_deltas, counter_names
+from app.services.tag_catalog import TagSnapshot
+from app.services.versions import INSERTS
+
+# Champs dont les valeurs précédentes alimentent les compteurs
+STATE_FIELDS = {"completed", "priority"}
+
+# Dialectes dont l'UPDATE peut renvoyer des colonnes d'une table du FROM
+PREVIOUS_IN_RETURNING = {"postgresql"}
+
+def _tag_list(dialect: str):
+    tag_id = models.todo_tags.c.tag_id
+    aggregate = func.array_agg(tag_id) if dialect == "postgresql" else func.group_concat(tag_id)
+    return select(aggregate)\
+        .where(models.todo_tags.c.todo_id == models.Todo.id)\
+        .scalar_subquery()\
+        .label("tag_list")
+
+def _parse_tag_list(value) -> List[int]:
+    # array_agg : liste ; group_concat : "1,2,3" ; aucune association : NULL
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [int(tag_id) for tag_id in value.split(",")]
+    return list(value)
+
+def counts_state_first(dialect: str, changes: dict) -> bool:
+    """Écarts de completed / priority appliqués avant l'UPDATE (state_counters_query)"""
+    return bool(STATE_FIELDS & changes.keys()) and dialect not in PREVIOUS_IN_RETURNING
+
+def state_counters_query(todo_id: int, user_id: int, changes: dict):
+    """SELECT (owner_id, compteur, écart) de completed et priority, depuis la
+    ligne avant l'UPDATE et les nouvelles valeurs de changes (dialectes sans
+    PREVIOUS_IN_RETURNING) ; aucune ligne si la tâche est absente"""
+    todo = models.Todo
+    where = (todo.id == todo_id, todo.owner_id == user_id)
+    rows = []
+    if "completed" in changes:
+        completed = bool(changes["completed"])
+        rows.append(
+            select(todo.owner_id, literal(COMPLETED), literal(1 if completed else -1))
+            .where(*where, func.coalesce(todo.completed, False) != completed)
+        )
+    if "priority" in changes:
+        priority = changes["priority"]
+        changed = todo.priority.is_distinct_from(priority)
+        rows.append(
+            select(todo.owner_id, literal(PRIORITY_PREFIX).concat(cast(todo.priority, String)), literal(-1))
+            .where(*where, changed, todo.priority.isnot(None))
+        )
+        if priority is not None:
+            rows.append(
+                select(todo.owner_id, literal(f"{PRIORITY_PREFIX}{int(priority)}"), literal(1))
+                .where(*where, changed)
+            )
+    return union_all(*rows) if len(rows) > 1 else rows[0]
+
+def patch_statement(dialect: str, todo_id: int, user_id: int, changes: dict):
+    """UPDATE ... RETURNING limité au propriétaire (changes porte toujours la révision)"""
+    todo = models.Todo
+    columns = (*TODO_COLUMNS, _tag_list(dialect))
+    statement = update(todo).values(**changes)
+    if STATE_FIELDS & changes.keys() and dialect in PREVIOUS_IN_RETURNING:
+        previous = select(todo.id, todo.completed, todo.priority)\
+            .where(todo.id == todo_id)\
+            .where(todo.owner_id == user_id)\
+            .with_for_update()\
+            .subquery("previous")
+        return statement.where(todo.id == previous.c.id).returning(
+            *columns,
+            previous.c.completed.label("previous_completed"),
+            previous.c.priority.label("previous_priority")
+        )
+    return statement\
+        .where(todo.id == todo_id)\
+        .where(todo.owner_id == user_id)\
+        .returning(*columns)
+
+def remove_tags_statement(todo_id: int, tag_ids: List[int]):
+    return delete(models.todo_tags)\
+        .where(models.todo_tags.c.todo_id == todo_id)\
+        .where(models.todo_tags.c.tag_id.not_in(tag_ids))\
+        .returning(models.todo_tags.c.tag_id)
+
+def add_tags_statement(dialect: str, todo_id: int, tag_ids: List[int]):
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Mise à jour partielle non gérée pour {dialect}")
+    return INSERTS[dialect](models.todo_tags)\
+        .values([{"todo_id": todo_id, "tag_id": tag_id} for tag_id in tag_ids])\
+        .on_conflict_do_nothing()\
+        .returning(models.todo_tags.c.tag_id)
+
+def previous_state(row) -> tuple:
+    """(completed, priority) avant la mise à jour : colonnes previous_* du
+    RETURNING, sinon ceux de la ligne (champs inchangés, ou écarts déjà
+    appliqués par state_counters_query)"""
+    if "previous_completed" in row._fields:
+        return row.previous_completed, row.previous_priority
+    return row.completed, row.priority
+
+def patch_deltas(row, previous: tuple, removed: Iterable[int] = (), added: Iterable[int] = ()) -> Dict[str, int]:
+    """Écarts des compteurs entre l'état précédent et la ligne renvoyée"""
+    completed, priority = previous
+    return counter_deltas(
+        counter_names(completed, priority, removed),
+        counter_names(row.completed, row.priority, added)
+    )
+
+def row_tag_ids(row, tag_ids: Optional[List[int]]) -> List[int]:
+    """Tags finaux : ceux demandés (déjà filtrés) ou ceux renvoyés par la sous-requête"""
+    return sorted(tag_ids if tag_ids is not None else _parse_tag_list(row.tag_list))
+
+def build_item(row, tag_ids: List[int], snapshot: Optional[TagSnapshot]) -> dict:
+    """Même forme que schemas.Todo (cf. app.services.rows.build_items)"""
+    item = {column.key: getattr(row, column.key) for column in TODO_COLUMNS}
+    item["tag_ids"] = None
+    item["tags"] = [snapshot.tags[tag_id] for tag_id in tag_ids if tag_id in snapshot.tags] if tag_ids else []
+    return item
\ No newline at end of file
@@ -0,0 +1,126 @@
+import calendar
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+# Moteur de récurrence : les occurrences d'une série sont calculées à partir
+# de son ancre (starts_at) et de leur rang, jamais en ajoutant une période à
+# la précédente. Pas de dérive : « le 31 de chaque mois » donne le 30 avril
+# puis de nouveau le 31 mai. Les occurrences sont produites par des
+# générateurs et ne sont jamais matérialisées en lignes.
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Ajouter des mois calendaires, en ramenant le jour à la fin du mois si besoin"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+def _months_between(start: datetime, end: datetime) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month
+
+class Recurrence:
+    """Règle d'une série : fréquence, intervalle, jours de la semaine, bornes"""
+
+    def __init__(
+        self,
+        frequency: str,
+        starts_at: datetime,
+        interval: int = 1,
+        weekdays: Optional[Sequence[int]] = None,
+        ends_at: Optional[datetime] = None
+    ):
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Fréquence inconnue : {frequency!r}")
+        self.frequency = frequency
+        self.starts_at = starts_at
+        self.interval = max(interval or 1, 1)
+        # Jours de la semaine (0 = lundi) : uniquement pour la fréquence hebdomadaire
+        self.weekdays = sorted(set(weekdays)) if weekdays and frequency == "weekly" else None
+        self.ends_at = ends_at
+
+    @classmethod
+    def from_model(cls, recurring) -> "Recurrence":
+        """Depuis un RecurringTodo ou une ligne portant les mêmes colonnes"""
+        return cls(
+            frequency=recurring.frequency,
+            starts_at=recurring.starts_at or recurring.created_at,
+            interval=recurring.interval,
+            weekdays=recurring.weekdays,
+            ends_at=recurring.ends_at
+        )
+
+    def occurrences(self, start: Optional[datetime] = None) -> Iterator[datetime]:
+        """Occurrences >= start, dans l'ordre, jusqu'à ends_at (inclus)"""
+        start = max(start or self.starts_at, self.starts_at)
+        for occurrence in self._candidates(start):
+            if occurrence < start:
+                continue
+            if self.ends_at is not None and occurrence > self.ends_at:
+                return
+            yield occurrence
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        for occurrence in self.occurrences(start):
+            if occurrence > end:
+                return
+            yield occurrence
+
+    def next_after(self, value: datetime) -> Optional[datetime]:
+        """Première occurrence strictement postérieure à value (None si la série est terminée)"""
+        return next(self.occurrences(value + timedelta(microseconds=1)), None)
+
+    def first(self) -> Optional[datetime]:
+        return next(self.occurrences(), None)
+
+    def _candidates(self, start: datetime) -> Iterator[datetime]:
+        # Rang de départ calculé directement : pas de parcours depuis l'ancre
+        anchor = self.starts_at
+        if self.frequency == "monthly":
+            rank = max(_months_between(anchor, start) // self.interval - 1, 0)
+            while True:
+                yield add_months(anchor, rank * self.interval)
+                rank += 1
+
+        if self.frequency == "weekly" and self.weekdays:
+            monday = anchor - timedelta(days=anchor.weekday())
+            week = max((start - monday).days // 7 // self.interval, 0) * self.interval
+            while True:
+                week_start = monday + timedelta(weeks=week)
+                for weekday in self.weekdays:
+                    yield week_start + timedelta(days=weekday)
+                week += self.interval
+
+        if self.frequency == "weekly":
+            step = timedelta(weeks=self.interval)
+        elif self.frequency == "daily":
+            step = timedelta(days=self.interval)
+        else:
+            raise ValueError(f"Fréquence inconnue : {self.frequency!r}")
+        rank = max((start - anchor) // step, 0)
+        while True:
+            yield anchor + rank * step
+            rank += 1
+
+def reschedule(recurring, start: Optional[datetime] = None) -> None:
+    """Recalculer next_due_at : première occurrence >= start (None si la série est terminée)"""
+    recurring.next_due_at = next(Recurrence.from_model(recurring).occurrences(start), None)
+
+def _tagged(occurrences: Iterator[datetime], index: int, item):
+    for occurrence in occurrences:
+        yield occurrence, index, item
+
+def merge_occurrences(
+    series: Iterable[Tuple[object, Iterator[datetime]]],
+    limit: Optional[int] = None
+) -> Iterator[Tuple[datetime, object]]:
+    """Fusionner paresseusement, par date, les occurrences de plusieurs séries"""
+    streams = [
+        _tagged(occurrences, index, item)
+        for index, (item, occurrences) in enumerate(series)
+    ]
+    merged = ((occurrence, item) for occurrence, _, item in heapq.merge(*streams))
+    return islice(merged, limit) if limit is not None else merged
\ No newline at end of file
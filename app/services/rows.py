@@ -0,0 +1,128 @@
+"""Listes servies directement depuis les lignes (FAST_JSON_RESPONSES).
+
+Les colonnes sont lues sans construire d'objets ORM, les tags sont résolus
+par le catalogue en mémoire à partir de la table d'association, et chaque
+élément est un dict de même forme que schemas.Todo / schemas.RecurringTodo.
+Deux requêtes par page (lignes, puis associations), comme selectinload.
+
+    python -m app.services.rows [N]    # coût de sérialisation par élément
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from app.core.pagination import apply_keyset
+from app.models import models
+from app.services.tag_catalog import TagSnapshot, tag_catalog
+
+TODO_COLUMNS = (
+    models.Todo.id,
+    models.Todo.title,
+    models.Todo.description,
+    models.Todo.completed,
+    models.Todo.due_date,
+    models.Todo.priority,
+    models.Todo.created_at,
+    models.Todo.owner_id,
+    models.Todo.recurring_todo_id,
+)
+
+RECURRING_COLUMNS = (
+    models.RecurringTodo.id,
+    models.RecurringTodo.title,
+    models.RecurringTodo.description,
+    models.RecurringTodo.frequency,
+    models.RecurringTodo.interval,
+    models.RecurringTodo.weekdays,
+    models.RecurringTodo.starts_at,
+    models.RecurringTodo.ends_at,
+    models.RecurringTodo.active,
+    models.RecurringTodo.created_at,
+    models.RecurringTodo.owner_id,
+    models.RecurringTodo.next_due_at,
+)
+
+def todos_query(user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(*TODO_COLUMNS).where(models.Todo.owner_id == user_id)
+    return apply_keyset(query, models.Todo, cursor).offset(skip).limit(limit)
+
+def recurring_query(user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = select(*RECURRING_COLUMNS)\
+        .where(models.RecurringTodo.owner_id == user_id)\
+        .where(models.RecurringTodo.active == True)
+    return apply_keyset(query, models.RecurringTodo, cursor).offset(skip).limit(limit)
+
+def _links_query(link_table, key: str, ids: List[int]):
+    key_column = link_table.c[key]
+    return select(key_column, link_table.c.tag_id)\
+        .where(key_column.in_(ids))\
+        .order_by(key_column, link_table.c.tag_id)
+
+def build_items(rows, links, snapshot: TagSnapshot) -> List[dict]:
+    """Un dict par ligne ; tag_ids vaut None comme dans la réponse construite depuis l'ORM"""
+    tags: Dict[int, List[dict]] = defaultdict(list)
+    for item_id, tag_id in links:
+        tag = snapshot.tags.get(tag_id)
+        if tag is not None:
+            tags[item_id].append(tag)
+    items = []
+    for row in rows:
+        item = row._asdict()
+        item["tag_ids"] = None
+        item["tags"] = tags.get(row.id, [])
+        items.append(item)
+    return items
+
+def fetch_items(db, query, link_table, key: str) -> List[dict]:
+    rows = db.execute(query).all()
+    if not rows:
+        return []
+    links = db.execute(_links_query(link_table, key, [row.id for row in rows])).all()
+    return build_items(rows, links, tag_catalog.get(db))
+
+if __name__ == "__main__":
+    import json
+    import sys
+    from collections import namedtuple
+    import time
+    from datetime import datetime
+    from pydantic import TypeAdapter
+    from app.core.fast_json import dumps, orjson
+    from app.schemas import schemas
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    tag_rows = {i: {"id": i, "name": f"tag{i}", "color": "#000000"} for i in range(1, 4)}
+    now = datetime.utcnow()
+    todos = []
+    for i in range(1, count + 1):
+        todo = models.Todo(
+            id=i, title=f"Tâche {i}", description="Description", completed=i % 2 == 0,
+            due_date=now, priority=1 + i % 3, created_at=now, owner_id=1
+        )
+        todo.tags = [models.Tag(**tag_rows[1 + i % 3])]
+        todos.append(todo)
+    Row = namedtuple("Row", [column.key for column in TODO_COLUMNS])
+    rows = [
+        Row(t.id, t.title, t.description, t.completed, t.due_date, t.priority,
+            t.created_at, t.owner_id, t.recurring_todo_id)
+        for t in todos
+    ]
+    links = [(t.id, t.tags[0].id) for t in todos]
+    snapshot = TagSnapshot(1, tag_rows)
+    adapter = TypeAdapter(List[schemas.Todo])
+
+    def standard():
+        # Chemin FastAPI : validation depuis l'ORM, sérialisation mode json, puis json.dumps
+        data = adapter.dump_python(adapter.validate_python(todos, from_attributes=True), mode="json")
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    def fast():
+        return dumps(build_items(rows, links, snapshot))
+
+    assert json.loads(standard()) == json.loads(fast())
+    for name, run in (("standard", standard), ("fast", fast)):
+        start = time.perf_counter()
+        for _ in range(10):
+            run()
+        per_item = (time.perf_counter() - start) / (10 * count) * 1e6
+        print(f"{name:>8} : {per_item:.2f} µs par élément")
+    print("encodeur :", "orjson" if orjson is not None else "json")
\ No newline at end of file
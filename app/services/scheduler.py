@@ -0,0 +1,273 @@
+"""Génération planifiée des instances de tâches récurrentes.
+
+Chaque passage sélectionne les RecurringTodo actives dont la prochaine
+occurrence (next_due_at) tombe avant maintenant + RECURRING_LEAD_TIME_HOURS,
+par lots (keyset sur id), et pour chaque lot exécute en une transaction :
+- un INSERT groupé (executemany ... RETURNING id) des nouvelles tâches,
+  une par occurrence comprise entre next_due_at et l'horizon, les dates
+  étant calculées par app.services.recurrence,
+- un INSERT ... SELECT de leurs tags (depuis recurring_todo_tags),
+- un UPDATE groupé (executemany) de last_generated_at / next_due_at
+  (première occurrence au-delà de l'horizon),
+- un upsert groupé par famille des compteurs de statistiques,
+- un upsert par collection des versions des propriétaires (ETag des listes),
+  exécuté en premier : les tâches créées et les récurrentes mises à jour
+  portent la révision de synchronisation qui en résulte.
+Les tags et les compteurs ne concernent que les identifiants renvoyés par
+l'INSERT. Le nombre de requêtes dépend du nombre de lots, pas du nombre de
+récurrentes. Chaque occurrence n'est générée qu'une fois : un passage
+suivant ne traite que les séries dont l'occurrence suivante est entrée
+dans l'horizon. Les occurrences manquées (planificateur arrêté) sont
+rattrapées, au plus RECURRING_MAX_CATCH_UP par série et par passage : les
+plus récentes, les plus anciennes étant abandonnées.
+
+    python -m app.services.scheduler            # un passage
+    python -m app.services.scheduler --loop     # passages toutes les N secondes
+"""
+import argparse
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, List, Optional, Tuple
+from sqlalchemy import bindparam, insert, select, update
+from app.core.config import settings
+from app.models import models
+from app.services.recurrence import Recurrence
+from app.services.stats import count_todos_for
+from app.services.sync import prune_tombstones
+from app.services.versions import RECURRING, TODOS, bump_collections_for, sync_revision_of
+
+logger = logging.getLogger(__name__)
+
+class SchedulerMetrics:
+    """Progression et cumul des passages du planificateur"""
+
+    def __init__(self):
+        self.ticks = 0
+        self.errors = 0
+        self.recurring_processed = 0
+        self.todos_created = 0
+        self.running = False
+        self.current_tick_processed = 0
+        self.last_tick_started_at: Optional[datetime] = None
+        self.last_tick_duration_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def start_tick(self, now: datetime) -> None:
+        with self._lock:
+            self.running = True
+            self.current_tick_processed = 0
+            self.last_tick_started_at = now
+
+    def record_chunk(self, processed: int, created: int) -> None:
+        with self._lock:
+            self.current_tick_processed += processed
+            self.recurring_processed += processed
+            self.todos_created += created
+
+    def end_tick(self, seconds: float, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self.running = False
+            self.ticks += 1
+            self.last_tick_duration_ms = round(seconds * 1000, 3)
+            if error is not None:
+                self.errors += 1
+                self.last_error = repr(error)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "ticks": self.ticks,
+                "errors": self.errors,
+                "running": self.running,
+                "current_tick_processed": self.current_tick_processed,
+                "recurring_processed": self.recurring_processed,
+                "todos_created": self.todos_created,
+                "last_tick_started_at": self.last_tick_started_at.isoformat() if self.last_tick_started_at else None,
+                "last_tick_duration_ms": self.last_tick_duration_ms,
+                "last_error": self.last_error,
+            }
+
+scheduler_metrics = SchedulerMetrics()
+
+def _due_occurrences(row, horizon: datetime, limit: int) -> Tuple[List[datetime], Optional[datetime]]:
+    """(occurrences à générer jusqu'à l'horizon, les limit plus récentes ; occurrence suivante)"""
+    due: Deque[datetime] = deque(maxlen=max(limit, 1))
+    for occurrence in Recurrence.from_model(row).occurrences(row.next_due_at):
+        if occurrence > horizon:
+            return list(due), occurrence
+        due.append(occurrence)
+    return list(due), None
+
+def _generate_chunk(conn, rows, now: datetime, horizon: datetime, catch_up: int) -> int:
+    recurring = models.RecurringTodo
+    ids = [row.id for row in rows]
+
+    bump_collections_for(
+        conn, select(recurring.owner_id).where(recurring.id.in_(ids)), (TODOS, RECURRING)
+    )
+
+    planned = {row.id: _due_occurrences(row, horizon, catch_up) for row in rows}
+    instances = [
+        {
+            "title": row.title,
+            "description": row.description,
+            "owner_id": row.owner_id,
+            "owner": row.owner_id,
+            "due_date": occurrence,
+            "recurring_todo_id": row.id,
+        }
+        for row in rows
+        for occurrence in planned[row.id][0]
+    ]
+    created_ids = []
+    if instances:
+        created_ids = conn.execute(
+            insert(models.Todo)
+            .values(
+                created_at=now,
+                completed=False,
+                priority=1,
+                revision=sync_revision_of(bindparam("owner"))
+            )
+            .returning(models.Todo.id),
+            instances
+        ).scalars().all()
+
+    if created_ids:
+        conn.execute(
+            insert(models.todo_tags).from_select(
+                ["todo_id", "tag_id"],
+                select(models.Todo.id, models.recurring_todo_tags.c.tag_id)
+                .join(
+                    models.recurring_todo_tags,
+                    models.recurring_todo_tags.c.recurring_todo_id == models.Todo.recurring_todo_id
+                )
+                .where(models.Todo.id.in_(created_ids))
+            )
+        )
+        count_todos_for(conn, models.Todo.id.in_(created_ids))
+
+    conn.execute(
+        update(recurring)
+        .where(recurring.id == bindparam("recurring_id"))
+        .values(
+            last_generated_at=now,
+            next_due_at=bindparam("next_due"),
+            revision=sync_revision_of(recurring.owner_id)
+        ),
+        [{"recurring_id": row.id, "next_due": planned[row.id][1]} for row in rows]
+    )
+    return len(created_ids)
+
+def generate_due_todos(
+    engine,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    metrics: SchedulerMetrics = scheduler_metrics
+) -> int:
+    """Un passage : générer les instances de toutes les récurrentes échues"""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.RECURRING_BATCH_SIZE
+    horizon = now + timedelta(hours=settings.RECURRING_LEAD_TIME_HOURS)
+    catch_up = settings.RECURRING_MAX_CATCH_UP
+    recurring = models.RecurringTodo
+    start = time.perf_counter()
+    metrics.start_tick(now)
+    total = 0
+    last_id = 0
+    try:
+        while True:
+            with engine.begin() as conn:
+                # Plusieurs workers : les lignes verrouillées par un autre passage sont sautées
+                rows = conn.execute(
+                    select(
+                        recurring.id,
+                        recurring.title,
+                        recurring.description,
+                        recurring.owner_id,
+                        recurring.frequency,
+                        recurring.interval,
+                        recurring.weekdays,
+                        recurring.starts_at,
+                        recurring.created_at,
+                        recurring.ends_at,
+                        recurring.next_due_at
+                    )
+                    .where(recurring.active == True)
+                    .where(recurring.next_due_at <= horizon)
+                    .where(recurring.id > last_id)
+                    .order_by(recurring.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                ).all()
+                if not rows:
+                    break
+                created = _generate_chunk(conn, rows, now, horizon, catch_up)
+            last_id = rows[-1].id
+            total += created
+            metrics.record_chunk(len(rows), created)
+            logger.info("Récurrentes : %d traitées, %d tâches créées", len(rows), created)
+    except Exception as e:
+        metrics.end_tick(time.perf_counter() - start, error=e)
+        raise
+    metrics.end_tick(time.perf_counter() - start)
+    return total
+
+class RecurringScheduler:
+    """Passages périodiques dans un thread d'arrière-plan"""
+
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="recurring-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                generate_due_todos(self.engine)
+            except Exception:
+                logger.exception("Échec de la génération des tâches récurrentes")
+            try:
+                # Même boucle : purge des suppressions du flux de synchronisation
+                with self.engine.begin() as conn:
+                    prune_tombstones(conn)
+            except Exception:
+                logger.exception("Échec de la purge des suppressions")
+            self._stop.wait(self.interval)
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Générer les tâches récurrentes échues")
+    parser.add_argument("--loop", action="store_true", help="passages répétés")
+    parser.add_argument("--interval", type=float, default=settings.RECURRING_SCHEDULER_INTERVAL_SECONDS)
+    parser.add_argument("--batch-size", type=int, default=settings.RECURRING_BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    while True:
+        created = generate_due_todos(engine, batch_size=args.batch_size)
+        print(f"{created} tâches créées", scheduler_metrics.as_dict())
+        if not args.loop:
+            break
+        time.sleep(args.interval)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import re
+from typing import List
+from sqlalchemy import Float, Integer, func, literal_column, or_, text
+from app.models import models
+
+# Recherche plein texte sur le titre et la description des tâches.
+# - PostgreSQL : colonne tsvector générée (config fr_unaccent) + index GIN
+# - SQLite : table FTS5 externe synchronisée par triggers
+# - autres : repli sur ILIKE
+# Les termes sont recherchés en préfixe, sans tenir compte des accents.
+
+TS_CONFIG = "fr_unaccent"
+FTS_TABLE = "todos_fts"
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TS_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {TS_CONFIG} (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION {TS_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END
+    $$
+    """,
+    f"""
+    ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TS_CONFIG}'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TS_CONFIG}'::regconfig, coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_todos_search_vector ON todos USING GIN (search_vector)",
+]
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS todos_fts_au AFTER UPDATE OF title, description ON todos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+def create_search_schema(conn) -> None:
+    """Créer (de façon idempotente) les structures de recherche du dialecte"""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            conn.execute(text(statement))
+    elif dialect == "sqlite":
+        # Table todos (re)créée sans ses triggers : index FTS à reconstruire
+        rebuild = "todos_fts_ai" not in {
+            row[0] for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            )
+        }
+        for statement in SQLITE_DDL:
+            conn.execute(text(statement))
+        if rebuild:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def drop_search_schema(conn) -> None:
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.execute(text("DROP INDEX IF EXISTS ix_todos_search_vector"))
+        conn.execute(text("ALTER TABLE todos DROP COLUMN IF EXISTS search_vector"))
+    elif dialect == "sqlite":
+        for trigger in ("todos_fts_ai", "todos_fts_ad", "todos_fts_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+def ensure_search_schema(engine) -> None:
+    with engine.begin() as conn:
+        create_search_schema(conn)
+
+def search_terms(query: str) -> List[str]:
+    """Découper la saisie en mots (les opérateurs des moteurs sont ignorés)"""
+    return re.findall(r"\w+", query or "")
+
+def apply_text_search(query, dialect: str, terms: List[str]):
+    """Filtrer une requête sur Todo par pertinence décroissante"""
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(
+            literal_column(f"'{TS_CONFIG}'::regconfig"),
+            " & ".join(f"{term}:*" for term in terms)
+        )
+        vector = literal_column("todos.search_vector")
+        return query.filter(vector.op("@@")(tsquery))\
+                    .order_by(func.ts_rank_cd(vector, tsquery).desc(), models.Todo.id)
+
+    if dialect == "sqlite":
+        # bm25 : plus petit = plus pertinent ; le titre pèse plus que la description
+        matches = text(
+            f"SELECT rowid AS id, bm25({FTS_TABLE}, 10.0, 1.0) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_query"
+        ).bindparams(fts_query=" ".join(f'"{term}"*' for term in terms))\
+         .columns(id=Integer, rank=Float)\
+         .subquery("fts")
+        return query.join(matches, matches.c.id == models.Todo.id)\
+                    .order_by(matches.c.rank, models.Todo.id)
+
+    for term in terms:
+        query = query.filter(
+            or_(
+                models.Todo.title.ilike(f"%{term}%"),
+                models.Todo.description.ilike(f"%{term}%")
+            )
+        )
+    return query.order_by(models.Todo.id)
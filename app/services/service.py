@@ -1,11 +1,27 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, and_, select, insert, update, delete
 from app.models import models
 from app.schemas import schemas
-from app.core.security import get_password_hash, verify_password
+from app.core.hashing import password_hasher
+from app.core.cache import principal_cache
+from app.core.events import CREATED, DELETED, UPDATED, event_broker
+from app.core.pagination import apply_keyset
+from app.services.search import apply_text_search, search_terms
+from app.services.recurrence import Recurrence, merge_occurrences, reschedule
+from app.services.patch import (
+    add_tags_statement, build_item, counts_state_first, patch_deltas, patch_statement,
+    previous_state, remove_tags_statement, row_tag_ids, state_counters_query
+)
+from app.services.rows import fetch_items, recurring_query, todos_query
+from app.services.stats import (
+    apply_counter_rows, apply_counters, counter_deltas, counter_names, get_stats, tag_counters_delete, todo_counter_names
+)
+from app.services.sync import TAGS, get_changes, tombstones_statement
+from app.services.tag_catalog import bump_version, tag_catalog
+from app.services.versions import RECURRING, TODOS, bump_collections, collection_etag
 from fastapi import HTTPException, status
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
 class UserService:
     @staticmethod
@@ -15,7 +31,7 @@ class UserService:
                 .first()
 
     @staticmethod
-    def create_user(db: Session, user: schemas.UserCreate):
+    async def create_user(db: Session, user: schemas.UserCreate):
         # Vérifier si l'email existe déjà
         db_user = UserService.get_user_by_email(db, user.email)
         if db_user:
@@ -24,25 +40,38 @@ class UserService:
                 detail="Email déjà enregistré"
             )
         
-        # Créer le nouvel utilisateur
-        hashed_password = get_password_hash(user.password)
+        # Créer le nouvel utilisateur (bcrypt dans le pool dédié)
+        hashed_password = await password_hasher.hash(user.password)
+        return UserService.add_user(db, user.email, hashed_password)
+
+    @staticmethod
+    def add_user(db: Session, email: str, hashed_password: str):
         db_user = models.User(
-            email=user.email,
+            email=email,
             hashed_password=hashed_password,
             is_active=True
         )
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
         return db_user
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str):
+    async def authenticate_user(db: Session, email: str, password: str):
         user = UserService.get_user_by_email(db, email)
         if not user:
             return False
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             return False
+        return UserService.accept_login(db, user, new_hash)
+
+    @staticmethod
+    def accept_login(db: Session, user: models.User, new_hash: Optional[str] = None):
+        """Suite d'une vérification réussie : re-hachage éventuel, compte actif"""
+        if new_hash:
+            # Le coût bcrypt configuré a changé : re-hachage transparent
+            user.hashed_password = new_hash
+            db.commit()
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -62,18 +91,37 @@ class UserService:
             )
         return user
 
+    @staticmethod
+    def set_active(db: Session, user_id: int, is_active: bool):
+        """Activer ou désactiver un utilisateur"""
+        user = UserService.get_user(db, user_id)
+        user.is_active = is_active
+        db.commit()
+        # Les tokens en cache portent l'ancien état de l'utilisateur
+        principal_cache.invalidate_subject(user.email)
+        return user
+
+def _resolve_tags(db: Session, tag_ids: List[int]) -> List[models.Tag]:
+    """Tags existants parmi tag_ids, résolus depuis le catalogue sans les relire"""
+    return [db.merge(tag, load=False) for tag in tag_catalog.get(db).detached(tag_ids)]
+
 class TagService:
     @staticmethod
     def create_tag(db: Session, tag: schemas.TagCreate) -> models.Tag:
-        db_tag = models.Tag(**tag.dict())
+        db_tag = models.Tag(**tag.dict(), revision=bump_version(db))
         db.add(db_tag)
         db.commit()
-        db.refresh(db_tag)
+        tag_catalog.invalidate()
+        event_broker.publish(None, TAGS, CREATED, [db_tag.id], db_tag.revision)
         return db_tag
 
     @staticmethod
-    def get_tags(db: Session) -> List[models.Tag]:
-        return db.query(models.Tag).all()
+    def get_catalog(db: Session):
+        return tag_catalog.get(db)
+
+    @staticmethod
+    def get_tags(db: Session) -> List[dict]:
+        return tag_catalog.get(db).list()
 
     @staticmethod
     def get_tag(db: Session, tag_id: int) -> Optional[models.Tag]:
@@ -88,8 +136,10 @@ class TagService:
         for field, value in tag.dict().items():
             setattr(db_tag, field, value)
         
+        db_tag.revision = bump_version(db)
         db.commit()
-        db.refresh(db_tag)
+        tag_catalog.invalidate()
+        event_broker.publish(None, TAGS, UPDATED, [tag_id], db_tag.revision)
         return db_tag
 
     @staticmethod
@@ -98,24 +148,61 @@ class TagService:
         if not db_tag:
             raise HTTPException(status_code=404, detail="Tag non trouvé")
         
+        revision = bump_version(db)
         db.delete(db_tag)
+        db.execute(tag_counters_delete(tag_id))
+        db.execute(tombstones_statement(db.get_bind().dialect.name, TAGS, [tag_id], revision))
         db.commit()
+        tag_catalog.invalidate()
+        event_broker.publish(None, TAGS, DELETED, [tag_id], revision)
         return True
 
 class TodoService:
     @staticmethod
-    def get_todos(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[models.Todo]:
+    def get_todos(
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[models.Todo]:
         """Récupérer toutes les tâches d'un utilisateur"""
-        return db.query(models.Todo)\
-                .filter(models.Todo.owner_id == user_id)\
+        query = db.query(models.Todo)\
+                  .options(selectinload(models.Todo.tags))\
+                  .filter(models.Todo.owner_id == user_id)
+        return apply_keyset(query, models.Todo, cursor)\
                 .offset(skip)\
                 .limit(limit)\
                 .all()
 
+    @staticmethod
+    def get_todo_items(
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[dict]:
+        """Même page que get_todos, en dicts prêts à sérialiser (sans ORM)"""
+        return fetch_items(
+            db, todos_query(user_id, skip, limit, cursor), models.todo_tags, "todo_id"
+        )
+
+    @staticmethod
+    def get_stats(db: Session, user_id: int) -> dict:
+        """Statistiques des tâches, lues depuis les compteurs"""
+        return get_stats(db, user_id)
+
+    @staticmethod
+    def get_collection_etag(db: Session, user_id: int, variant: str = "") -> str:
+        """ETag de la liste des tâches (sans l'exécuter)"""
+        return collection_etag(db, user_id, TODOS, variant)
+
     @staticmethod
     def get_todo(db: Session, todo_id: int, user_id: int) -> Optional[models.Todo]:
         """Récupérer une tâche spécifique"""
         return db.query(models.Todo)\
+                .options(selectinload(models.Todo.tags))\
                 .filter(models.Todo.id == todo_id)\
                 .filter(models.Todo.owner_id == user_id)\
                 .first()
@@ -128,43 +215,17 @@ class TodoService:
             description=todo.description,
             priority=todo.priority,
             due_date=todo.due_date,
-            owner_id=user_id
+            owner_id=user_id,
+            tags=[]
         )
         if todo.tag_ids:
-            tags = db.query(models.Tag)\
-                    .filter(models.Tag.id.in_(todo.tag_ids))\
-                    .all()
-            db_todo.tags.extend(tags)
+            db_todo.tags.extend(_resolve_tags(db, todo.tag_ids))
         
+        db_todo.revision = bump_collections(db, user_id, TODOS)
         db.add(db_todo)
+        apply_counters(db, user_id, counter_deltas(after=todo_counter_names(db_todo)))
         db.commit()
-        db.refresh(db_todo)
-        return db_todo
-
-    @staticmethod
-    def update_todo(db: Session, todo_id: int, todo_update: schemas.TodoUpdate, user_id: int) -> Optional[models.Todo]:
-        """Mettre à jour une tâche"""
-        db_todo = TodoService.get_todo(db, todo_id, user_id)
-        if not db_todo:
-            return None
-
-        update_data = todo_update.model_dump(exclude_unset=True)
-        
-        # Gérer les tags séparément
-        if "tag_ids" in update_data:
-            tag_ids = update_data.pop("tag_ids")
-            if tag_ids is not None:
-                tags = db.query(models.Tag)\
-                        .filter(models.Tag.id.in_(tag_ids))\
-                        .all()
-                db_todo.tags = tags
-
-        # Mettre à jour les autres champs
-        for field, value in update_data.items():
-            setattr(db_todo, field, value)
-
-        db.commit()
-        db.refresh(db_todo)
+        event_broker.publish(user_id, TODOS, CREATED, [db_todo.id], db_todo.revision)
         return db_todo
 
     @staticmethod
@@ -174,8 +235,12 @@ class TodoService:
         if not db_todo:
             return False
         
+        revision = bump_collections(db, user_id, TODOS)
         db.delete(db_todo)
+        apply_counters(db, user_id, counter_deltas(before=todo_counter_names(db_todo)))
+        db.execute(tombstones_statement(db.get_bind().dialect.name, TODOS, [todo_id], revision, user_id))
         db.commit()
+        event_broker.publish(user_id, TODOS, DELETED, [todo_id], revision)
         return True
 
     @staticmethod
@@ -185,20 +250,24 @@ class TodoService:
         query: str,
         completed: Optional[bool] = None,
         tag_id: Optional[int] = None,
-        priority: Optional[int] = None
+        priority: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
     ) -> List[models.Todo]:
-        """Rechercher des tâches avec filtres"""
+        """Rechercher des tâches avec filtres, triées par pertinence"""
+        terms = search_terms(query)
+        if query and not terms:
+            return []
+
         search = db.query(models.Todo)\
+                  .options(selectinload(models.Todo.tags))\
                   .filter(models.Todo.owner_id == user_id)
 
-        # Recherche par texte
-        if query:
-            search = search.filter(
-                or_(
-                    models.Todo.title.ilike(f"%{query}%"),
-                    models.Todo.description.ilike(f"%{query}%")
-                )
-            )
+        # Recherche plein texte (index GIN / FTS5 selon la base)
+        if terms:
+            search = apply_text_search(search, db.get_bind().dialect.name, terms)
+        else:
+            search = search.order_by(models.Todo.id)
 
         # Filtres optionnels
         if completed is not None:
@@ -210,30 +279,25 @@ class TodoService:
         if priority:
             search = search.filter(models.Todo.priority == priority)
 
-        return search.all()
+        return search.offset(skip).limit(limit).all()
 
     @staticmethod
-    def filter_todos(
-        db: Session,
-        user_id: int,
+    def apply_filters(
+        query,
+        dialect: str,
         search_term: Optional[str] = None,
         completed: Optional[bool] = None,
         tag_id: Optional[int] = None,
         priority: Optional[schemas.TodoPriority] = None,
         due_before: Optional[datetime] = None,
         due_after: Optional[datetime] = None
-    ) -> List[models.Todo]:
-        """Filtrer les tâches selon plusieurs critères"""
-        query = db.query(models.Todo)\
-                 .filter(models.Todo.owner_id == user_id)
-
+    ):
+        """Appliquer les critères de filter_todos (None si aucun résultat possible)"""
         if search_term:
-            query = query.filter(
-                or_(
-                    models.Todo.title.ilike(f"%{search_term}%"),
-                    models.Todo.description.ilike(f"%{search_term}%")
-                )
-            )
+            terms = search_terms(search_term)
+            if not terms:
+                return None
+            query = apply_text_search(query, dialect, terms)
 
         if completed is not None:
             query = query.filter(models.Todo.completed == completed)
@@ -250,53 +314,260 @@ class TodoService:
         if due_after:
             query = query.filter(models.Todo.due_date >= due_after)
 
+        return query
+
+    @staticmethod
+    def filter_todos(
+        db: Session,
+        user_id: int,
+        search_term: Optional[str] = None,
+        completed: Optional[bool] = None,
+        tag_id: Optional[int] = None,
+        priority: Optional[schemas.TodoPriority] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None
+    ) -> List[models.Todo]:
+        """Filtrer les tâches selon plusieurs critères"""
+        query = db.query(models.Todo)\
+                 .options(selectinload(models.Todo.tags))\
+                 .filter(models.Todo.owner_id == user_id)
+
+        query = TodoService.apply_filters(
+            query,
+            db.get_bind().dialect.name,
+            search_term=search_term,
+            completed=completed,
+            tag_id=tag_id,
+            priority=priority,
+            due_before=due_before,
+            due_after=due_after
+        )
+        if query is None:
+            return []
+
         return query.all()
 
     @staticmethod
     def update_todo(
-        db: Session, 
-        todo_id: int, 
-        todo_update: schemas.TodoUpdate, 
+        db: Session,
+        todo_id: int,
+        todo_update: schemas.TodoUpdate,
         user_id: int
-    ) -> Optional[models.Todo]:
-        """Mettre à jour une tâche existante"""
-        db_todo = db.query(models.Todo)\
-                   .filter(models.Todo.id == todo_id)\
-                   .filter(models.Todo.owner_id == user_id)\
-                   .first()
-        
-        if not db_todo:
+    ) -> Optional[dict]:
+        """Mise à jour partielle : un UPDATE ... RETURNING limité au propriétaire
+
+        La réponse est construite depuis la ligne renvoyée et les tags sont
+        modifiés par différence (cf. app.services.patch) ; None si la tâche
+        n'existe pas ou appartient à un autre utilisateur.
+        """
+        changes = todo_update.model_dump(exclude_unset=True)
+        tag_ids = changes.pop("tag_ids", None)
+        dialect = db.get_bind().dialect.name
+        try:
+            # Révision d'abord (verrou par utilisateur), portée par la ligne même
+            # si seuls les tags changent
+            changes["revision"] = bump_collections(db, user_id, TODOS)
+            if counts_state_first(dialect, changes):
+                apply_counter_rows(db, state_counters_query(todo_id, user_id, changes))
+            row = db.execute(patch_statement(dialect, todo_id, user_id, changes)).first()
+            if row is None:
+                db.rollback()
+                return None
+
+            snapshot = None
+            removed, added = [], []
+            if tag_ids is not None:
+                snapshot = tag_catalog.get(db)
+                tag_ids = snapshot.known_ids(tag_ids)
+                removed = db.scalars(remove_tags_statement(todo_id, tag_ids)).all()
+                if tag_ids:
+                    added = db.scalars(add_tags_statement(dialect, todo_id, tag_ids)).all()
+            final_tag_ids = row_tag_ids(row, tag_ids)
+            if final_tag_ids and snapshot is None:
+                # Tags inchangés : pas de relecture de la version du catalogue
+                snapshot = tag_catalog.cached(db, final_tag_ids)
+
+            apply_counters(db, user_id, patch_deltas(row, previous_state(row), removed, added))
+            db.commit()
+        except Exception as e:
+            db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Todo non trouvé"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Erreur lors de la mise à jour: {str(e)}"
             )
+        event_broker.publish(user_id, TODOS, UPDATED, [todo_id], changes["revision"])
+        return build_item(row, final_tag_ids, snapshot)
 
-        # Mise à jour des champs simples
-        update_data = todo_update.dict(exclude_unset=True)
-        
-        # Gestion spéciale pour les tags si présents
-        if 'tag_ids' in update_data:
-            tag_ids = update_data.pop('tag_ids')
-            if tag_ids is not None:
-                tags = db.query(models.Tag)\
-                         .filter(models.Tag.id.in_(tag_ids))\
-                         .all()
-                db_todo.tags = tags
+    @staticmethod
+    def bulk_todos(
+        db: Session,
+        operations: List[schemas.TodoBulkOperation],
+        user_id: int
+    ) -> List[schemas.TodoBulkResult]:
+        """Appliquer créations, mises à jour et suppressions en une transaction
+
+        Les opérations sont appliquées par type (créations, puis mises à jour,
+        puis suppressions), chacune en requêtes groupées. Le résultat de chaque
+        opération est renvoyé à son index d'origine.
+        """
+        results: List[Optional[schemas.TodoBulkResult]] = [None] * len(operations)
+        creates, updates, deletes = [], [], []
+
+        def result(index, op, status_code, todo_id=None, detail=None):
+            results[index] = schemas.TodoBulkResult(
+                index=index, op=op.op, status=status_code, id=todo_id, detail=detail
+            )
 
-        # Mise à jour des autres champs
-        for field, value in update_data.items():
-            setattr(db_todo, field, value)
+        for index, op in enumerate(operations):
+            if op.op == schemas.BulkOperationType.CREATE and op.todo is not None:
+                creates.append((index, op))
+            elif op.op == schemas.BulkOperationType.UPDATE and op.id is not None and op.changes is not None:
+                updates.append((index, op))
+            elif op.op == schemas.BulkOperationType.DELETE and op.id is not None:
+                deletes.append((index, op))
+            else:
+                result(index, op, status.HTTP_422_UNPROCESSABLE_ENTITY, op.id, "Opération incomplète")
+
+        # Une requête pour tous les tags référencés, une pour la propriété des tâches
+        tag_ids = {tag_id for _, op in creates if op.todo.tag_ids for tag_id in op.todo.tag_ids}
+        tag_ids |= {tag_id for _, op in updates if op.changes.tag_ids for tag_id in op.changes.tag_ids}
+        known_tags = set(tag_catalog.get(db).known_ids(tag_ids)) if tag_ids else set()
+
+        # État des tâches visées : propriété, puis écarts des compteurs
+        target_ids = {op.id for _, op in updates + deletes}
+        states = {}
+        if target_ids:
+            for row in db.execute(
+                select(models.Todo.id, models.Todo.completed, models.Todo.priority)
+                .where(models.Todo.owner_id == user_id)
+                .where(models.Todo.id.in_(target_ids))
+            ):
+                states[row.id] = {"completed": row.completed, "priority": row.priority, "tag_ids": []}
+        if states:
+            for todo_id, tag_id in db.execute(
+                select(models.todo_tags.c.todo_id, models.todo_tags.c.tag_id)
+                .where(models.todo_tags.c.todo_id.in_(states))
+            ):
+                states[todo_id]["tag_ids"].append(tag_id)
+        owned = set(states)
+        final_states = {todo_id: dict(state) for todo_id, state in states.items()}
+        counters_after = []
+        new_ids = []
 
         try:
+            revision = None
+            if creates or any(op.id in owned for _, op in updates + deletes):
+                revision = bump_collections(db, user_id, TODOS)
+
+            # Tags finaux par tâche créée ou re-taguée (la dernière opération l'emporte)
+            tag_assignments = {}
+            if creates:
+                now = datetime.utcnow()
+                # PostgreSQL : INSERT multi-lignes par lots ; SQLite ne sait pas
+                # garantir l'ordre du RETURNING et repasse à une ligne par requête
+                new_ids = db.scalars(
+                    insert(models.Todo).returning(models.Todo.id, sort_by_parameter_order=True),
+                    [
+                        {
+                            "title": op.todo.title,
+                            "description": op.todo.description,
+                            "completed": op.todo.completed,
+                            "priority": op.todo.priority,
+                            "due_date": op.todo.due_date,
+                            "created_at": now,
+                            "owner_id": user_id,
+                            "revision": revision,
+                        }
+                        for _, op in creates
+                    ]
+                ).all()
+                for (index, op), todo_id in zip(creates, new_ids):
+                    tag_assignments[todo_id] = op.todo.tag_ids or []
+                    counters_after += counter_names(
+                        op.todo.completed,
+                        op.todo.priority,
+                        [tag_id for tag_id in op.todo.tag_ids or [] if tag_id in known_tags]
+                    )
+                    result(index, op, status.HTTP_201_CREATED, todo_id)
+
+            valid_updates = []
+            for index, op in updates:
+                if op.id in owned:
+                    valid_updates.append((index, op))
+                else:
+                    result(index, op, status.HTTP_404_NOT_FOUND, op.id, "Todo non trouvé")
+
+            # UPDATE par clé primaire, exécuté en lots par ensemble de colonnes
+            scalar_updates = []
+            retagged = set()
+            for index, op in valid_updates:
+                changes = op.changes.model_dump(exclude_unset=True)
+                tag_ids = changes.pop("tag_ids", None)
+                # Toute tâche mise à jour (même re-taguée seulement) prend la révision
+                scalar_updates.append({"id": op.id, **changes, "revision": revision})
+                final_states[op.id].update(
+                    (field, value) for field, value in changes.items()
+                    if field in ("completed", "priority")
+                )
+                if tag_ids is not None:
+                    retagged.add(op.id)
+                    tag_assignments[op.id] = tag_ids
+                    final_states[op.id]["tag_ids"] = [tag_id for tag_id in tag_ids if tag_id in known_tags]
+                result(index, op, status.HTTP_200_OK, op.id)
+            if scalar_updates:
+                db.execute(update(models.Todo), scalar_updates)
+            if retagged:
+                db.execute(delete(models.todo_tags).where(models.todo_tags.c.todo_id.in_(retagged)))
+
+            deleted_ids = set()
+            for index, op in deletes:
+                if op.id in owned and op.id not in deleted_ids:
+                    deleted_ids.add(op.id)
+                    result(index, op, status.HTTP_204_NO_CONTENT, op.id)
+                else:
+                    result(index, op, status.HTTP_404_NOT_FOUND, op.id, "Todo non trouvé")
+            if deleted_ids:
+                for todo_id in deleted_ids:
+                    tag_assignments.pop(todo_id, None)
+                    final_states.pop(todo_id)
+                db.execute(delete(models.todo_tags).where(models.todo_tags.c.todo_id.in_(deleted_ids)))
+                db.execute(
+                    delete(models.Todo)
+                    .where(models.Todo.owner_id == user_id)
+                    .where(models.Todo.id.in_(deleted_ids))
+                )
+                db.execute(tombstones_statement(
+                    db.get_bind().dialect.name, TODOS, sorted(deleted_ids), revision, user_id
+                ))
+
+            association_rows = [
+                {"todo_id": todo_id, "tag_id": tag_id}
+                for todo_id, ids in tag_assignments.items()
+                for tag_id in dict.fromkeys(ids)
+                if tag_id in known_tags
+            ]
+            if association_rows:
+                db.execute(insert(models.todo_tags), association_rows)
+            for state in final_states.values():
+                counters_after += counter_names(**state)
+            apply_counters(db, user_id, counter_deltas(
+                [name for state in states.values() for name in counter_names(**state)],
+                counters_after
+            ))
             db.commit()
-            db.refresh(db_todo)
-            return db_todo
         except Exception as e:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Erreur lors de la mise à jour: {str(e)}"
+                detail=f"Erreur lors du traitement groupé: {str(e)}"
             )
+        event_broker.publish(user_id, TODOS, CREATED, new_ids, revision)
+        event_broker.publish(user_id, TODOS, UPDATED, {op.id for _, op in valid_updates} - deleted_ids, revision)
+        event_broker.publish(user_id, TODOS, DELETED, deleted_ids, revision)
+        return results
+
+# Champs de la règle de récurrence
+SCHEDULE_FIELDS = {'frequency', 'interval', 'weekdays', 'starts_at', 'ends_at'}
 
 class RecurringTodoService:
     @staticmethod
@@ -306,31 +577,95 @@ class RecurringTodoService:
         user_id: int
     ) -> models.RecurringTodo:
         todo_data = todo.dict(exclude={'tag_ids'})
-        db_todo = models.RecurringTodo(**todo_data, owner_id=user_id)
+        now = datetime.utcnow()
+        todo_data['starts_at'] = todo.starts_at or now
+        db_todo = models.RecurringTodo(**todo_data, owner_id=user_id, tags=[])
+        # Première occurrence à venir (pas de rattrapage d'une ancre passée)
+        reschedule(db_todo, now)
         
         if todo.tag_ids:
-            tags = db.query(models.Tag).filter(models.Tag.id.in_(todo.tag_ids)).all()
-            db_todo.tags = tags
+            db_todo.tags = _resolve_tags(db, todo.tag_ids)
         
+        db_todo.revision = bump_collections(db, user_id, RECURRING)
         db.add(db_todo)
         db.commit()
-        db.refresh(db_todo)
+        event_broker.publish(user_id, RECURRING, CREATED, [db_todo.id], db_todo.revision)
         return db_todo
 
+    @staticmethod
+    def get_recurring_items(
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[dict]:
+        return fetch_items(
+            db,
+            recurring_query(user_id, skip, limit, cursor),
+            models.recurring_todo_tags,
+            "recurring_todo_id"
+        )
+
+    @staticmethod
+    def get_collection_etag(db: Session, user_id: int, variant: str = "") -> str:
+        return collection_etag(db, user_id, RECURRING, variant)
+
     @staticmethod
     def get_recurring_todos(
         db: Session, 
         user_id: int, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[models.RecurringTodo]:
-        return db.query(models.RecurringTodo)\
-                .filter(models.RecurringTodo.owner_id == user_id)\
-                .filter(models.RecurringTodo.active == True)\
+        query = db.query(models.RecurringTodo)\
+                  .options(selectinload(models.RecurringTodo.tags))\
+                  .filter(models.RecurringTodo.owner_id == user_id)\
+                  .filter(models.RecurringTodo.active == True)
+        return apply_keyset(query, models.RecurringTodo, cursor)\
                 .offset(skip)\
                 .limit(limit)\
                 .all()
 
+    @staticmethod
+    def get_occurrences(
+        db: Session,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int = 1000
+    ) -> List[dict]:
+        """Occurrences à venir de toutes les séries de l'utilisateur dans [start, end]"""
+        if end < start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Fenêtre de dates invalide"
+            )
+        series = db.query(models.RecurringTodo)\
+                   .filter(models.RecurringTodo.owner_id == user_id)\
+                   .filter(models.RecurringTodo.active == True)\
+                   .filter(models.RecurringTodo.next_due_at <= end)\
+                   .filter(or_(models.RecurringTodo.ends_at.is_(None),
+                               models.RecurringTodo.ends_at >= start))\
+                   .all()
+        return RecurringTodoService.expand_occurrences(series, start, end, limit)
+
+    @staticmethod
+    def expand_occurrences(series, start: datetime, end: datetime, limit: int) -> List[dict]:
+        # Seules les occurrences non encore générées (>= next_due_at) sont listées
+        occurrences = merge_occurrences(
+            (
+                (recurring, Recurrence.from_model(recurring).between(max(start, recurring.next_due_at), end))
+                for recurring in series
+            ),
+            limit=limit
+        )
+        return [
+            {"recurring_todo_id": recurring.id, "title": recurring.title, "due_date": due_date}
+            for due_date, recurring in occurrences
+        ]
+
     @staticmethod
     def update_recurring_todo(
         db: Session,
@@ -339,6 +674,7 @@ class RecurringTodoService:
         user_id: int
     ) -> models.RecurringTodo:
         db_todo = db.query(models.RecurringTodo)\
+                    .options(selectinload(models.RecurringTodo.tags))\
                     .filter(models.RecurringTodo.id == recurring_id)\
                     .filter(models.RecurringTodo.owner_id == user_id)\
                     .first()
@@ -351,14 +687,18 @@ class RecurringTodoService:
         if 'tag_ids' in update_data:
             tag_ids = update_data.pop('tag_ids')
             if tag_ids:
-                tags = db.query(models.Tag).filter(models.Tag.id.in_(tag_ids)).all()
-                db_todo.tags = tags
+                db_todo.tags = _resolve_tags(db, tag_ids)
         
         for field, value in update_data.items():
             setattr(db_todo, field, value)
+
+        # Règle modifiée : prochaine occurrence recalculée à partir de maintenant
+        if SCHEDULE_FIELDS.intersection(update_data):
+            reschedule(db_todo, datetime.utcnow())
         
+        db_todo.revision = bump_collections(db, user_id, RECURRING)
         db.commit()
-        db.refresh(db_todo)
+        event_broker.publish(user_id, RECURRING, UPDATED, [recurring_id], db_todo.revision)
         return db_todo
 
     @staticmethod
@@ -368,6 +708,7 @@ class RecurringTodoService:
         user_id: int
     ) -> models.Todo:
         recurring = db.query(models.RecurringTodo)\
+                     .options(selectinload(models.RecurringTodo.tags))\
                      .filter(models.RecurringTodo.id == recurring_id)\
                      .filter(models.RecurringTodo.owner_id == user_id)\
                      .first()
@@ -375,13 +716,11 @@ class RecurringTodoService:
         if not recurring:
             raise HTTPException(status_code=404, detail="Tâche récurrente non trouvée")
         
-        # Calculer la prochaine date d'échéance
-        if recurring.frequency == "daily":
-            due_date = datetime.utcnow() + timedelta(days=1)
-        elif recurring.frequency == "weekly":
-            due_date = datetime.utcnow() + timedelta(weeks=1)
-        elif recurring.frequency == "monthly":
-            due_date = datetime.utcnow() + timedelta(days=30)
+        if recurring.next_due_at is None:
+            raise HTTPException(status_code=400, detail="Tâche récurrente terminée")
+
+        # Prochaine occurrence non encore générée
+        due_date = recurring.next_due_at
         
         # Créer la nouvelle tâche
         new_todo = models.Todo(
@@ -389,15 +728,24 @@ class RecurringTodoService:
             description=recurring.description,
             owner_id=user_id,
             due_date=due_date,
-            recurring_todo_id=recurring.id
+            recurring_todo_id=recurring.id,
+            completed=False,
+            priority=schemas.TodoPriority.LOW
         )
         
         # Copier les tags
         new_todo.tags = recurring.tags
+
+        # Le planificateur reprend à l'occurrence suivante
+        recurring.last_generated_at = datetime.utcnow()
+        recurring.next_due_at = Recurrence.from_model(recurring).next_after(due_date)
         
+        new_todo.revision = recurring.revision = bump_collections(db, user_id, TODOS, RECURRING)
         db.add(new_todo)
+        apply_counters(db, user_id, counter_deltas(after=todo_counter_names(new_todo)))
         db.commit()
-        db.refresh(new_todo)
+        event_broker.publish(user_id, TODOS, CREATED, [new_todo.id], new_todo.revision)
+        event_broker.publish(user_id, RECURRING, UPDATED, [recurring_id], recurring.revision)
         return new_todo
 
     @staticmethod
@@ -412,5 +760,13 @@ class RecurringTodoService:
         
         # Désactiver plutôt que supprimer
         db_todo.active = False
+        db_todo.revision = bump_collections(db, user_id, RECURRING)
         db.commit()
-        return True
\ No newline at end of file
+        event_broker.publish(user_id, RECURRING, DELETED, [recurring_id], db_todo.revision)
+        return True
+
+class SyncService:
+    @staticmethod
+    def get_changes(db: Session, user_id: int, since: Optional[str] = None) -> dict:
+        """Changements depuis le jeton (cf. app.services.sync)"""
+        return get_changes(db, user_id, since)
\ No newline at end of file
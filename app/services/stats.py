@@ -0,0 +1,161 @@
+"""Statistiques des tâches par utilisateur (GET /todos/stats).
+
+Les totaux sont tenus dans todo_counters, une ligne par (utilisateur,
+compteur) : « total », « completed », « priority:<n> », « tag:<id> ».
+Chaque écriture sur les tâches applique ses écarts dans sa transaction
+(upsert value + delta) ; la lecture des statistiques ne dépend donc pas du
+nombre de tâches. Seul le nombre de tâches en retard, qui change avec le
+temps, est compté à la lecture sur l'index (owner_id, completed, due_date).
+
+Sans compteurs pour l'utilisateur, les statistiques sont calculées par
+GROUP BY. En cas de dérive, les compteurs sont reconstruits par les mêmes
+requêtes :
+
+    python -m app.services.stats                # tous les utilisateurs
+    python -m app.services.stats --user 42      # un utilisateur
+"""
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import String, cast, delete, false, func, insert, literal, select
+from app.models import models
+from app.services.versions import INSERTS
+
+TOTAL = "total"
+COMPLETED = "completed"
+PRIORITY_PREFIX = "priority:"
+TAG_PREFIX = "tag:"
+
+counters = models.TodoCounter.__table__
+
+def counter_names(completed: Optional[bool], priority: Optional[int], tag_ids: Iterable[int]) -> List[str]:
+    """Compteurs auxquels contribue une tâche dans cet état"""
+    names = [TOTAL]
+    if completed:
+        names.append(COMPLETED)
+    if priority is not None:
+        names.append(f"{PRIORITY_PREFIX}{int(priority)}")
+    names.extend(f"{TAG_PREFIX}{tag_id}" for tag_id in dict.fromkeys(tag_ids))
+    return names
+
+def todo_counter_names(todo: models.Todo) -> List[str]:
+    return counter_names(todo.completed, todo.priority, [tag.id for tag in todo.tags])
+
+def counter_deltas(before: Iterable[str] = (), after: Iterable[str] = ()) -> Dict[str, int]:
+    deltas = Counter(after)
+    deltas.subtract(before)
+    return {name: delta for name, delta in deltas.items() if delta}
+
+def _upsert(dialect: str, rows):
+    """INSERT ... ON CONFLICT DO UPDATE value + excluded.value (rows : liste de valeurs ou SELECT)"""
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Compteurs non gérés pour {dialect}")
+    statement = INSERTS[dialect](counters)
+    if isinstance(rows, list):
+        statement = statement.values(rows)
+    else:
+        statement = statement.from_select(["owner_id", "name", "value"], rows)
+    return statement.on_conflict_do_update(
+        index_elements=[counters.c.owner_id, counters.c.name],
+        set_={"value": counters.c.value + statement.excluded.value}
+    )
+
+def _rows(owner_id: int, deltas: Dict[str, int]):
+    return [{"owner_id": owner_id, "name": name, "value": delta} for name, delta in deltas.items()]
+
+def apply_counters(db, owner_id: int, deltas: Dict[str, int]) -> None:
+    """Appliquer les écarts dans la transaction de l'écriture"""
+    if deltas:
+        db.execute(_upsert(db.get_bind().dialect.name, _rows(owner_id, deltas)))
+
+def apply_counter_rows(db, rows) -> None:
+    """Appliquer les écarts d'un SELECT (owner_id, name, value) dans la transaction de l'écriture"""
+    db.execute(_upsert(db.get_bind().dialect.name, rows))
+
+def tag_counters_delete(tag_id: int):
+    """Compteurs d'un tag supprimé (ses associations disparaissent avec lui)"""
+    return delete(counters).where(counters.c.name == f"{TAG_PREFIX}{tag_id}")
+
+def grouped_counts(*criteria) -> list:
+    """Un SELECT (owner_id, name, value) par famille de compteurs, restreint à criteria"""
+    todo = models.Todo
+    # Le WHERE lève aussi l'ambiguïté INSERT ... SELECT ... ON CONFLICT de SQLite
+    where = [todo.owner_id.isnot(None), *criteria]
+    return [
+        select(todo.owner_id, literal(TOTAL), func.count())
+        .where(*where)
+        .group_by(todo.owner_id),
+        select(todo.owner_id, literal(COMPLETED), func.count())
+        .where(*where, todo.completed == True)
+        .group_by(todo.owner_id),
+        select(todo.owner_id, literal(PRIORITY_PREFIX).concat(cast(todo.priority, String)), func.count())
+        .where(*where, todo.priority.isnot(None))
+        .group_by(todo.owner_id, todo.priority),
+        select(todo.owner_id, literal(TAG_PREFIX).concat(cast(models.todo_tags.c.tag_id, String)), func.count())
+        .join(models.todo_tags, models.todo_tags.c.todo_id == todo.id)
+        .where(*where)
+        .group_by(todo.owner_id, models.todo_tags.c.tag_id),
+    ]
+
+def count_todos_for(conn, *criteria) -> None:
+    """Écriture groupée (planificateur) : ajouter aux compteurs les tâches sélectionnées"""
+    for query in grouped_counts(*criteria):
+        conn.execute(_upsert(conn.dialect.name, query))
+
+def rebuild_counters(conn, owner_id: Optional[int] = None) -> None:
+    """Recalculer les compteurs (d'un utilisateur ou de tous) depuis les tâches"""
+    criteria = [] if owner_id is None else [models.Todo.owner_id == owner_id]
+    cleanup = delete(counters)
+    if owner_id is not None:
+        cleanup = cleanup.where(counters.c.owner_id == owner_id)
+    conn.execute(cleanup)
+    for query in grouped_counts(*criteria):
+        conn.execute(insert(counters).from_select(["owner_id", "name", "value"], query))
+
+def _counters_query(owner_id: int):
+    return select(counters.c.name, counters.c.value).where(counters.c.owner_id == owner_id)
+
+def _overdue_query(owner_id: int, now: datetime):
+    return select(func.count())\
+        .where(models.Todo.owner_id == owner_id)\
+        .where(models.Todo.completed == false())\
+        .where(models.Todo.due_date < now)
+
+def _stats(values: Dict[str, int], overdue: int) -> dict:
+    by_priority = {priority: 0 for priority in (1, 2, 3)}
+    by_tag = {}
+    for name, value in values.items():
+        if name.startswith(PRIORITY_PREFIX):
+            by_priority[int(name[len(PRIORITY_PREFIX):])] = value
+        elif name.startswith(TAG_PREFIX) and value:
+            by_tag[int(name[len(TAG_PREFIX):])] = value
+    total, completed = values.get(TOTAL, 0), values.get(COMPLETED, 0)
+    return {
+        "total": total,
+        "completed": completed,
+        "pending": total - completed,
+        "overdue": overdue,
+        "by_priority": by_priority,
+        "by_tag": by_tag,
+    }
+
+def get_stats(db, owner_id: int, now: Optional[datetime] = None) -> dict:
+    values = dict(db.execute(_counters_query(owner_id)).all())
+    if TOTAL not in values:
+        # Pas de compteurs : calcul par GROUP BY
+        for query in grouped_counts(models.Todo.owner_id == owner_id):
+            values.update((name, value) for _, name, value in db.execute(query))
+    overdue = db.scalar(_overdue_query(owner_id, now or datetime.utcnow()))
+    return _stats(values, overdue)
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Reconstruire les compteurs des tâches")
+    parser.add_argument("--user", type=int, default=None, help="identifiant de l'utilisateur")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        rebuild_counters(conn, args.user)
+    print("Compteurs reconstruits", f"(utilisateur {args.user})" if args.user else "(tous les utilisateurs)")
\ No newline at end of file
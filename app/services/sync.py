@@ -0,0 +1,221 @@
+"""Flux de synchronisation incrémentale (GET /sync/changes).
+
+Chaque écriture porte une révision croissante :
+- tâches et tâches récurrentes : la version "sync" de leur propriétaire
+  (collection_versions, incrémentée avant l'écriture, cf. app.services.versions),
+- tags (partagés) : la version du catalogue des tags.
+Les suppressions définitives (tâches, tags) laissent une ligne dans
+sync_tombstones avec la révision de la suppression ; une tâche récurrente
+supprimée est désactivée et apparaît dans deleted.recurring.
+
+Le jeton encode les deux révisions ("<utilisateur>.<tags>"). Les bornes sont
+lues en premier : une révision visible n'est validée qu'avec toutes les
+lignes qui la portent (le verrou de l'incrément est tenu jusqu'au commit),
+et les lignes lues sont limitées à ]jeton, bornes]. Une ligne modifiée entre
+les deux lectures sort de la fenêtre et sera renvoyée au passage suivant.
+
+Sans jeton, seul le jeton courant est renvoyé : le client le demande avant
+de charger ses listes complètes (routes existantes), puis interroge le flux
+à partir de ce jeton ; les écritures concurrentes du chargement sont
+renvoyées une seconde fois (application idempotente).
+
+Les suppressions sont conservées SYNC_TOMBSTONE_RETENTION_DAYS jours
+(prune_tombstones, à chaque passage du planificateur ou en ligne de
+commande). La purge relève l'horizon de chaque propriétaire (plus haute
+révision purgée, ligne "sync_horizon" de collection_versions) et celui des
+tags (ligne "tags_horizon" de catalog_versions) : un jeton antérieur à
+l'horizon a pu manquer des suppressions, il reçoit 410 (rechargement
+complet).
+
+    python -m app.services.sync --prune
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, func, literal, select
+from app.core.config import settings
+from app.models import models
+from app.services.rows import (
+    RECURRING_COLUMNS, TODO_COLUMNS, fetch_items
+)
+from app.services.tag_catalog import TAGS_CATALOG
+from app.services.versions import INSERTS, RECURRING, SYNC, TODOS
+
+TAGS = "tags"
+# Plus hautes révisions purgées (utilisateur : collection_versions, tags : catalog_versions)
+HORIZON = "sync_horizon"
+TAGS_HORIZON = "tags_horizon"
+
+tombstones = models.SyncTombstone.__table__
+versions = models.CollectionVersion.__table__
+catalogs = models.CatalogVersion.__table__
+
+def make_token(revisions: Tuple[int, int]) -> str:
+    return "{}.{}".format(*revisions)
+
+def parse_token(token: str) -> Tuple[int, int]:
+    try:
+        user_revision, tags_revision = (int(part) for part in token.split("."))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Jeton de synchronisation invalide")
+    if user_revision < 0 or tags_revision < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Jeton de synchronisation invalide")
+    return user_revision, tags_revision
+
+def _collection_version(owner_id: int, collection: str):
+    return select(versions.c.version)\
+        .where(versions.c.owner_id == owner_id)\
+        .where(versions.c.collection == collection)\
+        .scalar_subquery()
+
+def _catalog_version(name: str):
+    return select(catalogs.c.version).where(catalogs.c.name == name).scalar_subquery()
+
+def bounds_query(owner_id: int):
+    """Révisions courantes (utilisateur, tags) puis horizons de purge, en une requête"""
+    return select(
+        func.coalesce(_collection_version(owner_id, SYNC), 0),
+        func.coalesce(_catalog_version(TAGS_CATALOG), 0),
+        func.coalesce(_collection_version(owner_id, HORIZON), 0),
+        func.coalesce(_catalog_version(TAGS_HORIZON), 0)
+    )
+
+def _check_since(since: Tuple[int, int], current: Tuple[int, int], horizon: Tuple[int, int]) -> None:
+    # Jeton d'une autre base (réinitialisée, restaurée), ou antérieur à des
+    # suppressions purgées : resynchronisation complète
+    if since[0] > current[0] or since[1] > current[1] or since[0] < horizon[0] or since[1] < horizon[1]:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Jeton de synchronisation expiré, recharger les listes"
+        )
+
+def tombstones_statement(dialect: str, entity: str, entity_ids: List[int], revision: int,
+                         owner_id: Optional[int] = None):
+    """Upsert des suppressions (un identifiant réutilisé puis supprimé reprend la révision)"""
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Synchronisation non gérée pour {dialect}")
+    now = datetime.utcnow()
+    statement = INSERTS[dialect](tombstones).values([
+        {"entity": entity, "entity_id": entity_id, "owner_id": owner_id, "revision": revision, "deleted_at": now}
+        for entity_id in entity_ids
+    ])
+    return statement.on_conflict_do_update(
+        index_elements=[tombstones.c.entity, tombstones.c.entity_id],
+        set_={
+            "owner_id": statement.excluded.owner_id,
+            "revision": statement.excluded.revision,
+            "deleted_at": statement.excluded.deleted_at,
+        }
+    )
+
+def _raise_horizon(dialect: str, table, index_elements, columns: List[str], rows):
+    """Upsert d'horizons depuis un SELECT : la version ne fait que croître"""
+    statement = INSERTS[dialect](table).from_select(columns, rows)
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={"version": case(
+            (statement.excluded.version > table.c.version, statement.excluded.version),
+            else_=table.c.version
+        )}
+    )
+
+def prune_tombstones(conn, now: Optional[datetime] = None, retention_days: Optional[int] = None) -> int:
+    """Purger les suppressions plus anciennes que la rétention et relever les horizons
+
+    Dans la transaction de l'appelant ; renvoie le nombre de lignes purgées.
+    """
+    dialect = conn.dialect.name
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Synchronisation non gérée pour {dialect}")
+    if retention_days is None:
+        retention_days = settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    expired = tombstones.c.deleted_at < (now or datetime.utcnow()) - timedelta(days=retention_days)
+    # Le WHERE lève aussi l'ambiguïté INSERT ... SELECT ... ON CONFLICT de SQLite
+    conn.execute(_raise_horizon(
+        dialect, versions, [versions.c.owner_id, versions.c.collection], ["owner_id", "collection", "version"],
+        select(tombstones.c.owner_id, literal(HORIZON), func.max(tombstones.c.revision))
+        .where(expired, tombstones.c.owner_id.isnot(None))
+        .group_by(tombstones.c.owner_id)
+    ))
+    conn.execute(_raise_horizon(
+        dialect, catalogs, [catalogs.c.name], ["name", "version"],
+        select(literal(TAGS_HORIZON), func.max(tombstones.c.revision))
+        .where(expired, tombstones.c.owner_id.is_(None))
+        .group_by(tombstones.c.owner_id)
+    ))
+    return conn.execute(delete(tombstones).where(expired)).rowcount
+
+def _window(column, since: int, until: int):
+    return (column > since) & (column <= until)
+
+def todos_changes_query(user_id: int, since: int, until: int):
+    return select(*TODO_COLUMNS)\
+        .where(models.Todo.owner_id == user_id)\
+        .where(_window(models.Todo.revision, since, until))\
+        .order_by(models.Todo.revision, models.Todo.id)
+
+def recurring_changes_query(user_id: int, since: int, until: int):
+    # Actives et désactivées : ces dernières sont renvoyées comme supprimées
+    return select(*RECURRING_COLUMNS)\
+        .where(models.RecurringTodo.owner_id == user_id)\
+        .where(_window(models.RecurringTodo.revision, since, until))\
+        .order_by(models.RecurringTodo.revision, models.RecurringTodo.id)
+
+def tags_changes_query(since: int, until: int):
+    return select(models.Tag.id, models.Tag.name, models.Tag.color)\
+        .where(_window(models.Tag.revision, since, until))\
+        .order_by(models.Tag.revision, models.Tag.id)
+
+def tombstones_query(user_id: int, since: Tuple[int, int], until: Tuple[int, int]):
+    owned = (tombstones.c.owner_id == user_id) & _window(tombstones.c.revision, since[0], until[0])
+    shared = tombstones.c.owner_id.is_(None) & _window(tombstones.c.revision, since[1], until[1])
+    return select(tombstones.c.entity, tombstones.c.entity_id)\
+        .where(owned | shared)\
+        .order_by(tombstones.c.revision, tombstones.c.entity_id)
+
+def build_changes(token: str, todos: List[dict], recurring: List[dict], tags, deleted_rows) -> dict:
+    deleted = {TODOS: [], RECURRING: [], TAGS: []}
+    for entity, entity_id in deleted_rows:
+        deleted[entity].append(entity_id)
+    deleted[RECURRING] = [item["id"] for item in recurring if not item["active"]]
+    return {
+        "token": token,
+        "todos": todos,
+        "recurring": [item for item in recurring if item["active"]],
+        "tags": [row._asdict() for row in tags],
+        "deleted": deleted,
+    }
+
+def get_changes(db, user_id: int, since: Optional[str] = None) -> dict:
+    start = parse_token(since) if since is not None else None
+    bounds = tuple(db.execute(bounds_query(user_id)).one())
+    current, horizon = bounds[:2], bounds[2:]
+    token = make_token(current)
+    if start is None:
+        return build_changes(token, [], [], [], [])
+    _check_since(start, current, horizon)
+    return build_changes(
+        token,
+        fetch_items(db, todos_changes_query(user_id, start[0], current[0]), models.todo_tags, "todo_id"),
+        fetch_items(
+            db, recurring_changes_query(user_id, start[0], current[0]),
+            models.recurring_todo_tags, "recurring_todo_id"
+        ),
+        db.execute(tags_changes_query(start[1], current[1])).all(),
+        db.execute(tombstones_query(user_id, start, current)).all()
+    )
+
+if __name__ == "__main__":
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Flux de synchronisation")
+    parser.add_argument("--prune", action="store_true", help="purger les suppressions expirées")
+    parser.add_argument("--retention-days", type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args()
+    if not args.prune:
+        parser.error("aucune action (--prune)")
+
+    with engine.begin() as conn:
+        pruned = prune_tombstones(conn, retention_days=args.retention_days)
+    print(f"{pruned} suppressions purgées (plus de {args.retention_days} jours)")
\ No newline at end of file
@@ -0,0 +1,148 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.db.replicas import REPLICA_KEY
+from app.models import models
+from app.services.dialects import INSERTS
+
+# Catalogue des tags en mémoire, par worker. Une ligne de catalog_versions
+# porte la version courante : chaque écriture sur les tags l'incrémente dans
+# sa transaction, et chaque worker la relit (lecture par clé primaire) avant
+# de servir sa copie. Le catalogue sert la liste GET /tags (ETag) et la
+# résolution des identifiants de tags sur les chemins d'écriture.
+#
+# Une copie par base (primaire, chaque réplica : clé REPLICA_KEY de
+# Session.info) : une copie chargée depuis un réplica en retard ne sert
+# jamais à valider les tags d'une écriture, faite sur le primaire.
+
+TAGS_CATALOG = "tags"
+
+class TagSnapshot:
+    """État immuable du catalogue pour une version donnée"""
+
+    def __init__(self, version: int, tags: Dict[int, dict]):
+        self.version = version
+        self.tags = tags
+        self.etag = make_etag(TAGS_CATALOG, version)
+
+    def list(self) -> List[dict]:
+        return list(self.tags.values())
+
+    def known_ids(self, tag_ids: Iterable[int]) -> List[int]:
+        return [tag_id for tag_id in dict.fromkeys(tag_ids) if tag_id in self.tags]
+
+    def detached(self, tag_ids: Iterable[int]) -> List[models.Tag]:
+        """Instances Tag détachées, à rattacher par Session.merge(..., load=False) sans requête"""
+        tags = []
+        for tag_id in self.known_ids(tag_ids):
+            tag = models.Tag(**self.tags[tag_id])
+            make_transient_to_detached(tag)
+            tags.append(tag)
+        return tags
+
+class TagCatalog:
+    def __init__(self, check_interval: float = 0):
+        # Délai pendant lequel la copie locale est servie sans relire la version
+        self.check_interval = check_interval
+        self.hits = 0
+        self.reloads = 0
+        # Base (None : primaire, indice du réplica) -> (copie, relue à)
+        self._snapshots: Dict[Optional[int], Tuple[TagSnapshot, float]] = {}
+        self._lock = threading.Lock()
+
+    def _recent(self, source: Optional[int]) -> Optional[TagSnapshot]:
+        entry = self._snapshots.get(source)
+        if entry is not None and time.monotonic() - entry[1] < self.check_interval:
+            self.hits += 1
+            return entry[0]
+        return None
+
+    def _accept(self, source: Optional[int], version: int) -> Optional[TagSnapshot]:
+        with self._lock:
+            entry = self._snapshots.get(source)
+            if entry is not None and entry[0].version == version:
+                self._snapshots[source] = (entry[0], time.monotonic())
+                self.hits += 1
+                return entry[0]
+        return None
+
+    def _store(self, source: Optional[int], version: int, rows) -> TagSnapshot:
+        snapshot = TagSnapshot(
+            version,
+            {row.id: {"id": row.id, "name": row.name, "color": row.color} for row in rows}
+        )
+        with self._lock:
+            self._snapshots[source] = (snapshot, time.monotonic())
+            self.reloads += 1
+        return snapshot
+
+    def get(self, db) -> TagSnapshot:
+        source = db.info.get(REPLICA_KEY)
+        snapshot = self._recent(source)
+        if snapshot is not None:
+            return snapshot
+        version = db.scalar(_version_query()) or 0
+        return self._accept(source, version) or self._store(
+            source, version, db.execute(_tags_query())
+        )
+
+    def cached(self, db, tag_ids: Iterable[int]) -> TagSnapshot:
+        """Copie locale sans relire la version si elle connaît déjà tag_ids
+
+        Pour des tags que l'écriture ne modifie pas (réponse d'un PATCH sans
+        tag_ids) : un renommage par un autre worker peut n'y apparaître
+        qu'à la lecture suivante.
+        """
+        entry = self._snapshots.get(db.info.get(REPLICA_KEY))
+        if entry is not None and all(tag_id in entry[0].tags for tag_id in tag_ids):
+            self.hits += 1
+            return entry[0]
+        return self.get(db)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> dict:
+        entry = self._snapshots.get(None)
+        snapshot = entry[0] if entry else None
+        return {
+            "version": snapshot.version if snapshot else None,
+            "size": len(snapshot.tags) if snapshot else 0,
+            "replica_copies": len(self._snapshots) - (entry is not None),
+            "hits": self.hits,
+            "reloads": self.reloads,
+            "check_interval_seconds": self.check_interval,
+        }
+
+def _version_query():
+    return select(models.CatalogVersion.version)\
+        .where(models.CatalogVersion.name == TAGS_CATALOG)
+
+def _tags_query():
+    return select(models.Tag.id, models.Tag.name, models.Tag.color).order_by(models.Tag.id)
+
+def _bump_statement(dialect: str):
+    """Upsert de la version : la ligne absente est créée à 1, sans course entre écrivains"""
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Catalogue des tags non géré pour {dialect}")
+    catalog = models.CatalogVersion.__table__
+    statement = INSERTS[dialect](catalog).values(name=TAGS_CATALOG, version=1)
+    return statement.on_conflict_do_update(
+        index_elements=[catalog.c.name],
+        set_={"version": catalog.c.version + 1}
+    ).returning(catalog.c.version)
+
+def bump_version(db) -> int:
+    """Incrémenter la version dans la transaction de l'écriture (à valider par l'appelant)
+
+    Renvoie la nouvelle version, qui sert aussi de révision aux tags écrits
+    (cf. app.services.sync) : à appeler avant ces écritures.
+    """
+    return db.execute(_bump_statement(db.get_bind().dialect.name)).scalar_one()
+
+tag_catalog = TagCatalog(check_interval=settings.TAG_CATALOG_CHECK_INTERVAL_SECONDS)
\ No newline at end of file
@@ -0,0 +1,103 @@
+import zlib
+from typing import Iterable, Sequence
+from sqlalchemy import func, literal, select
+from app.core.etag import make_etag
+from app.models import models
+from app.services.dialects import INSERTS
+from app.services.tag_catalog import TAGS_CATALOG
+
+# Versions des collections par utilisateur : chaque écriture sur ses tâches
+# ou ses tâches récurrentes incrémente la version correspondante dans la
+# même transaction (upsert). Les listes exposent un ETag construit à partir
+# de cette version et de celle du catalogue des tags (les tags sont inclus
+# dans les réponses) : un If-None-Match identique reçoit un 304 sans que la
+# requête de liste soit exécutée.
+#
+# Chaque écriture incrémente aussi la version "sync" de l'utilisateur : c'est
+# la révision portée par les lignes écrites, lue par le flux de
+# synchronisation (app.services.sync). Le verrou pris par l'upsert ordonne
+# les transactions d'un même utilisateur : il faut incrémenter avant
+# d'écrire, pour qu'une révision validée ne soit jamais suivie d'une
+# révision inférieure.
+
+TODOS = "todos"
+RECURRING = "recurring"
+SYNC = "sync"
+
+versions = models.CollectionVersion.__table__
+
+def _upsert(dialect: str, rows):
+    """INSERT ... ON CONFLICT DO UPDATE version + 1 (rows : liste de valeurs ou SELECT)"""
+    if dialect not in INSERTS:
+        raise NotImplementedError(f"Versions de collections non gérées pour {dialect}")
+    statement = INSERTS[dialect](versions)
+    if isinstance(rows, list):
+        statement = statement.values(rows)
+    else:
+        statement = statement.from_select(["owner_id", "collection", "version"], rows)
+    return statement.on_conflict_do_update(
+        index_elements=[versions.c.owner_id, versions.c.collection],
+        set_={"version": versions.c.version + 1}
+    )
+
+def _rows(owner_id: int, collections: Sequence[str]):
+    return [
+        {"owner_id": owner_id, "collection": collection, "version": 1}
+        for collection in (*collections, SYNC)
+    ]
+
+def _bump_statement(dialect: str, owner_id: int, collections: Sequence[str]):
+    return _upsert(dialect, _rows(owner_id, collections))\
+        .returning(versions.c.collection, versions.c.version)
+
+def _sync_revision(rows) -> int:
+    return dict(rows.all())[SYNC]
+
+def bump_collections(db, owner_id: int, *collections: str) -> int:
+    """Incrémenter les versions dans la transaction de l'écriture, avant celle-ci
+
+    Renvoie la révision de synchronisation à porter par les lignes écrites.
+    """
+    return _sync_revision(db.execute(_bump_statement(db.get_bind().dialect.name, owner_id, collections)))
+
+def sync_revision_of(owner_id):
+    """Révision courante du propriétaire (sous-requête corrélée, écritures groupées)"""
+    return select(versions.c.version)\
+        .where(versions.c.owner_id == owner_id)\
+        .where(versions.c.collection == SYNC)\
+        .scalar_subquery()
+
+def bump_collections_for(conn, owner_ids, collections: Iterable[str]) -> None:
+    """Écriture groupée (planificateur) : owner_ids est un SELECT de la colonne owner_id
+
+    Inclut la révision de synchronisation, que les lignes écrites ensuite
+    lisent par sync_revision_of.
+    """
+    owners = owner_ids.distinct().subquery()
+    for collection in (*collections, SYNC):
+        # Le WHERE lève l'ambiguïté INSERT ... SELECT ... ON CONFLICT de SQLite
+        conn.execute(_upsert(
+            conn.dialect.name,
+            select(owners.c.owner_id, literal(collection), literal(1))
+            .where(owners.c.owner_id.isnot(None))
+        ))
+
+def _etag_query(owner_id: int, collection: str):
+    collection_version = select(versions.c.version)\
+        .where(versions.c.owner_id == owner_id)\
+        .where(versions.c.collection == collection)\
+        .scalar_subquery()
+    tags_version = select(models.CatalogVersion.version)\
+        .where(models.CatalogVersion.name == TAGS_CATALOG)\
+        .scalar_subquery()
+    # Une seule requête, sans FROM : deux lectures par clé primaire
+    return select(func.coalesce(collection_version, 0), func.coalesce(tags_version, 0))
+
+def _etag(collection: str, owner_id: int, versions_row, variant: str) -> str:
+    version, tags_version = versions_row
+    # variant : paramètres de la requête (pages différentes, ETag différents)
+    return make_etag(collection, owner_id, version, tags_version, format(zlib.crc32(variant.encode()), "x"))
+
+def collection_etag(db, owner_id: int, collection: str, variant: str = "") -> str:
+    row = db.execute(_etag_query(owner_id, collection)).one()
+    return _etag(collection, owner_id, row, variant)
\ No newline at end of file
@@ -1,20 +1,39 @@
+import itertools
+import os
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.core.test_config import test_settings
+
+# L'application lit DATABASE_URL à l'import ; le schéma est créé par la fixture db
+os.environ.setdefault("DATABASE_URL", test_settings.DATABASE_URL)
+os.environ.setdefault("DB_SCHEMA_SETUP", "none")
+# Hachage au coût minimal : les tests inscrivent un utilisateur chacun
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from app.core.metrics import instrument_engine
 from app.db.base_class import Base
+from app.db.session import create_async_db_engine, create_db_engine, get_async_database_url
 from app.main import app
-from app.api.dependencies import get_db
+from app.services.search import ensure_search_schema
+from app.api.dependencies import get_db, get_async_db
 from fastapi.testclient import TestClient
 
-# Créer le moteur de base de données de test
-engine = create_engine(test_settings.DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Créer les moteurs de base de données de test (sync et aiosqlite)
+engine = create_db_engine(test_settings.DATABASE_URL)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+async_engine = create_async_db_engine(get_async_database_url(test_settings.DATABASE_URL))
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+# Instrumentés comme les moteurs de l'application (Server-Timing, /metrics)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
 @pytest.fixture(scope="session")
 def db():
     # Créer la base de données de test
     Base.metadata.create_all(bind=engine)
+    ensure_search_schema(engine)
     
     # Créer une session de test
     session = TestingSessionLocal()
@@ -33,8 +52,42 @@ def client(db):
             yield db
         finally:
             db.close()
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
-        yield test_client 
\ No newline at end of file
+        yield test_client
+
+@pytest.fixture
+def query_counter():
+    """Compte les requêtes SQL émises, ex. assert len(query_counter) <= 3"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [engine, async_engine.sync_engine]
+    for db_engine in engines:
+        event.listen(db_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for db_engine in engines:
+            event.remove(db_engine, "before_cursor_execute", before_cursor_execute)
+
+_user_numbers = itertools.count(1)
+
+@pytest.fixture
+def new_user(client):
+    """Inscrit un nouvel utilisateur et renvoie ses en-têtes d'authentification"""
+    def create() -> dict:
+        email = f"user{next(_user_numbers)}@example.com"
+        client.post("/api/v1/register", json={"email": email, "password": "secret"})
+        response = client.post("/api/v1/login", data={"username": email, "password": "secret"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return create
\ No newline at end of file
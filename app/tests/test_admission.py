@@ -0,0 +1,96 @@
+import asyncio
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from app.core.admission import AdmissionController, AdmissionMiddleware
+
+def _run(scenario):
+    """Application minimale sous AdmissionMiddleware (todos et tags : une place, file d'une requête)"""
+    async def run():
+        controller = AdmissionController({"todos": 1, "tags": 1}, queue_size=1, timeout=0.05, prefix="/api/v1")
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return PlainTextResponse("ok")
+
+        async def fast(request):
+            return PlainTextResponse("ok")
+
+        async def boom(request):
+            raise RuntimeError("échec de la route")
+
+        app = Starlette(
+            routes=[
+                Route("/api/v1/todos/slow", slow),
+                Route("/api/v1/todos/boom", boom),
+                Route("/api/v1/todos/", fast),
+                Route("/api/v1/tags/", fast),
+                Route("/api/v1/events/", fast),
+                Route("/health", fast),
+            ],
+            middleware=[Middleware(AdmissionMiddleware, controller=controller, retry_after=3)],
+        )
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await scenario(http, controller, release)
+    return asyncio.run(run())
+
+def _idle(controller) -> bool:
+    return all(limit.active == 0 and not limit.stats()["waiting"] for limit in controller.limits.values())
+
+def test_saturated_group_gets_503_with_retry_after():
+    async def scenario(http, controller, release):
+        held = asyncio.ensure_future(http.get("/api/v1/todos/slow"))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(http.get("/api/v1/todos/"))
+        await asyncio.sleep(0.01)
+        rejected = await http.get("/api/v1/todos/")
+        expired = await queued
+        release.set()
+        return rejected, expired, await held, controller
+
+    rejected, expired, held, controller = _run(scenario)
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "3"
+    assert rejected.json()["reason"] == "queue_full"
+    assert expired.status_code == 503
+    assert expired.json()["reason"] == "deadline"
+    assert held.status_code == 200
+    assert _idle(controller)
+
+def test_other_groups_and_ungrouped_routes_are_not_shed():
+    async def scenario(http, controller, release):
+        held = asyncio.ensure_future(http.get("/api/v1/todos/slow"))
+        await asyncio.sleep(0.01)
+        assert controller.limits["todos"].active == 1
+        responses = [await http.get(path) for path in ("/api/v1/tags/", "/health", "/api/v1/events/")]
+        release.set()
+        await held
+        return responses
+
+    assert [response.status_code for response in _run(scenario)] == [200, 200, 200]
+
+def test_counters_return_to_zero_after_exceptions():
+    async def scenario(http, controller, release):
+        failed = [await http.get("/api/v1/todos/boom") for _ in range(3)]
+        idle_after_errors = _idle(controller)
+        # Requête en file annulée (client parti) : sa place n'est pas perdue
+        held = asyncio.ensure_future(http.get("/api/v1/todos/slow"))
+        await asyncio.sleep(0.01)
+        abandoned = asyncio.ensure_future(http.get("/api/v1/todos/"))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        release.set()
+        await held
+        after = await http.get("/api/v1/todos/")
+        return failed, idle_after_errors, after, controller
+
+    failed, idle_after_errors, after, controller = _run(scenario)
+    assert [response.status_code for response in failed] == [500, 500, 500]
+    assert idle_after_errors
+    assert after.status_code == 200
+    assert _idle(controller)
+    assert controller.limits["todos"].stats()["admitted"] == 5
\ No newline at end of file
@@ -0,0 +1,83 @@
+import time
+from datetime import timedelta
+import pytest
+from sqlalchemy import event
+from app.core.cache import PrincipalCache, principal_cache
+from app.core.security import create_access_token
+from app.db import session as db_session
+
+@pytest.fixture
+def app_statements():
+    """Requêtes émises par les moteurs de l'application (recherche de l'utilisateur)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [db_session.engine]
+    if db_session.async_engine is not None:
+        engines.append(db_session.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def _token(headers: dict) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+def test_second_request_is_a_hit_without_queries(client, new_user, query_counter, app_statements):
+    headers = new_user()
+    before = principal_cache.stats()
+
+    assert client.get("/api/v1/me", headers=headers).status_code == 200
+    missed = principal_cache.stats()
+    assert (missed["misses"] - before["misses"], missed["hits"] - before["hits"]) == (1, 0)
+    assert len(app_statements) == 1
+
+    app_statements.clear()
+    query_counter.clear()
+    assert client.get("/api/v1/me", headers=headers).status_code == 200
+    hit = principal_cache.stats()
+    assert (hit["misses"] - missed["misses"], hit["hits"] - missed["hits"]) == (0, 1)
+    # Ni session ouverte ni requête sur un succès du cache
+    assert app_statements == [] and query_counter == []
+
+def test_ttl_is_bounded_by_token_expiry(client, new_user):
+    email = client.get("/api/v1/me", headers=new_user()).json()["email"]
+    token = create_access_token({"sub": email}, expires_delta=timedelta(seconds=30))
+    assert client.get("/api/v1/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    expires_at, _ = principal_cache._data[token]
+    assert expires_at - time.monotonic() <= 30
+    assert principal_cache.ttl > 30
+
+def test_expired_entries_are_not_kept():
+    cache = PrincipalCache(max_size=4, ttl=60)
+    cache.set("expiré", ({"sub": "a@example.com"}, None), ttl=-1)
+    cache.set("court", ({"sub": "a@example.com"}, None), ttl=0.01)
+    assert cache.stats()["size"] == 1
+    time.sleep(0.02)
+    assert cache.get("court") is None
+
+def test_subject_invalidation_drops_every_token():
+    cache = PrincipalCache(max_size=4, ttl=60)
+    cache.set("a1", ({"sub": "a@example.com"}, 1))
+    cache.set("a2", ({"sub": "a@example.com"}, 1))
+    cache.set("b1", ({"sub": "b@example.com"}, 2))
+    cache.invalidate_subject("a@example.com")
+    assert cache.get("a1") is None and cache.get("a2") is None
+    assert cache.get("b1") == ({"sub": "b@example.com"}, 2)
+
+def test_deactivation_rejects_cached_token(client, new_user):
+    headers = new_user()
+    assert client.get("/api/v1/me", headers=headers).status_code == 200
+    assert principal_cache._data.get(_token(headers)) is not None
+
+    assert client.delete("/api/v1/me", headers=headers).status_code == 204
+    assert _token(headers) not in principal_cache._data
+    response = client.get("/api/v1/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Utilisateur inactif"
\ No newline at end of file
@@ -0,0 +1,103 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services.stats import counters, grouped_counts
+
+def _bulk(client, headers, operations: list):
+    response = client.post("/api/v1/todos/bulk", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["results"]
+
+def _todo(client, headers, **fields) -> dict:
+    return client.post("/api/v1/todos/", json={"title": "existante", **fields}, headers=headers).json()
+
+def test_mixed_valid_and_invalid_operations(client, new_user):
+    headers, other = new_user(), new_user()
+    kept, removed = _todo(client, headers), _todo(client, headers)
+    foreign = _todo(client, other, title="à un autre")
+
+    results = _bulk(client, headers, [
+        {"op": "create", "todo": {"title": "créée", "priority": 2}},
+        {"op": "update", "id": kept["id"], "changes": {"completed": True}},
+        {"op": "update", "id": foreign["id"], "changes": {"title": "volée"}},
+        {"op": "update", "id": 10 ** 9, "changes": {"completed": True}},
+        {"op": "delete", "id": foreign["id"]},
+        {"op": "delete", "id": removed["id"]},
+        {"op": "delete", "id": removed["id"]},
+        {"op": "update", "id": kept["id"]},
+    ])
+    assert [(result["index"], result["status"]) for result in results] == [
+        (0, 201), (1, 200), (2, 404), (3, 404), (4, 404), (5, 204), (6, 404), (7, 422)
+    ]
+    # Tâche d'un autre utilisateur : « non trouvée », comme une tâche absente
+    assert results[2]["detail"] == results[3]["detail"] == results[4]["detail"] == "Todo non trouvé"
+
+    listed = {item["id"]: item for item in client.get("/api/v1/todos/", headers=headers).json()}
+    assert set(listed) == {kept["id"], results[0]["id"]}
+    assert listed[kept["id"]]["completed"] is True
+    assert client.get(f"/api/v1/todos/{foreign['id']}", headers=other).json()["title"] == "à un autre"
+
+def test_bulk_updates_counters(client, new_user, db):
+    headers = new_user()
+    user_id = client.get("/api/v1/me", headers=headers).json()["id"]
+    tag = client.post("/api/v1/tags/", json={"name": f"groupé {user_id}", "color": "#000"}, headers=headers).json()["id"]
+    first, second = _todo(client, headers, priority=1), _todo(client, headers, priority=3, tag_ids=[tag])
+
+    _bulk(client, headers, [
+        {"op": "create", "todo": {"title": "a", "completed": True, "priority": 2, "tag_ids": [tag]}},
+        {"op": "create", "todo": {"title": "b", "tag_ids": [tag, 10 ** 9]}},
+        {"op": "update", "id": first["id"], "changes": {"completed": True, "priority": 3, "tag_ids": [tag]}},
+        {"op": "delete", "id": second["id"]},
+    ])
+
+    stats = client.get("/api/v1/todos/stats", headers=headers).json()
+    assert (stats["total"], stats["completed"]) == (3, 2)
+    assert stats["by_priority"] == {"1": 1, "2": 1, "3": 1}
+    assert stats["by_tag"] == {str(tag): 3}
+    with Session(bind=db.get_bind()) as session:
+        stored = {
+            name: value for name, value in session.execute(
+                select(counters.c.name, counters.c.value).where(counters.c.owner_id == user_id)
+            ) if value
+        }
+        grouped = {
+            name: value
+            for query in grouped_counts(models.Todo.owner_id == user_id)
+            for _, name, value in session.execute(query)
+        }
+    assert stored == grouped
+
+def test_bulk_deletes_leave_tombstones(client, new_user):
+    headers, other = new_user(), new_user()
+    removed, kept = _todo(client, headers), _todo(client, headers)
+    foreign = _todo(client, other)
+    token = client.get("/api/v1/sync/changes", headers=headers).json()["token"]
+    other_token = client.get("/api/v1/sync/changes", headers=other).json()["token"]
+
+    results = _bulk(client, headers, [
+        {"op": "delete", "id": removed["id"]},
+        {"op": "delete", "id": foreign["id"]},
+        {"op": "update", "id": kept["id"], "changes": {"title": "modifiée"}},
+    ])
+    assert [result["status"] for result in results] == [204, 404, 200]
+
+    changes = client.get("/api/v1/sync/changes", params={"since": token}, headers=headers).json()
+    assert changes["deleted"]["todos"] == [removed["id"]]
+    assert [item["id"] for item in changes["todos"]] == [kept["id"]]
+    other_changes = client.get("/api/v1/sync/changes", params={"since": other_token}, headers=other).json()
+    assert other_changes["deleted"]["todos"] == []
+    assert other_changes["token"] == other_token
+
+def test_bulk_without_owned_targets_changes_nothing(client, new_user):
+    headers, other = new_user(), new_user()
+    foreign = _todo(client, other)
+    _todo(client, headers)
+    etag = client.get("/api/v1/todos/", headers=headers).headers["ETag"]
+
+    results = _bulk(client, headers, [
+        {"op": "update", "id": foreign["id"], "changes": {"completed": True}},
+        {"op": "delete", "id": foreign["id"]},
+    ])
+    assert [result["status"] for result in results] == [404, 404]
+    # Aucune écriture : ni révision ni ETag nouveaux
+    assert client.get("/api/v1/todos/", headers={**headers, "If-None-Match": etag}).status_code == 304
\ No newline at end of file
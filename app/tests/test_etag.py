@@ -0,0 +1,62 @@
+import itertools
+import pytest
+
+_tag_numbers = itertools.count(1)
+
+WRITES = {
+    "/api/v1/todos/": ("/api/v1/todos/", {"title": "écrite"}),
+    "/api/v1/recurring/": ("/api/v1/recurring/", {"title": "série", "frequency": "daily"}),
+}
+
+def _etag(client, headers, url: str) -> str:
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+@pytest.mark.parametrize("url", list(WRITES))
+def test_repeated_get_is_not_modified(client, new_user, query_counter, url):
+    headers = new_user()
+    client.post(WRITES[url][0], json=WRITES[url][1], headers=headers)
+    etag = _etag(client, headers, url)
+
+    query_counter.clear()
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    # Versions seules : la requête de liste n'est pas exécutée
+    assert len(query_counter) == 1
+
+    # Autre page : autre représentation
+    assert client.get(f"{url}?limit=1", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+@pytest.mark.parametrize("url", list(WRITES))
+def test_own_write_changes_etag(client, new_user, url):
+    headers = new_user()
+    before = _etag(client, headers, url)
+
+    created = client.post(WRITES[url][0], json=WRITES[url][1], headers=headers).json()
+    after_create = _etag(client, headers, url)
+    assert after_create != before
+
+    client.delete(f"{url}{created['id']}", headers=headers)
+    assert _etag(client, headers, url) != after_create
+
+def test_tag_write_changes_list_etags(client, new_user):
+    headers = new_user()
+    before = {url: _etag(client, headers, url) for url in WRITES}
+    client.post("/api/v1/tags/", json={"name": f"etag {next(_tag_numbers)}", "color": "#000"}, headers=headers)
+    # Les tags sont inclus dans les listes
+    assert all(_etag(client, headers, url) != etag for url, etag in before.items())
+
+@pytest.mark.parametrize("url", list(WRITES))
+def test_other_users_write_keeps_etag(client, new_user, url):
+    headers, other = new_user(), new_user()
+    client.post(WRITES[url][0], json=WRITES[url][1], headers=headers)
+    etag = _etag(client, headers, url)
+
+    created = client.post(WRITES[url][0], json=WRITES[url][1], headers=other).json()
+    client.delete(f"{url}{created['id']}", headers=other)
+
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
\ No newline at end of file
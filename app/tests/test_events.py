@@ -0,0 +1,100 @@
+import asyncio
+import json
+import pytest
+from app.core.config import settings
+from app.core.events import (
+    CREATED, DELETED, UPDATED, InMemoryEventBroker, Subscriber, TooManySubscribers, event_broker, event_stream
+)
+from app.services.versions import TODOS
+
+def _user_id(client, headers) -> int:
+    return client.get("/api/v1/me", headers=headers).json()["id"]
+
+def _events(chunk: bytes) -> list:
+    """(nom, données) des événements SSE d'un envoi"""
+    events = []
+    for block in chunk.decode().strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_write_events_reach_only_the_owner(client, new_user):
+    owner, other = new_user(), new_user()
+    owner_id, other_id = _user_id(client, owner), _user_id(client, other)
+    # Abonnements et lectures dans la boucle de l'application
+    owner_sub, other_sub = client.portal.call(
+        lambda: (event_broker.subscribe(owner_id), event_broker.subscribe(other_id))
+    )
+    try:
+        todo = client.post("/api/v1/todos/", json={"title": "publiée"}, headers=owner).json()
+        client.patch(f"/api/v1/todos/{todo['id']}", json={"completed": True}, headers=owner)
+        removed = client.post("/api/v1/todos/", json={"title": "éphémère"}, headers=owner).json()
+        client.delete(f"/api/v1/todos/{removed['id']}", headers=owner)
+
+        # Publications des routes synchrones : call_soon_threadsafe, déjà exécutées ensuite
+        pending = client.portal.call(lambda: dict(owner_sub.pending))
+        assert list(pending) == [(TODOS, todo["id"])]
+        assert pending[(TODOS, todo["id"])]["op"] == CREATED
+        assert client.portal.call(lambda: dict(other_sub.pending)) == {}
+    finally:
+        client.portal.call(lambda: (event_broker.unsubscribe(owner_sub), event_broker.unsubscribe(other_sub)))
+
+def test_burst_is_coalesced_into_one_send():
+    async def scenario():
+        broker = InMemoryEventBroker(queue_size=8, heartbeat=0, max_subscribers=10, max_per_user=2)
+        await broker.start()
+        stream = event_stream(broker, 1, coalesce=0.05, retry_ms=1000)
+        assert (await stream.__anext__()).startswith(b"retry: 1000")
+        next_send = asyncio.ensure_future(stream.__anext__())
+        for op, item_id, revision in [
+            (CREATED, 1, 1), (UPDATED, 1, 2), (UPDATED, 2, 3), (CREATED, 3, 4), (DELETED, 3, 5)
+        ]:
+            broker.publish(1, TODOS, op, [item_id], revision)
+            await asyncio.sleep(0.005)
+        broker.publish(2, TODOS, CREATED, [4], 1)
+        chunk = await next_send
+        await stream.aclose()
+        await broker.stop()
+        return chunk, broker.stats()
+
+    chunk, stats = asyncio.run(scenario())
+    assert _events(chunk) == [
+        ("todos.created", {"entity": TODOS, "op": CREATED, "id": 1, "revision": 2}),
+        ("todos.updated", {"entity": TODOS, "op": UPDATED, "id": 2, "revision": 3}),
+    ]
+    assert stats["subscribers"] == 0
+
+def test_slow_subscriber_gets_resync_instead_of_growing():
+    subscriber = Subscriber(1, max_pending=3)
+    for item_id in range(10):
+        subscriber.push({"entity": TODOS, "op": UPDATED, "id": item_id, "revision": item_id})
+        assert len(subscriber.pending) <= 3
+
+    assert subscriber.drain() == b"event: resync\ndata: {}\n\n"
+    subscriber.push({"entity": TODOS, "op": UPDATED, "id": 42, "revision": 11})
+    assert [name for name, _ in _events(subscriber.drain())] == ["todos.updated"]
+
+def test_subscriptions_are_limited_per_user():
+    broker = InMemoryEventBroker(queue_size=8, heartbeat=0, max_subscribers=10, max_per_user=2)
+    first, second = broker.subscribe(1), broker.subscribe(1)
+    with pytest.raises(TooManySubscribers):
+        broker.subscribe(1)
+    broker.subscribe(2)
+
+    broker.unsubscribe(first)
+    broker.subscribe(1)
+    assert broker.stats()["subscribers"] == 3
+    assert broker.user_full(1) and not broker.user_full(2)
+
+def test_stream_route_rejects_user_over_limit(client, new_user):
+    headers = new_user()
+    user_id = _user_id(client, headers)
+    subscribers = client.portal.call(
+        lambda: [event_broker.subscribe(user_id) for _ in range(settings.EVENTS_MAX_SUBSCRIBERS_PER_USER)]
+    )
+    try:
+        response = client.get("/api/v1/events/", headers=headers)
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+    finally:
+        client.portal.call(lambda: [event_broker.unsubscribe(subscriber) for subscriber in subscribers])
\ No newline at end of file
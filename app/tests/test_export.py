@@ -0,0 +1,115 @@
+import csv
+import io
+import itertools
+import json
+import zlib
+import pytest
+from app.core.config import settings
+from app.services.export import COLUMNS, CSV_TAG_SEPARATOR
+
+_tag_numbers = itertools.count(1)
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    # Lots de 2 lignes : les tags d'une même tâche sont répartis sur plusieurs lots
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+def _populate(client, headers) -> list:
+    tags = [
+        client.post("/api/v1/tags/", json={"name": f"export {next(_tag_numbers)}", "color": "#000"}, headers=headers).json()["id"]
+        for _ in range(3)
+    ]
+    todos = [
+        {"title": "trois tags", "tag_ids": tags, "priority": 3},
+        {"title": "sans tag", "description": "avec « guillemets », virgule ; et\nretour", "completed": True},
+        {"title": "échéance", "due_date": "2030-05-01T08:30:00", "tag_ids": tags[1:]},
+        {"title": "dernière", "tag_ids": [tags[0]], "completed": True, "priority": 2},
+    ]
+    for todo in todos:
+        assert client.post("/api/v1/todos/", json=todo, headers=headers).status_code == 201
+    return tags
+
+def _expected(client, headers) -> list:
+    """Tâches de GET /todos, dans la forme de l'export"""
+    return [
+        {
+            **{column: item[column] for column in COLUMNS if column != "tags"},
+            "tags": sorted(tag["name"] for tag in item["tags"]),
+        }
+        for item in client.get("/api/v1/todos/", headers=headers).json()
+    ]
+
+def _export(client, headers, **params):
+    response = client.get("/api/v1/todos/export", params=params, headers=headers)
+    assert response.status_code == 200
+    return response
+
+def _ndjson(body: bytes) -> list:
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+def _csv(body: bytes) -> list:
+    rows = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+    return [
+        {
+            **row,
+            "id": int(row["id"]),
+            "description": row["description"] or None,
+            "completed": row["completed"] == "True",
+            "priority": int(row["priority"]),
+            "due_date": row["due_date"] or None,
+            "recurring_todo_id": int(row["recurring_todo_id"]) if row["recurring_todo_id"] else None,
+            "tags": row["tags"].split(CSV_TAG_SEPARATOR) if row["tags"] else [],
+        }
+        for row in rows
+    ]
+
+def test_ndjson_export_matches_list(client, new_user, small_batches):
+    headers = new_user()
+    _populate(client, headers)
+
+    response = _export(client, headers)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert _ndjson(response.content) == _expected(client, headers)
+
+def test_csv_export_matches_list(client, new_user, small_batches):
+    headers = new_user()
+    _populate(client, headers)
+
+    response = _export(client, headers, format="csv")
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.content.decode("utf-8").splitlines()[0] == ",".join(COLUMNS)
+    assert _csv(response.content) == _expected(client, headers)
+
+@pytest.mark.parametrize("export_format, parse", [("ndjson", _ndjson), ("csv", _csv)])
+def test_gzip_export_decompresses_to_the_same_body(client, new_user, small_batches, export_format, parse):
+    headers = new_user()
+    _populate(client, headers)
+
+    plain = _export(client, headers, format=export_format).content
+    compressed = _export(client, headers, format=export_format, gzip=True)
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert compressed.headers["content-disposition"] == f'attachment; filename="todos.{export_format}.gz"'
+    assert zlib.decompress(compressed.content, 31) == plain
+    assert parse(plain) == _expected(client, headers)
+
+def test_filters_select_the_same_todos_as_the_list(client, new_user, small_batches):
+    headers = new_user()
+    tags = _populate(client, headers)
+    expected = _expected(client, headers)
+    by_id = {item["id"]: item for item in expected}
+
+    completed = _ndjson(_export(client, headers, completed=True).content)
+    assert completed == [item for item in expected if item["completed"]]
+
+    tagged = _ndjson(_export(client, headers, tag_id=tags[1]).content)
+    assert [item["id"] for item in tagged] == [item["id"] for item in expected if len(item["tags"]) >= 2]
+    # Filtre sur un tag : la tâche garde tous ses tags
+    assert tagged == [by_id[item["id"]] for item in tagged]
+
+    assert [item["title"] for item in _ndjson(_export(client, headers, due_after="2030-01-01T00:00:00").content)] == ["échéance"]
+    assert _ndjson(_export(client, headers, priority=2).content) == [item for item in expected if item["priority"] == 2]
+
+def test_empty_export(client, new_user):
+    headers = new_user()
+    assert _export(client, headers).content == b""
+    assert _export(client, headers, format="csv").content.decode("utf-8") == ",".join(COLUMNS) + "\n"
\ No newline at end of file
@@ -0,0 +1,75 @@
+import itertools
+import pytest
+from app.core import fast_json
+from app.core.config import settings
+from app.main import app
+
+_tag_numbers = itertools.count(1)
+
+def _populate(client, headers) -> None:
+    tag = client.post("/api/v1/tags/", json={"name": f"rapide {next(_tag_numbers)}", "color": "#abc"}, headers=headers).json()["id"]
+    client.post("/api/v1/todos/", json={"title": "nue"}, headers=headers)
+    client.post("/api/v1/todos/", json={
+        "title": "complète « accentuée »", "description": "détails", "completed": True, "priority": 3,
+        "due_date": "2030-05-01T08:30:00", "tag_ids": [tag],
+    }, headers=headers)
+    client.post("/api/v1/todos/", json={"title": "microsecondes", "due_date": "2030-05-01T08:30:00.000250"}, headers=headers)
+    client.post("/api/v1/recurring/", json={"title": "quotidienne", "frequency": "daily"}, headers=headers)
+    client.post("/api/v1/recurring/", json={
+        "title": "hebdomadaire", "frequency": "weekly", "weekdays": [0, 4], "interval": 2,
+        "ends_at": "2031-01-01T00:00:00", "tag_ids": [tag],
+    }, headers=headers)
+
+def _get(client, headers, url: str, fast: bool, monkeypatch, **params):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+    response = client.get(url, params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    return response
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(fast_json, "orjson", None)
+    elif fast_json.orjson is None:
+        pytest.skip("orjson n'est pas installé")
+    return request.param
+
+@pytest.mark.parametrize("url, params", [
+    ("/api/v1/todos/", {}),
+    ("/api/v1/todos/", {"limit": 2}),
+    ("/api/v1/recurring/", {}),
+    ("/api/v1/recurring/", {"limit": 1}),
+])
+def test_lists_are_identical_with_and_without_fast_json(client, new_user, monkeypatch, encoder, url, params):
+    headers = new_user()
+    _populate(client, headers)
+
+    slow = _get(client, headers, url, False, monkeypatch, **params)
+    fast = _get(client, headers, url, True, monkeypatch, **params)
+    assert fast.json() == slow.json()
+    assert fast.json()  # non vide : dates, tags et valeurs nulles comparés
+    for header in ("ETag", "X-Next-Cursor"):
+        assert fast.headers.get(header) == slow.headers.get(header)
+
+def test_sync_changes_are_identical_with_and_without_fast_json(client, new_user, monkeypatch, encoder):
+    headers = new_user()
+    token = client.get("/api/v1/sync/changes", headers=headers).json()["token"]
+    _populate(client, headers)
+    removed = client.post("/api/v1/todos/", json={"title": "supprimée"}, headers=headers).json()["id"]
+    client.delete(f"/api/v1/todos/{removed}", headers=headers)
+
+    slow = _get(client, headers, "/api/v1/sync/changes", False, monkeypatch, since=token).json()
+    fast = _get(client, headers, "/api/v1/sync/changes", True, monkeypatch, since=token).json()
+    assert fast == slow
+    assert slow["deleted"]["todos"] == [removed]
+
+def test_openapi_schema_does_not_depend_on_fast_json(monkeypatch):
+    schemas = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+        monkeypatch.setattr(app, "openapi_schema", None)
+        schemas.append(app.openapi())
+    assert schemas[0] == schemas[1]
+    responses = schemas[1]["paths"]["/api/v1/todos/"]["get"]["responses"]["200"]["content"]["application/json"]
+    assert responses["schema"]["items"] == {"$ref": "#/components/schemas/Todo"}
\ No newline at end of file
@@ -0,0 +1,84 @@
+import asyncio
+import itertools
+import threading
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+from app.core import hashing
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, password_hasher
+from app.models import models
+
+_user_numbers = itertools.count(1)
+
+def test_tiny_pool_rejects_beyond_capacity(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(password: str) -> str:
+        started.set()
+        release.wait(5)
+        return f"haché:{password}"
+
+    monkeypatch.setattr(hashing, "get_password_hash", slow_hash)
+    hasher = PasswordHasher("thread", max_workers=1, queue_size=0)
+
+    async def scenario():
+        held = asyncio.ensure_future(hasher.hash("premier"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        with pytest.raises(HTTPException) as rejected:
+            await hasher.hash("second")
+        in_flight = hasher.stats()["in_flight"]
+        release.set()
+        return rejected.value, in_flight, await held
+
+    try:
+        rejected, in_flight, held = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert in_flight == 1
+    assert held == "haché:premier"
+    assert hasher.stats()["in_flight"] == 0
+    assert hasher.stats()["rejected"] == 1
+
+def test_saturated_login_returns_503(client, monkeypatch):
+    email = f"sature{next(_user_numbers)}@example.com"
+    client.post("/api/v1/register", json={"email": email, "password": "secret"})
+    rejected = password_hasher.rejected
+    monkeypatch.setattr(password_hasher, "capacity", 0)
+
+    response = client.post("/api/v1/login", data={"username": email, "password": "secret"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert password_hasher.rejected == rejected + 1
+
+def _stored_hash(db, email: str) -> str:
+    with db.get_bind().connect() as conn:
+        return conn.execute(select(models.User.hashed_password).where(models.User.email == email)).scalar_one()
+
+def test_login_rehashes_password_hashed_at_other_rounds(client, db):
+    email = f"rehash{next(_user_numbers)}@example.com"
+    client.post("/api/v1/register", json={"email": email, "password": "secret"})
+    current = _stored_hash(db, email)
+    assert bcrypt.from_string(current).rounds == settings.BCRYPT_ROUNDS
+
+    # Hash ancien, d'un autre coût
+    legacy = bcrypt.using(rounds=settings.BCRYPT_ROUNDS + 1).hash("secret")
+    with db.get_bind().begin() as conn:
+        conn.execute(update(models.User).where(models.User.email == email).values(hashed_password=legacy))
+
+    response = client.post("/api/v1/login", data={"username": email, "password": "secret"})
+    assert response.status_code == 200
+    rehashed = _stored_hash(db, email)
+    assert rehashed != legacy
+    assert bcrypt.from_string(rehashed).rounds == settings.BCRYPT_ROUNDS
+    assert bcrypt.verify("secret", rehashed)
+
+    # Hash à jour : pas de nouvelle écriture
+    assert client.post("/api/v1/login", data={"username": email, "password": "secret"}).status_code == 200
+    assert _stored_hash(db, email) == rehashed
+    # Mauvais mot de passe : refusé, hash inchangé
+    assert client.post("/api/v1/login", data={"username": email, "password": "faux"}).status_code == 401
+    assert _stored_hash(db, email) == rehashed
\ No newline at end of file
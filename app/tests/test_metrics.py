@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import re
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from app.core.metrics import SERVER_TIMING_HEADER, MetricsMiddleware, RequestMetrics
+
+def _timing(response) -> dict:
+    """Mesures de l'en-tête Server-Timing : nom -> {'dur': ..., 'desc': ...}"""
+    metrics = {}
+    for entry in response.headers[SERVER_TIMING_HEADER].split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+def _series(body: str, metric: str, route: str) -> float:
+    pattern = rf'^{metric}{{method="GET",route="{re.escape(route)}",status="200"}} (\S+)$'
+    match = re.search(pattern, body, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+def test_request_reports_its_statements(client, new_user, query_counter):
+    headers = new_user()
+    client.post("/api/v1/todos/", json={"title": "mesurée"}, headers=headers)
+    client.get("/api/v1/todos/", headers=headers)
+    before = client.get("/metrics").text
+
+    query_counter.clear()
+    response = client.get("/api/v1/todos/", headers=headers)
+    timing = _timing(response)
+    assert set(timing) >= {"app", "db", "pool"}
+    assert float(timing["app"]["dur"]) >= float(timing["db"]["dur"]) >= 0
+    # Nombre de requêtes SQL de cette requête HTTP uniquement
+    statements = len(query_counter)
+    assert statements > 0
+    assert timing["db"]["desc"] == f'"{statements} statements"'
+
+    after = client.get("/metrics").text
+    assert "# TYPE http_request_duration_seconds histogram" in after
+    route = "/api/v1/todos/"
+    assert _series(after, "http_request_duration_seconds_count", route) == _series(before, "http_request_duration_seconds_count", route) + 1
+    assert _series(after, "http_request_sql_statements_sum", route) == _series(before, "http_request_sql_statements_sum", route) + statements
+    assert re.search(
+        r'^http_request_pool_wait_seconds_bucket\{method="GET",route="/api/v1/todos/",status="200",le="\+Inf"\} \d+$',
+        after, re.MULTILINE
+    )
+    # Gabarit de route, pas le chemin
+    todo_id = client.post("/api/v1/todos/", json={"title": "détail"}, headers=headers).json()["id"]
+    client.get(f"/api/v1/todos/{todo_id}", headers=headers)
+    assert _series(client.get("/metrics").text, "http_request_duration_seconds_count", "/api/v1/todos/{todo_id}") >= 1
+
+def test_event_streams_are_not_observed(caplog):
+    async def events(request):
+        async def body():
+            yield b"event: ping\ndata: {}\n\n"
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    async def plain(request):
+        return PlainTextResponse("ok")
+
+    metrics = RequestMetrics()
+    app = Starlette(
+        routes=[Route("/events", events), Route("/plain", plain)],
+        middleware=[Middleware(MetricsMiddleware, slow_threshold_ms=0, metrics=metrics)],
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.get("/events"), await http.get("/plain")
+
+    with caplog.at_level(logging.WARNING, logger="api.slow_requests"):
+        stream, plain_response = asyncio.run(scenario())
+    # En-tête posé sur les deux, seules les requêtes ordinaires sont agrégées et journalisées
+    assert SERVER_TIMING_HEADER in stream.headers and SERVER_TIMING_HEADER in plain_response.headers
+    # Starlette seul ne pose pas scope["route"] : gabarit « unmatched » pour les deux routes
+    assert _series(metrics.render(), "http_request_duration_seconds_count", "unmatched") == 1
+    assert [record.getMessage().split(" : ")[0] for record in caplog.records] == ["Requête lente GET unmatched -> 200"]
\ No newline at end of file
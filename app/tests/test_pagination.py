@@ -0,0 +1,67 @@
+import base64
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models import models
+
+COLLECTIONS = {
+    "/api/v1/todos/": (models.Todo, {"title": "paginée"}),
+    "/api/v1/recurring/": (models.RecurringTodo, {"title": "paginée", "frequency": "daily"}),
+}
+
+def _raw_cursor(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _walk(client, headers, url: str, limit: int) -> list:
+    """Identifiants de toutes les pages en suivant X-Next-Cursor"""
+    seen, params = [], {"limit": limit}
+    while True:
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        page = [item["id"] for item in response.json()]
+        assert len(page) <= limit
+        seen += page
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return seen
+        params = {"limit": limit, "cursor": cursor}
+
+@pytest.mark.parametrize("url", list(COLLECTIONS))
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_cursor_chain_covers_every_row_once(client, new_user, db, url, limit):
+    model, payload = COLLECTIONS[url]
+    headers = new_user()
+    ids = [client.post(url, json=payload, headers=headers).json()["id"] for _ in range(7)]
+    # Horodatages partagés : l'id départage les lignes d'un même instant
+    with db.get_bind().begin() as conn:
+        conn.execute(update(model).where(model.id.in_(ids[:4])).values(created_at=datetime(2030, 1, 1)))
+        conn.execute(update(model).where(model.id.in_(ids[4:])).values(created_at=datetime(2029, 1, 1)))
+
+    seen = _walk(client, headers, url, limit)
+    assert sorted(seen) == sorted(ids)
+    assert seen == ids[4:] + ids[:4]
+
+def test_cursor_round_trip():
+    created_at = datetime(2030, 1, 1, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+@pytest.mark.parametrize("cursor", [
+    "!!!",
+    "abc",
+    _raw_cursor(b"\xff\xfe"),
+    _raw_cursor(b'"texte"'),
+    _raw_cursor(b"[1]"),
+    _raw_cursor(b'{"a": 1}'),
+    _raw_cursor(b'[null, 1]'),
+    _raw_cursor(b'["hier", 1]'),
+    _raw_cursor(b'["2030-01-01T00:00:00", "un"]'),
+    _raw_cursor(b'["2030-01-01T00:00:00", 1e999]'),
+    _raw_cursor(b'["2030-01-01T00:00:00", 100000000000000000000000000]'),
+    _raw_cursor(b'["2030-01-01T00:00:00", -1]'),
+])
+@pytest.mark.parametrize("url", list(COLLECTIONS))
+def test_malformed_cursor_is_rejected_with_400(client, new_user, url, cursor):
+    response = client.get(url, params={"cursor": cursor}, headers=new_user())
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Curseur de pagination invalide"
\ No newline at end of file
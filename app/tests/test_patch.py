@@ -0,0 +1,84 @@
+import itertools
+import pytest
+
+_tag_numbers = itertools.count(1)
+
+def _todo(client, headers, **fields) -> dict:
+    tags = [
+        client.post("/api/v1/tags/", json={"name": f"patch {next(_tag_numbers)}", "color": "#000"}, headers=headers).json()["id"]
+        for _ in range(2)
+    ]
+    body = {"title": "à modifier", "description": "texte", "due_date": "2030-01-01T00:00:00", "tag_ids": tags, **fields}
+    return client.post("/api/v1/todos/", json=body, headers=headers).json()
+
+def _patch(client, headers, todo_id: int, body: dict):
+    return client.patch(f"/api/v1/todos/{todo_id}", json=body, headers=headers)
+
+def test_toggle_completed_without_previous_select(client, new_user, query_counter):
+    headers = new_user()
+    todo = _todo(client, headers)
+    _patch(client, headers, todo["id"], {"title": "utilisateur en cache"})
+
+    query_counter.clear()
+    response = _patch(client, headers, todo["id"], {"completed": True})
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    assert len(response.json()["tags"]) == 2
+    # Versions (révision), écarts des compteurs depuis la ligne, UPDATE ... RETURNING ;
+    # ni SELECT préalable ni relecture du catalogue des tags
+    assert len(query_counter) == 3
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in query_counter)
+
+def test_patch_keeps_missing_fields_and_clears_nulls(client, new_user):
+    headers = new_user()
+    todo = _todo(client, headers, priority=2)
+
+    # Champ absent : inchangé
+    updated = _patch(client, headers, todo["id"], {"title": "nouveau titre"}).json()
+    assert updated["title"] == "nouveau titre"
+    assert updated["description"] == "texte"
+    assert updated["priority"] == 2
+    assert updated["due_date"] == todo["due_date"]
+    assert updated["tags"] == todo["tags"]
+
+    # null : effacé pour les champs facultatifs, tag_ids null laisse les tags
+    updated = _patch(client, headers, todo["id"], {"description": None, "due_date": None, "tag_ids": None}).json()
+    assert updated["description"] is None
+    assert updated["due_date"] is None
+    assert updated["title"] == "nouveau titre"
+    assert updated["tags"] == todo["tags"]
+
+    # Valeurs explicites, dont une liste de tags vide
+    updated = _patch(client, headers, todo["id"], {"priority": 3, "completed": True, "tag_ids": []}).json()
+    assert (updated["priority"], updated["completed"], updated["tags"]) == (3, True, [])
+
+    fetched = client.get(f"/api/v1/todos/{todo['id']}", headers=headers).json()
+    assert {key: fetched[key] for key in updated} == updated
+
+@pytest.mark.parametrize("field", ["title", "completed", "priority"])
+def test_patch_rejects_null_required_fields(client, new_user, field):
+    headers = new_user()
+    todo = _todo(client, headers)
+    assert _patch(client, headers, todo["id"], {field: None}).status_code == 422
+
+def test_patch_updates_state_counters(client, new_user):
+    headers = new_user()
+    todo = _todo(client, headers, priority=1)
+    _todo(client, headers, priority=1)
+
+    for body in ({"completed": True}, {"completed": True}, {"priority": 3}, {"priority": 3, "completed": False}):
+        _patch(client, headers, todo["id"], body)
+    _patch(client, headers, todo["id"], {"completed": True})
+
+    stats = client.get("/api/v1/todos/stats", headers=headers).json()
+    assert stats["total"] == 2
+    assert stats["completed"] == 1
+    assert stats["by_priority"] == {"1": 1, "2": 0, "3": 1}
+
+def test_patch_other_users_todo_is_not_found(client, new_user):
+    owner, other = new_user(), new_user()
+    todo = _todo(client, owner)
+
+    assert _patch(client, other, todo["id"], {"completed": True}).status_code == 404
+    assert client.get(f"/api/v1/todos/{todo['id']}", headers=owner).json()["completed"] is False
+    assert client.get("/api/v1/todos/stats", headers=owner).json()["completed"] == 0
\ No newline at end of file
@@ -0,0 +1,54 @@
+import itertools
+import pytest
+from app.services.service import TodoService
+
+# Requêtes SQL par appel, indépendantes du nombre de tâches (pas de N+1 sur les tags)
+BUDGETS = {
+    "/api/v1/todos/": 3,                          # ETag, page, tags (selectin)
+    "/api/v1/todos/search?query=tache": 2,        # recherche, tags (selectin)
+    "/api/v1/recurring/": 3,                      # ETag, page, tags (selectin)
+}
+
+_tag_numbers = itertools.count(1)
+
+def _seed(client, headers, count: int) -> None:
+    tags = [
+        client.post("/api/v1/tags/", json={"name": f"comptage {next(_tag_numbers)}", "color": "#000"}, headers=headers).json()["id"]
+        for _ in range(2)
+    ]
+    for i in range(count):
+        client.post("/api/v1/todos/", json={"title": f"tache {i}", "tag_ids": tags}, headers=headers)
+        client.post(
+            "/api/v1/recurring/",
+            json={"title": f"serie {i}", "frequency": "weekly", "tag_ids": tags},
+            headers=headers
+        )
+
+def _count(client, headers, query_counter, url: str) -> int:
+    client.get(url, headers=headers)  # utilisateur en cache
+    query_counter.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert all(len(item["tags"]) == 2 for item in response.json())
+    return len(query_counter)
+
+@pytest.mark.parametrize("url", list(BUDGETS))
+def test_list_statements_do_not_grow_with_todos(client, new_user, query_counter, url):
+    small, large = new_user(), new_user()
+    _seed(client, small, 2)
+    _seed(client, large, 12)
+
+    assert _count(client, small, query_counter, url) == BUDGETS[url]
+    assert _count(client, large, query_counter, url) == BUDGETS[url]
+
+def test_filter_todos_loads_tags_in_one_query(client, new_user, query_counter, db):
+    headers = new_user()
+    _seed(client, headers, 8)
+    user_id = client.get("/api/v1/me", headers=headers).json()["id"]
+
+    query_counter.clear()
+    todos = TodoService.filter_todos(db, user_id, search_term="tache")
+    assert len(todos) == 8
+    assert all(len(todo.tags) == 2 for todo in todos)
+    # Filtre, tags (selectin) ; aucun chargement paresseux à l'accès aux tags
+    assert len(query_counter) == 2
\ No newline at end of file
@@ -0,0 +1,80 @@
+from datetime import datetime
+from itertools import islice
+import pytest
+from app.services.recurrence import Recurrence, add_months, merge_occurrences
+
+def _take(recurrence: Recurrence, count: int, start=None) -> list:
+    return list(islice(recurrence.occurrences(start), count))
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(datetime(2023, 1, 31), 1) == datetime(2023, 2, 28)
+    assert add_months(datetime(2024, 1, 31), 1) == datetime(2024, 2, 29)
+    assert add_months(datetime(2024, 1, 31), 3) == datetime(2024, 4, 30)
+    assert add_months(datetime(2024, 11, 30, 9, 15), 2) == datetime(2025, 1, 30, 9, 15)
+
+def test_monthly_series_does_not_drift():
+    recurrence = Recurrence("monthly", datetime(2024, 1, 31, 8))
+    assert _take(recurrence, 4) == [
+        datetime(2024, 1, 31, 8), datetime(2024, 2, 29, 8), datetime(2024, 3, 31, 8), datetime(2024, 4, 30, 8)
+    ]
+
+@pytest.mark.parametrize("frequency, expected", [
+    ("daily", [datetime(2024, 3, 1), datetime(2024, 3, 4), datetime(2024, 3, 7)]),
+    ("weekly", [datetime(2024, 3, 1), datetime(2024, 3, 22), datetime(2024, 4, 12)]),
+    ("monthly", [datetime(2024, 3, 1), datetime(2024, 6, 1), datetime(2024, 9, 1)]),
+])
+def test_interval_greater_than_one(frequency, expected):
+    recurrence = Recurrence(frequency, datetime(2024, 3, 1), interval=3)
+    assert _take(recurrence, 3) == expected
+    # Départ au milieu de la série : rang calculé, même résultat
+    assert _take(recurrence, 2, start=expected[1]) == expected[1:]
+
+def test_weekly_weekdays_expansion():
+    # Mercredi 6 mars 2024, lundi et vendredi, une semaine sur deux
+    recurrence = Recurrence("weekly", datetime(2024, 3, 6, 7), interval=2, weekdays=[4, 0, 4])
+    assert recurrence.weekdays == [0, 4]
+    assert _take(recurrence, 4) == [
+        datetime(2024, 3, 8, 7), datetime(2024, 3, 18, 7), datetime(2024, 3, 22, 7), datetime(2024, 4, 1, 7)
+    ]
+    # Jours de la semaine ignorés hors fréquence hebdomadaire
+    assert Recurrence("daily", datetime(2024, 3, 6), weekdays=[0]).weekdays is None
+
+def test_ends_at_is_inclusive():
+    recurrence = Recurrence("daily", datetime(2024, 3, 1), ends_at=datetime(2024, 3, 3))
+    assert list(recurrence.occurrences()) == [datetime(2024, 3, 1), datetime(2024, 3, 2), datetime(2024, 3, 3)]
+    assert recurrence.next_after(datetime(2024, 3, 3)) is None
+    assert list(recurrence.between(datetime(2024, 3, 2), datetime(2024, 3, 10))) == [
+        datetime(2024, 3, 2), datetime(2024, 3, 3)
+    ]
+
+def test_next_after_is_strictly_later():
+    recurrence = Recurrence("weekly", datetime(2024, 3, 4, 9), weekdays=[0, 2])
+    assert recurrence.next_after(datetime(2024, 3, 4, 9)) == datetime(2024, 3, 6, 9)
+    assert recurrence.next_after(datetime(2024, 3, 6, 8, 59)) == datetime(2024, 3, 6, 9)
+    # Avant l'ancre : première occurrence
+    assert recurrence.next_after(datetime(2020, 1, 1)) == datetime(2024, 3, 4, 9)
+
+def test_merge_occurrences_orders_and_limits():
+    daily = Recurrence("daily", datetime(2024, 3, 1, 12), interval=2)
+    weekly = Recurrence("weekly", datetime(2024, 3, 1, 8))
+    merged = list(merge_occurrences([("jour", daily.occurrences()), ("semaine", weekly.occurrences())], limit=5))
+    assert merged == [
+        (datetime(2024, 3, 1, 8), "semaine"),
+        (datetime(2024, 3, 1, 12), "jour"),
+        (datetime(2024, 3, 3, 12), "jour"),
+        (datetime(2024, 3, 5, 12), "jour"),
+        (datetime(2024, 3, 7, 12), "jour"),
+    ]
+    # Série terminée : les autres continuent
+    ended = Recurrence("daily", datetime(2024, 3, 1), ends_at=datetime(2024, 3, 1))
+    assert [item for _, item in merge_occurrences([("fini", ended.occurrences()), ("semaine", weekly.occurrences())], limit=3)] == [
+        "fini", "semaine", "semaine"
+    ]
+
+def test_unknown_frequency_is_rejected():
+    with pytest.raises(ValueError):
+        Recurrence("yearly", datetime(2024, 3, 1))
+    recurrence = Recurrence("daily", datetime(2024, 3, 1))
+    recurrence.frequency = "hourly"
+    with pytest.raises(ValueError):
+        _take(recurrence, 1)
\ No newline at end of file
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.api import dependencies
+from app.api.dependencies import get_async_db, get_db
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.replicas import PIN_COOKIE, ReplicaSet
+from app.db.session import create_async_db_engine, create_db_engine, get_async_database_url
+from app.main import app
+from app.models import models
+
+@pytest.fixture
+def replica_routing(client, monkeypatch):
+    """Routage réel (get_db / get_async_db) vers les réplicas donnés par leurs URLs"""
+    created = []
+
+    def route(*urls) -> ReplicaSet:
+        if settings.ASYNC_DB:
+            engines = [create_async_db_engine(get_async_database_url(url)) for url in urls]
+        else:
+            engines = [create_db_engine(url) for url in urls]
+        created.extend(engines)
+        replicas = ReplicaSet(engines)
+        monkeypatch.setattr(dependencies, "async_read_replicas" if settings.ASYNC_DB else "read_replicas", replicas)
+        return replicas
+
+    monkeypatch.delitem(app.dependency_overrides, get_db)
+    monkeypatch.delitem(app.dependency_overrides, get_async_db)
+    client.cookies.clear()
+    yield route
+    client.cookies.clear()
+    for engine in created:
+        getattr(engine, "sync_engine", engine).dispose()
+
+def _titles(client, headers) -> list:
+    response = client.get("/api/v1/todos/", headers=headers)
+    assert response.status_code == 200
+    return [item["title"] for item in response.json()]
+
+def test_reads_use_replica_until_own_write(client, new_user, replica_routing, tmp_path):
+    headers, other = new_user(), new_user()
+    user_id = client.get("/api/v1/me", headers=headers).json()["id"]
+
+    # Réplica en retard : une seule tâche, absente du primaire
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(url)
+    Base.metadata.create_all(bind=replica_engine)
+    with Session(bind=replica_engine) as replica:
+        replica.add(models.Todo(title="sur le réplica", owner_id=user_id))
+        replica.commit()
+    replica_engine.dispose()
+    replicas = replica_routing(url)
+
+    response = client.get("/api/v1/todos/", headers=headers)
+    assert [item["title"] for item in response.json()] == ["sur le réplica"]
+    assert 'dbroute;desc="replica-0"' in response.headers["server-timing"]
+
+    created = client.post("/api/v1/todos/", json={"title": "sur le primaire"}, headers=headers)
+    assert created.status_code == 201
+    assert PIN_COOKIE in created.cookies
+
+    # Lecture suivante : sur le primaire, quel que soit le worker (état porté par le cookie)
+    assert _titles(client, headers) == ["sur le primaire"]
+    assert replicas.stats()["primary_reads"] == 1
+
+    # Cookie signé pour un autre sujet : ignoré
+    assert _titles(client, other) == []
+    assert replicas.stats()["replica_reads"] == [2]
+
+    # Sans cookie (expiré) : retour au réplica
+    client.cookies.clear()
+    assert _titles(client, headers) == ["sur le réplica"]
+
+def test_broken_replica_falls_back_to_primary(client, new_user, replica_routing, tmp_path):
+    headers = new_user()
+    client.post("/api/v1/todos/", json={"title": "sur le primaire"}, headers=headers)
+    client.cookies.clear()
+    replicas = replica_routing(f"sqlite:///{tmp_path / 'absent' / 'replica.db'}")
+
+    assert _titles(client, headers) == ["sur le primaire"]
+    assert replicas.stats()["replica_failures"] == [1]
+    assert replicas.stats()["unavailable_replicas"] == [0]
+
+    # Réplica écarté : pas de nouvelle tentative de connexion
+    assert _titles(client, headers) == ["sur le primaire"]
+    assert replicas.stats()["replica_failures"] == [1]
+    assert replicas.stats()["primary_reads"] == 2
\ No newline at end of file
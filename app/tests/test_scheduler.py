@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.session import create_db_engine
+from app.models import models
+from app.services.scheduler import SchedulerMetrics, generate_due_todos
+from app.services.stats import counters, grouped_counts
+
+NOW = datetime(2030, 1, 10, 12)
+
+@pytest.fixture
+def engine(tmp_path):
+    """Base isolée : un passage traite toutes les séries échues, y compris celles des autres tests"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'scheduler.db'}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+def _series(session: Session, owner: models.User, next_due_at: datetime, tags=(), **rule) -> models.RecurringTodo:
+    rule.setdefault("frequency", "daily")
+    rule.setdefault("starts_at", datetime(2030, 1, 1, 8))
+    recurring = models.RecurringTodo(
+        title=f"série {rule['frequency']}", owner=owner, next_due_at=next_due_at, tags=list(tags), **rule
+    )
+    session.add(recurring)
+    return recurring
+
+def _instances(engine, recurring_id: int) -> list:
+    with Session(bind=engine) as session:
+        return session.scalars(
+            select(models.Todo).where(models.Todo.recurring_todo_id == recurring_id).order_by(models.Todo.due_date)
+        ).all()
+
+def _counters_match(engine, owner_id: int) -> bool:
+    with Session(bind=engine) as session:
+        stored = {
+            name: value for name, value in session.execute(
+                select(counters.c.name, counters.c.value).where(counters.c.owner_id == owner_id)
+            ) if value
+        }
+        grouped = {
+            name: value
+            for query in grouped_counts(models.Todo.owner_id == owner_id)
+            for _, name, value in session.execute(query)
+        }
+    return stored == grouped
+
+def test_second_tick_generates_nothing_new(engine):
+    with Session(bind=engine) as session:
+        owner = models.User(email="a@example.com")
+        tags = [models.Tag(name="planifié", color="#000"), models.Tag(name="maison", color="#fff")]
+        tagged = _series(session, owner, datetime(2030, 1, 10, 8), tags=tags)
+        plain = _series(session, owner, datetime(2030, 1, 10, 8), frequency="weekly", starts_at=datetime(2030, 1, 3, 8))
+        session.commit()
+        tagged_id, plain_id, owner_id = tagged.id, plain.id, owner.id
+        tag_ids = {tag.id for tag in tags}
+
+    assert generate_due_todos(engine, now=NOW) == 3
+    assert generate_due_todos(engine, now=NOW) == 0
+
+    # Horizon de 24 h : le 10 et le 11 pour la série quotidienne
+    generated = _instances(engine, tagged_id)
+    assert [todo.due_date for todo in generated] == [datetime(2030, 1, 10, 8), datetime(2030, 1, 11, 8)]
+    assert len(_instances(engine, plain_id)) == 1
+    with Session(bind=engine) as session:
+        assert {tag.id for tag in session.get(models.Todo, generated[0].id).tags} == tag_ids
+        assert session.get(models.RecurringTodo, tagged_id).next_due_at == datetime(2030, 1, 12, 8)
+        assert session.get(models.RecurringTodo, plain_id).next_due_at == datetime(2030, 1, 17, 8)
+    assert _counters_match(engine, owner_id)
+
+    # Le lendemain : une occurrence de plus
+    assert generate_due_todos(engine, now=NOW + timedelta(days=1)) == 1
+    assert len(_instances(engine, tagged_id)) == 3
+
+def test_chunks_cover_every_series_once(engine):
+    with Session(bind=engine) as session:
+        owners = [models.User(email=f"lot{i}@example.com") for i in range(2)]
+        tag = models.Tag(name="lot", color="#000")
+        series = [
+            _series(session, owners[i % 2], datetime(2030, 1, 10, 8), tags=[tag] if i % 2 else [])
+            for i in range(5)
+        ]
+        # Série terminée : non générée
+        _series(session, owners[0], datetime(2030, 1, 10, 8), ends_at=datetime(2030, 1, 9))
+        session.commit()
+        series_ids = [recurring.id for recurring in series]
+        owner_ids = [owner.id for owner in owners]
+
+    metrics = SchedulerMetrics()
+    assert generate_due_todos(engine, now=NOW, batch_size=2, metrics=metrics) == 10
+    assert metrics.recurring_processed == 6
+    assert [len(_instances(engine, recurring_id)) for recurring_id in series_ids] == [2] * 5
+    with Session(bind=engine) as session:
+        assert session.scalar(select(func.count()).select_from(models.todo_tags)) == 4
+    assert all(_counters_match(engine, owner_id) for owner_id in owner_ids)
+
+def test_tags_and_counters_ignore_rows_with_the_same_created_at(engine):
+    with Session(bind=engine) as session:
+        owner = models.User(email="b@example.com")
+        recurring = _series(session, owner, datetime(2030, 1, 10, 8), tags=[models.Tag(name="copié", color="#000")])
+        session.flush()
+        # Instance générée à la main au même instant, sans tags
+        manual = models.Todo(title="manuelle", owner=owner, recurring_todo_id=recurring.id, created_at=NOW, priority=1)
+        session.add(manual)
+        session.commit()
+        manual_id, owner_id = manual.id, owner.id
+
+    assert generate_due_todos(engine, now=NOW) == 2
+    with Session(bind=engine) as session:
+        assert session.get(models.Todo, manual_id).tags == []
+        # La tâche manuelle, insérée sans compteurs, n'est pas comptée par le passage
+        total = session.scalar(select(counters.c.value).where(counters.c.owner_id == owner_id).where(counters.c.name == "total"))
+    assert total == 2
+
+def test_missed_occurrences_are_caught_up_within_limit(engine):
+    with Session(bind=engine) as session:
+        owner = models.User(email="c@example.com")
+        recent = _series(session, owner, datetime(2030, 1, 7, 8))
+        stale = _series(session, owner, datetime(2029, 1, 1, 8), starts_at=datetime(2029, 1, 1, 8))
+        session.commit()
+        recent_id, stale_id = recent.id, stale.id
+
+    generate_due_todos(engine, now=NOW)
+    # Du 7 au 11 : quatre occurrences manquées et celle de l'horizon
+    assert len(_instances(engine, recent_id)) == 5
+    stale_dates = [todo.due_date for todo in _instances(engine, stale_id)]
+    assert len(stale_dates) == settings.RECURRING_MAX_CATCH_UP
+    # Les plus récentes sont conservées
+    assert stale_dates[-1] == datetime(2030, 1, 11, 8)
+    assert stale_dates[0] == datetime(2030, 1, 11, 8) - timedelta(days=settings.RECURRING_MAX_CATCH_UP - 1)
\ No newline at end of file
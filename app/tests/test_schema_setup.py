@@ -0,0 +1,107 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import Session
+from app import main
+from app.core.config import settings
+from app.core.events import InMemoryEventBroker
+from app.db import session
+from app.db.migrate import check_schema, head_revision, setup_schema
+from app.db.session import create_db_engine
+from app.models import models
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def _migrate(url: str, revision: str = "head") -> None:
+    """Migrations dans un processus à part, comme en déploiement (python -m app.db.migrate)"""
+    subprocess.run(
+        [sys.executable, "-c", f"from app.db.migrate import upgrade; upgrade({revision!r})"],
+        cwd=ROOT, env={**os.environ, "DATABASE_URL": url}, check=True, capture_output=True
+    )
+
+@pytest.fixture(scope="module")
+def migrated_url(tmp_path_factory) -> str:
+    url = f"sqlite:///{tmp_path_factory.mktemp('schema') / 'migrated.db'}"
+    _migrate(url)
+    return url
+
+@pytest.fixture
+def engine_for(tmp_path):
+    engines = []
+
+    def create(url: str = None):
+        engine = create_db_engine(url or f"sqlite:///{tmp_path / 'vide.db'}")
+        engines.append(engine)
+        return engine
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+def _run_lifespan(monkeypatch, engine, mode: str) -> None:
+    """Démarrage et arrêt de l'application sur engine, sans toucher au broker ni aux pools partagés"""
+    monkeypatch.setattr(settings, "DB_SCHEMA_SETUP", mode)
+    monkeypatch.setattr(settings, "RECURRING_SCHEDULER_ENABLED", False)
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(main, "event_broker", InMemoryEventBroker(queue_size=8, heartbeat=0, max_subscribers=1, max_per_user=1))
+
+    async def dispose_engines():
+        # Pools de l'application (autre boucle d'événements) laissés aux autres tests
+        engine.dispose()
+    monkeypatch.setattr(session, "dispose_engines", dispose_engines)
+
+    async def run():
+        async with main.lifespan(main.app):
+            pass
+    asyncio.run(run())
+
+def _rows(engine) -> tuple:
+    with Session(bind=engine) as db:
+        return (
+            db.scalar(select(models.User.email)),
+            db.scalars(select(models.Todo.title).order_by(models.Todo.id)).all(),
+        )
+
+@pytest.mark.parametrize("mode", ["check", "create", "none"])
+def test_startup_keeps_existing_rows(monkeypatch, engine_for, migrated_url, mode):
+    engine = engine_for(migrated_url)
+    with Session(bind=engine) as db:
+        db.query(models.Todo).delete()
+        db.query(models.User).delete()
+        user = models.User(email="existant@example.com", hashed_password="x")
+        db.add_all([user, models.Todo(title="conservée", owner=user), models.Todo(title="aussi", owner=user)])
+        db.commit()
+
+    _run_lifespan(monkeypatch, engine, mode)
+    assert _rows(engine) == ("existant@example.com", ["conservée", "aussi"])
+    assert check_schema(engine) == head_revision()
+
+def test_check_refuses_unmigrated_and_outdated_databases(monkeypatch, engine_for, tmp_path):
+    empty = engine_for()
+    with pytest.raises(RuntimeError, match="python -m app.db.migrate"):
+        _run_lifespan(monkeypatch, empty, "check")
+
+    outdated_url = f"sqlite:///{tmp_path / 'ancienne.db'}"
+    _migrate(outdated_url, "0008_todo_counters")
+    with pytest.raises(RuntimeError, match="0008_todo_counters"):
+        _run_lifespan(monkeypatch, engine_for(outdated_url), "check")
+
+def test_create_and_none_modes_on_an_empty_database(monkeypatch, engine_for, tmp_path):
+    engine = engine_for()
+    _run_lifespan(monkeypatch, engine, "none")
+    assert inspect(engine).get_table_names() == []
+
+    _run_lifespan(monkeypatch, engine, "create")
+    tables = set(inspect(engine).get_table_names())
+    assert {"users", "todos", "tags", "todos_fts"} <= tables
+    # Pas de révision Alembic : create_all n'est pas une migration
+    assert "alembic_version" not in tables
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM todos_fts")).scalar() == 0
+
+def test_unknown_mode_is_rejected(engine_for):
+    with pytest.raises(ValueError):
+        setup_schema(engine_for(), "drop")
\ No newline at end of file
@@ -0,0 +1,61 @@
+def _todo(client, headers, title: str, description: str = None) -> int:
+    response = client.post("/api/v1/todos/", json={"title": title, "description": description}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def _search(client, headers, query: str, **params) -> list:
+    response = client.get("/api/v1/todos/search", params={"query": query, **params}, headers=headers)
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+def test_title_matches_rank_before_description_matches(client, new_user):
+    headers = new_user()
+    in_description = _todo(client, headers, "lundi", "envoyer le rapport")
+    in_title = _todo(client, headers, "rapport annuel", "à relire")
+    _todo(client, headers, "courses", "pain, lait")
+
+    assert _search(client, headers, "rapport") == [in_title, in_description]
+    # Tâches des autres utilisateurs exclues
+    assert _search(client, new_user(), "rapport") == []
+
+def test_terms_match_as_prefixes_and_all_terms_are_required(client, new_user):
+    headers = new_user()
+    annual = _todo(client, headers, "rapport annuel")
+    monthly = _todo(client, headers, "rapport mensuel")
+
+    assert sorted(_search(client, headers, "rapp")) == sorted([annual, monthly])
+    assert _search(client, headers, "rapp ann") == [annual]
+    assert _search(client, headers, "annuelles") == []
+
+def test_accents_are_ignored(client, new_user):
+    headers = new_user()
+    accented = _todo(client, headers, "Réunion d'équipe")
+    plain = _todo(client, headers, "preparer la reunion")
+
+    assert sorted(_search(client, headers, "reunion")) == sorted([accented, plain])
+    assert sorted(_search(client, headers, "RÉUNION")) == sorted([accented, plain])
+    assert _search(client, headers, "equipe") == [accented]
+    assert _search(client, headers, "prépa") == [plain]
+
+def test_edited_and_deleted_todos_leave_results(client, new_user):
+    headers = new_user()
+    edited = _todo(client, headers, "facture électricité")
+    removed = _todo(client, headers, "facture eau")
+
+    client.patch(f"/api/v1/todos/{edited}", json={"title": "relevé compteur"}, headers=headers)
+    client.delete(f"/api/v1/todos/{removed}", headers=headers)
+
+    assert _search(client, headers, "facture") == []
+    assert _search(client, headers, "compteur") == [edited]
+    # Description modifiée seule : réindexée aussi
+    client.patch(f"/api/v1/todos/{edited}", json={"description": "index du gaz"}, headers=headers)
+    assert _search(client, headers, "gaz") == [edited]
+
+def test_engine_operators_are_ignored(client, new_user):
+    headers = new_user()
+    todo = _todo(client, headers, "appeler NEAR le plombier")
+
+    assert _search(client, headers, 'plombier" OR "x') == []
+    assert _search(client, headers, "plombier*") == [todo]
+    assert _search(client, headers, "***") == []
+    assert _search(client, headers, "near", completed=False) == [todo]
\ No newline at end of file
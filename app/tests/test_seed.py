@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, select
+from app.db.base_class import Base
+from app.db.seed import seed_bulk
+from app.db.session import create_db_engine
+from app.models import models
+from app.services.stats import counters, rebuild_counters
+from app.services.tag_catalog import TAGS_CATALOG
+
+SIZES = {"users": 3, "todos_per_user": 7, "tags": 4, "recurring_per_user": 2}
+
+def _engine(path):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def _seed(engine, **options) -> dict:
+    return seed_bulk(engine, **SIZES, chunk_size=5, progress=lambda *args: None, **options)
+
+def _dump(engine) -> dict:
+    """Contenu des tables générées (hash du mot de passe exclu : sel aléatoire)"""
+    tables = {
+        "users": select(models.User.id, models.User.email, models.User.is_active, models.User.created_at),
+        "tags": select(models.Tag.__table__),
+        "todos": select(models.Todo.__table__),
+        "todo_tags": select(models.todo_tags),
+        "recurring_todos": select(models.RecurringTodo.__table__),
+        "recurring_todo_tags": select(models.recurring_todo_tags),
+        "counters": select(counters),
+    }
+    with engine.connect() as conn:
+        return {name: sorted(tuple(row) for row in conn.execute(query)) for name, query in tables.items()}
+
+@pytest.fixture
+def engines(tmp_path):
+    created = [_engine(tmp_path / f"seed{i}.db") for i in range(2)]
+    try:
+        yield created
+    finally:
+        for engine in created:
+            engine.dispose()
+
+def test_same_seed_gives_same_data(engines):
+    first, second = engines
+    assert _seed(first) == _seed(second)
+    assert _dump(first) == _dump(second)
+
+    with first.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(models.Todo)) == SIZES["users"] * SIZES["todos_per_user"]
+    # Autre graine (ajoutée à la suite) : autres titres
+    _seed(second, seed=7)
+    first_titles = [row[1] for row in _dump(first)["todos"]]
+    assert [row[1] for row in _dump(second)["todos"][len(first_titles):]] != first_titles
+
+def test_counters_and_catalog_version_are_consistent(engines):
+    engine = engines[0]
+    _seed(engine)
+    summary = _seed(engine)
+
+    before = _dump(engine)["counters"]
+    assert before
+    with engine.begin() as conn:
+        rebuild_counters(conn)
+    assert _dump(engine)["counters"] == before
+
+    with engine.connect() as conn:
+        version = conn.scalar(select(models.CatalogVersion.version).where(models.CatalogVersion.name == TAGS_CATALOG))
+        # Un passage, une version ; les tags portent la version de leur passage
+        assert version == 2
+        first_tag = summary["tags"][0]
+        revisions = dict(conn.execute(select(models.Tag.id, models.Tag.revision)).all())
+    assert {revisions[tag_id] for tag_id in range(first_tag, first_tag + SIZES["tags"])} == {version}
+    assert set(revisions.values()) == {1, 2}
\ No newline at end of file
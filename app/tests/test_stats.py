@@ -0,0 +1,91 @@
+import itertools
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models import models
+from app.services.stats import TOTAL, counters, grouped_counts, rebuild_counters
+
+_tag_numbers = itertools.count(1)
+
+def _counters(db, owner_id: int) -> dict:
+    with Session(bind=db.get_bind()) as session:
+        rows = session.execute(
+            select(counters.c.name, counters.c.value).where(counters.c.owner_id == owner_id)
+        ).all()
+    # Un compteur à zéro équivaut à une ligne absente du GROUP BY
+    return {name: value for name, value in rows if value}
+
+def _grouped(db, owner_id: int) -> dict:
+    with Session(bind=db.get_bind()) as session:
+        return {
+            name: value
+            for query in grouped_counts(models.Todo.owner_id == owner_id)
+            for _, name, value in session.execute(query)
+        }
+
+def _user(client, new_user):
+    headers = new_user()
+    return headers, client.get("/api/v1/me", headers=headers).json()["id"]
+
+def _tag(client, headers) -> int:
+    name = f"compteur {next(_tag_numbers)}"
+    return client.post("/api/v1/tags/", json={"name": name, "color": "#000"}, headers=headers).json()["id"]
+
+def _write_everything(client, headers) -> None:
+    first, second, dropped = _tag(client, headers), _tag(client, headers), _tag(client, headers)
+    todos = [
+        client.post("/api/v1/todos/", json={"title": f"tâche {i}", "priority": i % 3 + 1, "tag_ids": [first, dropped]}, headers=headers).json()
+        for i in range(5)
+    ]
+    # Mises à jour : état, priorité, tags
+    client.patch(f"/api/v1/todos/{todos[0]['id']}", json={"completed": True, "priority": 3}, headers=headers)
+    client.put(f"/api/v1/todos/{todos[1]['id']}", json={"tag_ids": [second]}, headers=headers)
+    client.patch(f"/api/v1/todos/{todos[2]['id']}", json={"completed": True, "tag_ids": []}, headers=headers)
+    client.delete(f"/api/v1/todos/{todos[3]['id']}", headers=headers)
+    bulk = client.post("/api/v1/todos/bulk", json={"operations": [
+        {"op": "create", "todo": {"title": "groupée", "completed": True, "tag_ids": [second]}},
+        {"op": "update", "id": todos[4]["id"], "changes": {"priority": 1, "completed": True, "tag_ids": [first, second]}},
+        {"op": "delete", "id": todos[0]["id"]},
+    ]}, headers=headers)
+    assert [result["status"] for result in bulk.json()["results"]] == [201, 200, 204]
+    recurring = client.post(
+        "/api/v1/recurring/", json={"title": "série", "frequency": "daily", "tag_ids": [first, second]}, headers=headers
+    ).json()
+    for _ in range(2):
+        assert client.post(f"/api/v1/recurring/{recurring['id']}/generate", headers=headers).status_code == 200
+    # Tag supprimé : ses compteurs disparaissent avec ses associations
+    client.delete(f"/api/v1/tags/{dropped}", headers=headers)
+
+def test_counters_match_group_by_after_writes(client, new_user, db):
+    headers, user_id = _user(client, new_user)
+    _write_everything(client, headers)
+
+    counted = _counters(db, user_id)
+    assert counted == _grouped(db, user_id)
+    # 5 créées, 1 supprimée, bulk : 1 créée et 1 supprimée, 2 générées
+    assert counted[TOTAL] == 6
+
+    stats = client.get("/api/v1/todos/stats", headers=headers).json()
+    assert stats["total"] == counted[TOTAL]
+    assert stats["completed"] == counted["completed"]
+
+def test_rebuild_counters_restores_one_user(client, new_user, db):
+    headers, user_id = _user(client, new_user)
+    other_headers, other_id = _user(client, new_user)
+    _write_everything(client, headers)
+    client.post("/api/v1/todos/", json={"title": "autre"}, headers=other_headers)
+
+    # Dérive : compteurs faussés chez les deux utilisateurs
+    with db.get_bind().begin() as conn:
+        conn.execute(update(counters).where(counters.c.owner_id.in_([user_id, other_id])).values(value=counters.c.value + 5))
+    assert _counters(db, user_id) != _grouped(db, user_id)
+
+    with db.get_bind().begin() as conn:
+        rebuild_counters(conn, user_id)
+    assert _counters(db, user_id) == _grouped(db, user_id)
+    # Autre utilisateur non reconstruit : toujours faussé (1 + 5)
+    assert _counters(db, other_id)[TOTAL] == 6
+
+    with db.get_bind().begin() as conn:
+        rebuild_counters(conn)
+    assert _counters(db, other_id) == _grouped(db, other_id)
+    assert client.get("/api/v1/todos/stats", headers=headers).json()["total"] == 6
\ No newline at end of file
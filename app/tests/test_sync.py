@@ -0,0 +1,86 @@
+import itertools
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.services.sync import prune_tombstones
+
+_tag_numbers = itertools.count(1)
+
+def _changes(client, headers, since=None):
+    params = {} if since is None else {"since": since}
+    return client.get("/api/v1/sync/changes", params=params, headers=headers)
+
+def test_without_since_returns_only_token(client, new_user):
+    headers = new_user()
+    client.post("/api/v1/todos/", json={"title": "déjà chargée"}, headers=headers)
+
+    body = _changes(client, headers).json()
+    assert body["token"]
+    assert body["todos"] == [] and body["recurring"] == [] and body["tags"] == []
+    assert body["deleted"] == {"todos": [], "recurring": [], "tags": []}
+
+def test_feed_returns_changed_rows_and_tombstones(client, new_user):
+    headers = new_user()
+    kept = client.post("/api/v1/todos/", json={"title": "inchangée"}, headers=headers).json()
+    updated = client.post("/api/v1/todos/", json={"title": "avant"}, headers=headers).json()
+    deleted = client.post("/api/v1/todos/", json={"title": "supprimée"}, headers=headers).json()
+    recurring = client.post("/api/v1/recurring/", json={"title": "série", "frequency": "daily"}, headers=headers).json()
+    token = _changes(client, headers).json()["token"]
+
+    tag = client.post("/api/v1/tags/", json={"name": f"sync {next(_tag_numbers)}", "color": "#000"}, headers=headers).json()
+    created = client.post("/api/v1/todos/", json={"title": "nouvelle", "tag_ids": [tag["id"]]}, headers=headers).json()
+    client.patch(f"/api/v1/todos/{updated['id']}", json={"title": "après"}, headers=headers)
+    client.delete(f"/api/v1/todos/{deleted['id']}", headers=headers)
+    generated = client.post(f"/api/v1/recurring/{recurring['id']}/generate", headers=headers)
+    assert generated.status_code == 200
+    assert set(generated.json()) == set(kept)
+
+    body = _changes(client, headers, token).json()
+    todos = {item["id"]: item for item in body["todos"]}
+    assert set(todos) == {created["id"], updated["id"], generated.json()["id"]}
+    assert todos[updated["id"]]["title"] == "après"
+    assert [t["id"] for t in todos[created["id"]]["tags"]] == [tag["id"]]
+    assert [item["id"] for item in body["recurring"]] == [recurring["id"]]
+    assert tag["id"] in [item["id"] for item in body["tags"]]
+    assert body["deleted"]["todos"] == [deleted["id"]]
+
+    client.delete(f"/api/v1/tags/{tag['id']}", headers=headers)
+    client.delete(f"/api/v1/recurring/{recurring['id']}", headers=headers)
+    later = _changes(client, headers, body["token"]).json()
+    assert tag["id"] in later["deleted"]["tags"]
+    assert later["deleted"]["recurring"] == [recurring["id"]]
+    assert later["recurring"] == []
+
+    # Jeton à jour : rien de nouveau
+    latest = _changes(client, headers, later["token"]).json()
+    assert latest["todos"] == [] and latest["deleted"]["todos"] == []
+
+def test_token_older_than_retention_requires_full_resync(client, new_user, db):
+    headers = new_user()
+    todo = client.post("/api/v1/todos/", json={"title": "bientôt purgée"}, headers=headers).json()
+    old_token = _changes(client, headers).json()["token"]
+    client.delete(f"/api/v1/todos/{todo['id']}", headers=headers)
+    before_prune = _changes(client, headers, old_token).json()
+    assert before_prune["deleted"]["todos"] == [todo["id"]]
+
+    later = datetime.utcnow() + timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    with db.get_bind().begin() as conn:
+        assert prune_tombstones(conn, now=later) >= 1
+
+    expired = _changes(client, headers, old_token)
+    assert expired.status_code == 410
+    assert expired.json()["detail"] == "Jeton de synchronisation expiré, recharger les listes"
+    # Jeton postérieur à la suppression purgée : toujours servi
+    assert _changes(client, headers, before_prune["token"]).status_code == 200
+
+def test_prune_keeps_recent_tombstones(client, new_user, db):
+    headers = new_user()
+    todo = client.post("/api/v1/todos/", json={"title": "récente"}, headers=headers).json()
+    token = _changes(client, headers).json()["token"]
+    client.delete(f"/api/v1/todos/{todo['id']}", headers=headers)
+
+    with db.get_bind().begin() as conn:
+        prune_tombstones(conn)
+
+    body = _changes(client, headers, token)
+    assert body.status_code == 200
+    assert body.json()["deleted"]["todos"] == [todo["id"]]
\ No newline at end of file
@@ -0,0 +1,50 @@
+import threading
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+from app.db.base_class import Base
+from app.db.replicas import REPLICA_KEY
+from app.models import models
+from app.services.tag_catalog import TAGS_CATALOG, TagCatalog, bump_version
+
+def test_bump_version_creates_missing_row_without_race(db):
+    db.execute(delete(models.CatalogVersion))
+    db.commit()
+
+    versions = []
+    errors = []
+
+    def writer():
+        with Session(bind=db.get_bind()) as session:
+            try:
+                versions.append(bump_version(session))
+                session.commit()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(versions) == [1, 2, 3, 4, 5, 6]
+    assert db.get(models.CatalogVersion, TAGS_CATALOG, populate_existing=True).version == 6
+
+def test_replica_snapshot_never_serves_primary_writes(db, tmp_path):
+    tag = models.Tag(name="catalogue-primaire", color="#123456", revision=bump_version(db))
+    db.add(tag)
+    db.commit()
+
+    # Réplica en retard : schéma sans aucun tag
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica_engine)
+    catalog = TagCatalog(check_interval=60)
+    try:
+        with Session(bind=replica_engine, info={REPLICA_KEY: 0}) as replica:
+            assert catalog.get(replica).known_ids([tag.id]) == []
+        # Écriture (primaire) : la copie du réplica n'est pas réutilisée
+        assert catalog.get(db).known_ids([tag.id]) == [tag.id]
+        assert catalog.stats()["replica_copies"] == 1
+    finally:
+        replica_engine.dispose()
\ No newline at end of file
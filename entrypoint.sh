@@ -11,4 +11,4 @@ echo "Database is ready!"
 python -m app.db.init_db
 
 # Démarrer l'application
-exec uvicorn app.main:app --host 0.0.0.0 --reload
\ No newline at end of file
+exec uvicorn app.main:app --host 0.0.0.0 --timeout-graceful-shutdown 10
\ No newline at end of file